@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD(Additive Increase / Multiplicative Decrease) 방식의 동시 실행 제한기
+    - 요청 성공: 한도를 조금씩 늘림 (한도만큼 연속 성공하면 +1)
+    - 스로틀링 감지: 한도를 decrease_factor 배로 줄임 (cooldown 내 중복 감소는 무시)
+    - 대기자는 FIFO 순서로 슬롯을 받음
+    """
+
+    def __init__(self, initial_limit: int = 5, min_limit: int = 1, max_limit: int = 20,
+                 decrease_factor: float = 0.5, decrease_cooldown: float = 1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+
+        # 통계
+        self.throttle_events = 0
+        self.success_events = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self):
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소된 경우 -> 슬롯 반납
+                self.release()
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self):
+        """성공 신호: 한도 +1/limit (한도만큼 성공하면 한도 +1)"""
+        self.success_events += 1
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / max(self._limit, 1.0))
+        self._wake_waiters()
+
+    def on_throttle(self):
+        """스로틀링 신호: 한도를 곱셈적으로 감소"""
+        self.throttle_events += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+
+    def get_stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": sum(1 for w in self._waiters if not w.done()),
+            "success_events": self.success_events,
+            "throttle_events": self.throttle_events
+        }
+
+    def _wake_waiters(self):
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
@@ -1,29 +1,233 @@
 import asyncio
 import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Optional, Sequence
 
 
-class FinnhubAsyncRateLimiter:
-    def __init__(self, max_calls: int, period: int = 60):
-        """
-        max_calls: 기간 내 최대 호출 횟수 (예: 60회)
-        period: 기간 (초 단위, 예: 60초)
-        """
-        self.period = period
-        self.max_calls = max_calls
-        self.interval = period / max_calls  # 1회 요청당 필요한 시간 (예: 1.0초)
-        self.lock = asyncio.Lock()
-        self.last_call_time = 0
-
-    async def wait(self):
-        """호출 간격을 강제로 조절"""
-        async with self.lock:
-            now = time.monotonic()
-            # 마지막 호출로부터 얼마나 지났는지 계산
-            elapsed = now - self.last_call_time
-
-            # 아직 기다려야 할 시간이 남았다면 sleep
-            wait_time = self.interval - elapsed
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
-            self.last_call_time = time.monotonic()
\ No newline at end of file
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) -> 대기 시간(초)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class _Waiter:
+    """
+    토큰 대기자 1명
+    - 여러 버킷을 함께 기다리면 같은 항목이 모든 버킷의 대기열에 같은 틱에 들어감
+      (모든 대기열에서 도착 순서가 같으므로 서로 막는 순환이 생기지 않음)
+    - 모든 버킷에서 맨 앞이고 모든 버킷에 토큰이 있을 때 한꺼번에 받음
+    """
+
+    __slots__ = ("future", "tokens", "buckets")
+
+    def __init__(self, future: asyncio.Future, tokens: float, buckets: Sequence["TokenBucket"]):
+        self.future = future
+        self.tokens = tokens
+        self.buckets = buckets
+
+    def delay(self) -> Optional[float]:
+        """모든 버킷에서 받을 수 있기까지 남은 시간 (다른 버킷에서 아직 맨 앞이 아니면 None)"""
+        delays = []
+        for bucket in self.buckets:
+            if bucket._head() is not self:
+                return None
+            bucket._refill()
+            delays.append(bucket._delay_for(self.tokens))
+        return max(delays)
+
+
+async def acquire_tokens(buckets: Sequence["TokenBucket"], tokens: float = 1.0):
+    """
+    여러 버킷의 토큰을 한꺼번에 받음 (버킷 하나면 TokenBucket.acquire와 같음)
+    - 기다리는 동안 아무것도 잡고 있지 않음: 대기열에 넣고 타이머(_wake_waiters)가 발급할 때까지 대기
+    - 어느 버킷에든 앞선 대기자가 있으면 바로 받지 않고 줄을 섬 (버킷 조합과 상관없이 FIFO)
+    """
+    for bucket in buckets:
+        bucket._refill()
+    if all(bucket._head() is None and bucket._can_grant(tokens) for bucket in buckets):
+        for bucket in buckets:
+            bucket._grant(tokens)
+        return
+
+    started = time.monotonic()
+    waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens, buckets)
+    for bucket in buckets:
+        bucket._waiters.append(waiter)
+    for bucket in buckets:
+        bucket._schedule()
+    try:
+        await waiter.future
+    except asyncio.CancelledError:
+        if waiter.future.done() and not waiter.future.cancelled():
+            # 토큰을 받은 직후 취소된 경우 -> 토큰 반납
+            for bucket in buckets:
+                bucket._tokens = min(bucket.capacity, bucket._tokens + tokens)
+        # 맨 앞에서 빠졌을 수 있으므로 뒤 대기자를 위해 다시 예약
+        for bucket in buckets:
+            bucket._schedule()
+        raise
+    finally:
+        waited = time.monotonic() - started
+        for bucket in buckets:
+            bucket.waited += 1
+            bucket.total_wait_sec += waited
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 비동기 호출 빈도 제한기
+    - rate: 초당 채워지는 토큰 수, capacity: 한 번에 몰아서 쓸 수 있는 최대 토큰 수 (burst)
+    - 대기자는 FIFO 순서로 토큰을 받음 (뒤에 온 요청이 앞지르지 않음, 여러 버킷을 함께 기다리는 대기자 포함)
+    - 락을 잡은 채로 sleep하지 않음: 맨 앞 대기자가 받을 수 있는 시각에 타이머로 깨움
+    - 429 응답 시 penalize(): Retry-After 동안 발급 중단 + 채우는 속도를 절반으로 (이후 발급마다 조금씩 회복)
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, min_rate_factor: float = 0.1,
+                 recovery_step: float = 0.02):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = rate * min_rate_factor
+        self.recovery_step = recovery_step
+
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: deque[_Waiter] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # 통계
+        self.granted = 0
+        self.waited = 0
+        self.total_wait_sec = 0.0
+        self.throttled = 0
+
+    async def acquire(self, tokens: float = 1.0):
+        await acquire_tokens((self,), tokens)
+
+    def penalize(self, retry_after: float):
+        """상대 서버가 429를 준 경우: retry_after 동안 발급 중단 + 속도 감소"""
+        self.throttled += 1
+        now = time.monotonic()
+        self._refill()
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        self._schedule()
+
+    def get_stats(self) -> dict:
+        self._refill()
+        return {
+            "name": self.name,
+            "rate_per_min": round(self.rate * 60, 2),
+            "base_rate_per_min": round(self.base_rate * 60, 2),
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "waiting": sum(1 for waiter in self._waiters if not waiter.future.done()),
+            "blocked_for_sec": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+            "granted": self.granted,
+            "throttled_429": self.throttled,
+            "avg_wait_ms": round(self.total_wait_sec / self.waited * 1000, 2) if self.waited else 0.0
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _head(self) -> Optional[_Waiter]:
+        """취소된 대기자를 걷어낸 뒤 맨 앞 대기자"""
+        while self._waiters and self._waiters[0].future.done():
+            self._waiters.popleft()
+        return self._waiters[0] if self._waiters else None
+
+    def _can_grant(self, tokens: float) -> bool:
+        return time.monotonic() >= self._blocked_until and self._tokens >= tokens
+
+    def _delay_for(self, tokens: float) -> float:
+        shortage = (tokens - self._tokens) / self.rate if self._tokens < tokens else 0.0
+        return max(0.0, self._blocked_until - time.monotonic(), shortage)
+
+    def _grant(self, tokens: float):
+        self._tokens -= tokens
+        self.granted += 1
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * self.recovery_step)
+
+    def _wake_waiters(self):
+        self._timer = None
+        touched = {self}
+        while True:
+            waiter = self._head()
+            if waiter is None or waiter.delay() != 0.0:
+                break
+            # 모든 버킷에서 맨 앞 + 모든 버킷에 토큰이 있음 -> 같은 틱에서 한꺼번에 발급
+            for bucket in waiter.buckets:
+                bucket._waiters.popleft()
+                bucket._grant(waiter.tokens)
+                touched.add(bucket)
+            waiter.future.set_result(None)
+        for bucket in touched:
+            bucket._schedule()
+
+    def _schedule(self):
+        """맨 앞 대기자가 토큰을 받을 수 있는 시각에 깨어나도록 타이머 예약"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        waiter = self._head()
+        if waiter is None:
+            return
+        delay = waiter.delay()
+        if delay is None:
+            # 다른 버킷에서 앞선 대기자를 기다리는 중 -> 그 버킷이 발급할 때 다시 예약됨
+            return
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wake_waiters)
+
+
+class RateLimiterRegistry:
+    """
+    이름 있는 토큰 버킷 모음
+    - 호출 하나가 여러 버킷(예: API 키 전체 한도 + 엔드포인트 계열 한도)을 함께 통과해야 할 때 사용
+    - 여러 버킷은 대기열 항목 하나로 모든 버킷에 줄을 서고, 모두 줄 수 있을 때 한꺼번에 받음
+      (하나를 먼저 받아 둔 채 다른 버킷을 기다리면, 받아 둔 토큰이 실제 호출보다 먼저 소진돼
+       대기가 풀리는 순간 호출이 몰려 앞 버킷의 한도를 넘을 수 있음)
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def register(self, name: str, rate_per_minute: float, burst: float) -> TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = TokenBucket(name, rate=rate_per_minute / 60.0, capacity=burst)
+            self._buckets[name] = bucket
+        return bucket
+
+    def get(self, name: str) -> TokenBucket:
+        return self._buckets[name]
+
+    async def acquire(self, *names: str, tokens: float = 1.0):
+        await acquire_tokens([self._buckets[name] for name in sorted(set(names))], tokens)
+
+    def penalize(self, names, retry_after: float):
+        for name in set(names):
+            self._buckets[name].penalize(retry_after)
+
+    def get_stats(self) -> list[dict]:
+        return [bucket.get_stats() for bucket in self._buckets.values()]
+
+
+# 앱 전체에서 공유하는 레지스트리 (버킷 등록은 각 API 클라이언트가 담당)
+rate_limiters = RateLimiterRegistry()
@@ -10,6 +10,48 @@ class Settings(BaseSettings):
     #Finnhub API Key
     FINNHUB_API_KEY: str
 
+    # Finnhub 호출 한도 (무료 플랜 분당 60회, burst = 몰아서 쓸 수 있는 호출 수)
+    # 어느 60초 구간에서든 최대 호출 수는 burst + 분당 속도 -> 3 + 52 = 55회로 60회 아래 유지
+    FINNHUB_RATE_PER_MINUTE: float = 52.0
+    FINNHUB_BURST: float = 3.0
+    FINNHUB_NEWS_RATE_PER_MINUTE: float = 52.0
+    FINNHUB_REFERENCE_RATE_PER_MINUTE: float = 40.0  # 프로필 동기화가 뉴스 수집 몫을 남겨두도록
+
+    # Finnhub 응답 캐시 (디스크 저장, 캐시 적중 시 호출 예산을 쓰지 않음)
+    FINNHUB_CACHE_ENABLED: bool = True
+    FINNHUB_CACHE_DIR: str = "data/finnhub_cache"
+    FINNHUB_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    FINNHUB_CACHE_STALE_IF_ERROR_SECONDS: float = 6 * 3600.0  # 호출 실패 시 이만큼 지난 응답까지는 대신 사용
+    FINNHUB_CACHE_TTL_SYMBOLS_SECONDS: float = 24 * 3600.0  # /stock/symbol (수 MB짜리 전체 심볼 목록)
+    FINNHUB_CACHE_TTL_PROFILE_SECONDS: float = 3600.0  # /stock/profile2
+    FINNHUB_CACHE_TTL_NEWS_SECONDS: float = 300.0  # 오늘이 포함된 뉴스 구간 / 일반 뉴스
+    FINNHUB_CACHE_TTL_PAST_NEWS_SECONDS: float = 24 * 3600.0  # 어제 이전에 끝난 뉴스 구간 (거의 바뀌지 않음)
+
+    # Finviz 스크리너 예의(politeness) 예산 (봇 차단 방지)
+    FINVIZ_RATE_PER_MINUTE: float = 20.0
+    FINVIZ_BURST: float = 2.0
+    FINVIZ_MAX_CONCURRENCY: int = 2
+
+    # 기사 원문 크롤링 (도메인별 스케줄러)
+    CRAWL_MAX_CONCURRENCY: int = 10  # 전체 동시 크롤링 수
+    CRAWL_PER_HOST_CONCURRENCY: int = 2
+    CRAWL_PER_HOST_RATE_PER_MINUTE: float = 30.0
+    CRAWL_PER_HOST_BURST: float = 3.0
+    CRAWL_BREAKER_WINDOW: int = 20  # 최근 몇 건으로 실패율을 볼지
+    CRAWL_BREAKER_MIN_SAMPLES: int = 5
+    CRAWL_BREAKER_FAILURE_RATIO: float = 0.8  # 오류 + 본문 추출 실패 비율
+    CRAWL_BREAKER_COOLDOWN_SECONDS: float = 300.0
+    CRAWL_BREAKER_MAX_COOLDOWN_SECONDS: float = 3600.0
+    CRAWL_MAX_BYTES: int = 2 * 1024 * 1024  # 기사 페이지 하나에서 최대로 읽을 크기 (넘으면 나머지는 받지 않음)
+    HTML_PARSE_WORKERS: int = 2  # 기사 HTML 파싱 스레드 수
+    HTML_PARSER: str = "html.parser"  # "lxml"이면 lxml 사용 (설치된 경우만)
+
+    # 기사 본문 캐시 (최종 URL 기준, 종목 간 공유)
+    ARTICLE_CACHE_ENABLED: bool = True
+    ARTICLE_CACHE_PATH: str = "data/article_cache.sqlite3"
+    ARTICLE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 본문 텍스트 합계 기준
+    ARTICLE_CACHE_MISS_TTL_SECONDS: float = 24 * 3600.0  # 본문 추출 실패 결과를 재사용하는 기간
+
     #OpenAI API Key
     OPENAI_API_KEY: str
 
@@ -18,6 +60,33 @@ class Settings(BaseSettings):
     # 우리가 Docker에서 8000번 포트로 열었기 때문입니다.
     DYNAMODB_ENDPOINT_URL: Optional[str] ="http://host.docker.internal:8000" #도커상에서 로컬 접속 못함 추후 수정 필요 "http://localhost:8000"
 
+    # 저장소 백엔드: "dynamodb"(기본) / "memory"(DynamoDB 없이 로컬 벤치마크용)
+    STORAGE_BACKEND: str = "dynamodb"
+
+    # DynamoDB 커넥션 풀 설정 (lifespan에서 한 번 생성해서 공유)
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = 50
+    DYNAMODB_CONNECT_TIMEOUT: float = 5.0
+    DYNAMODB_READ_TIMEOUT: float = 10.0
+
+    # 리포트 조회 캐시 (ReportService)
+    REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REPORT_CACHE_TTL_SECONDS: float = 600.0
+    REPORT_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0
+
+    # 종목별 일간 뉴스 다이제스트 (DIGEST#{date} 아이템)
+    NEWS_DIGEST_MAX_BYTES: int = 64 * 1024  # 넘으면 더 붙이지 않고 잘림 표시 (조회는 기간 조회로 대체)
+    NEWS_DIGEST_CONTENT_MAX_CHARS: int = 6000
+
+    # 프로필 증분 갱신 (ProfileRefreshScheduler)
+    PROFILE_REFRESH_ENABLED: bool = False  # True면 lifespan에서 하루 종일 나눠서 갱신
+    PROFILE_REFRESH_MAX_AGE_HOURS: float = 72.0
+    PROFILE_REFRESH_HOT_MAX_AGE_HOURS: float = 24.0  # 대형주 / 신규 상장
+    PROFILE_REFRESH_HOT_MARKET_CAP: float = 10_000.0  # 백만 달러 단위 (Finnhub marketCapitalization)
+    PROFILE_REFRESH_NEW_LISTING_DAYS: int = 90
+    PROFILE_REFRESH_DAILY_BUDGET: int = 20_000  # 하루 profile2 호출 수 (뉴스 수집 몫은 남겨둠)
+    PROFILE_REFRESH_INTERVAL_SECONDS: float = 900.0
+    PROFILE_REFRESH_STATE_PATH: str = "data/profile_refresh_state.json"
+
     #AWS 설정
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
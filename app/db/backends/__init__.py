@@ -0,0 +1,34 @@
+from app.core.settings import settings
+from app.db.backends.base import StorageBackend
+
+# 테이블 이름별 백엔드 인스턴스 (프로세스 전체에서 공유)
+_backends: dict[str, StorageBackend] = {}
+
+
+def create_storage_backend(kind: str, table_name: str, **kwargs) -> StorageBackend:
+    """
+    kind에 맞는 저장소 백엔드를 생성합니다.
+    - "dynamodb": 실제 DynamoDB (기본값)
+    - "memory": 정렬된 인메모리 구현 (DynamoDB 없이 벤치마크/부하 테스트)
+    """
+    if kind == "dynamodb":
+        from app.db.backends.dynamodb import DynamoDBBackend
+        return DynamoDBBackend(table_name, **kwargs)
+    if kind == "memory":
+        from app.db.backends.memory import InMemoryBackend
+        return InMemoryBackend(table_name, **kwargs)
+    raise ValueError(f"알 수 없는 저장소 백엔드: {kind}")
+
+
+def get_storage_backend(table_name: str = "StockProjectData") -> StorageBackend:
+    """설정(STORAGE_BACKEND)에 맞는 공유 백엔드를 반환합니다."""
+    backend = _backends.get(table_name)
+    if backend is None:
+        backend = create_storage_backend(settings.STORAGE_BACKEND, table_name)
+        _backends[table_name] = backend
+    return backend
+
+
+def set_storage_backend(backend: StorageBackend):
+    """백엔드를 직접 지정합니다. (벤치마크 등에서 백엔드를 바꿔 끼울 때 사용)"""
+    _backends[backend.table_name] = backend
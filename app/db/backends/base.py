@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class StorageBackend(ABC):
+    """
+    Single Table(StockProjectData) 저장소 추상화
+    - 아이템은 PK/SK를 포함한 dict
+    - key_condition / filter_condition은 boto3 조건 객체(Key, Attr)를 그대로 사용
+    - 배치 연산은 호출 1회 단위 (batch_get: 최대 100개, batch_write: 최대 25개)
+      재시도/동시성 제어는 app.db.utils의 공용 엔진이 담당
+    """
+
+    name: str = "base"
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+
+    async def start(self):
+        """연결 준비 (필요한 백엔드만 구현)"""
+
+    async def stop(self):
+        """연결 정리 (필요한 백엔드만 구현)"""
+
+    @abstractmethod
+    async def health_check(self) -> dict:
+        pass
+
+    @abstractmethod
+    async def put_item(self, item: dict):
+        pass
+
+    @abstractmethod
+    async def get_item(self, key: dict, projection: Optional[list] = None) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def update_attributes(self, key: dict, values: dict):
+        """아이템의 일부 속성만 설정 (아이템이 없으면 키 + values로 생성)"""
+
+    @abstractmethod
+    async def append_to_list(self, key: dict, attribute: str, values: list, size_attribute: str, size: int,
+                             max_size: int, defaults: Optional[dict] = None, updates: Optional[dict] = None) -> bool:
+        """
+        리스트 속성 끝에 values를 붙임 (읽기 없이 원자적으로, 아이템이 없으면 생성)
+        - size_attribute(누적 크기)에 size를 더한 값이 max_size를 넘으면 붙이지 않고 False
+        - defaults: 속성이 없을 때만 설정 / updates: 항상 설정
+        """
+
+    @abstractmethod
+    async def query(self, key_condition, filter_condition=None, projection: Optional[list] = None,
+                    limit: Optional[int] = None, exclusive_start_key: Optional[dict] = None) -> tuple[list, Optional[dict]]:
+        """
+        반환: (아이템 리스트, LastEvaluatedKey 또는 None)
+        - limit: 필터 적용 전 기준으로 평가할 최대 아이템 수 (DynamoDB Limit과 동일)
+        """
+
+    @abstractmethod
+    async def batch_get(self, keys: list, projection: Optional[list] = None,
+                        consistent_read: bool = False) -> tuple[list, list]:
+        """반환: (조회된 아이템 리스트, 처리되지 못한 Key 리스트)"""
+
+    @abstractmethod
+    async def batch_write(self, items: list) -> list:
+        """반환: 처리되지 못한 아이템 리스트"""
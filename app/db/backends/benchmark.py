@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.db.backends import create_storage_backend, set_storage_backend
+from app.db.repositories.reportRepository import ReportRepository
+from app.db.repositories.StockNewsRepository import NewsRepository
+from app.db.write_buffer import BatchWriteBuffer
+from app.schemas.stockNews import StockNews
+
+TABLE_NAME = "StockProjectData"
+BASE_TS = 1_764_000_000  # 2025-11-24 무렵
+
+
+def _percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(label: str, count: int, elapsed: float, latencies: list):
+    latencies_ms = [lat * 1000 for lat in latencies]
+    print(
+        f"📊 {label:<14} | {count:>7}건 | {elapsed:7.2f}s | {count / elapsed if elapsed else 0:9.1f}건/s"
+        f" | p50 {_percentile(latencies_ms, 50):7.2f}ms | p99 {_percentile(latencies_ms, 99):7.2f}ms"
+        f" | mean {statistics.fmean(latencies_ms) if latencies_ms else 0:7.2f}ms"
+    )
+
+
+def _make_news(symbols: list, per_symbol: int, seed: int) -> list[StockNews]:
+    rng = random.Random(seed)
+    news = []
+    for symbol in symbols:
+        for i in range(per_symbol):
+            news.append(StockNews(
+                id=rng.randrange(100_000_000, 999_999_999),
+                symbol=symbol,
+                datetime=BASE_TS + i * 60,
+                headline=f"{symbol} synthetic headline {i}",
+                summary="synthetic summary " * 8,
+                url=f"https://example.com/{symbol}/{i}",
+                source="Benchmark",
+                content="synthetic body " * 200,
+                sentiment=rng.choice(["POSITIVE", "NEGATIVE", "NEUTRAL"]),
+                impact_score=rng.randint(0, 10),
+                ai_summary="synthetic ai summary"
+            ))
+    return news
+
+
+async def bench_writes(news_repo: NewsRepository, news: list, batch: int, use_buffer: bool):
+    """save_news_batch 호출 단위 (워커 1회 처리분) 지연시간 측정"""
+    write_buffer = BatchWriteBuffer(TABLE_NAME) if use_buffer else None
+    if write_buffer:
+        await write_buffer.start()
+
+    async def save(chunk):
+        started = time.perf_counter()
+        await news_repo.save_news_batch(chunk, write_buffer=write_buffer)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    chunks = [news[i:i + batch] for i in range(0, len(news), batch)]
+    latencies = await asyncio.gather(*(save(chunk) for chunk in chunks))
+    if write_buffer:
+        await write_buffer.stop()
+    _report("write" + ("(buffer)" if use_buffer else ""), len(news), time.perf_counter() - started, latencies)
+
+
+async def bench_queries(news_repo: NewsRepository, symbols: list, per_symbol: int, rounds: int):
+    """종목별 기간 조회 (페이지네이션 포함) 지연시간 측정"""
+    async def query(symbol):
+        started = time.perf_counter()
+        count = 0
+        async for _ in news_repo.stream_news_by_date(symbol, BASE_TS, BASE_TS + per_symbol * 60,
+                                                     min_importance=6, projection=['datetime', 'summary', 'url'],
+                                                     page_size=100):
+            count += 1
+        return time.perf_counter() - started, count
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(query(symbol) for _ in range(rounds) for symbol in symbols))
+    elapsed = time.perf_counter() - started
+    _report("query", sum(count for _, count in results), elapsed, [lat for lat, _ in results])
+
+
+async def bench_reports(report_repo: ReportRepository, symbols: list, rounds: int):
+    """리포트 저장 후 batch 조회 지연시간 측정"""
+    await asyncio.gather(*(
+        report_repo.save_report(symbol, f"<html><body>{symbol} report</body></html>", "aggressive")
+        for symbol in symbols
+    ))
+    today = time.strftime("%Y-%m-%d")
+
+    async def lookup():
+        started = time.perf_counter()
+        await report_repo.get_report_batch(symbols, today, "aggressive")
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(lookup() for _ in range(rounds)))
+    _report("report_batch", len(symbols) * rounds, time.perf_counter() - started, latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="저장소 백엔드 처리량/지연시간 벤치마크")
+    parser.add_argument("--backend", choices=["memory", "dynamodb"], default="memory")
+    parser.add_argument("--latency", type=float, default=0.0, help="memory 백엔드 호출당 인위적 지연(초)")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--per-symbol", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=10, help="save_news_batch 1회당 뉴스 개수")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--buffer", action="store_true", help="BatchWriteBuffer를 거쳐 저장")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    kwargs = {"latency": args.latency} if args.backend == "memory" else {}
+    backend = create_storage_backend(args.backend, TABLE_NAME, **kwargs)
+    set_storage_backend(backend)
+    await backend.start()
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    news = _make_news(symbols, args.per_symbol, args.seed)
+    print(f"🚀 backend={backend.name} latency={args.latency}s symbols={len(symbols)} news={len(news)}")
+
+    try:
+        news_repo = NewsRepository()
+        await bench_writes(news_repo, news, args.batch, args.buffer)
+        await bench_queries(news_repo, symbols, args.per_symbol, args.rounds)
+        await bench_reports(ReportRepository(), symbols, args.rounds)
+    finally:
+        await backend.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
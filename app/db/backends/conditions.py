@@ -0,0 +1,92 @@
+from boto3.dynamodb.conditions import AttributeBase
+
+_MISSING = object()
+
+
+def _resolve(value, item: dict):
+    """조건식의 피연산자: 속성(Key/Attr)이면 아이템 값, 아니면 리터럴 그대로"""
+    if isinstance(value, AttributeBase):
+        return item.get(value.name, _MISSING)
+    return value
+
+
+def _compare(left, right, compare) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    try:
+        return compare(left, right)
+    except TypeError:
+        # DynamoDB도 타입이 다른 값끼리의 비교는 false
+        return False
+
+
+def evaluate_condition(condition, item: dict) -> bool:
+    """
+    boto3 조건 객체(Key/Attr로 만든 KeyConditionExpression, FilterExpression)를
+    파이썬 dict 아이템에 대해 평가합니다. (로컬 백엔드용)
+    """
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+
+    if operator == 'AND':
+        return evaluate_condition(values[0], item) and evaluate_condition(values[1], item)
+    if operator == 'OR':
+        return evaluate_condition(values[0], item) or evaluate_condition(values[1], item)
+    if operator == 'NOT':
+        return not evaluate_condition(values[0], item)
+
+    if operator == 'attribute_exists':
+        return _resolve(values[0], item) is not _MISSING
+    if operator == 'attribute_not_exists':
+        return _resolve(values[0], item) is _MISSING
+
+    left = _resolve(values[0], item)
+
+    if operator == '=':
+        return left is not _MISSING and left == _resolve(values[1], item)
+    if operator == '<>':
+        return left is _MISSING or left != _resolve(values[1], item)
+    if operator == '<':
+        return _compare(left, _resolve(values[1], item), lambda a, b: a < b)
+    if operator == '<=':
+        return _compare(left, _resolve(values[1], item), lambda a, b: a <= b)
+    if operator == '>':
+        return _compare(left, _resolve(values[1], item), lambda a, b: a > b)
+    if operator == '>=':
+        return _compare(left, _resolve(values[1], item), lambda a, b: a >= b)
+    if operator == 'BETWEEN':
+        low, high = _resolve(values[1], item), _resolve(values[2], item)
+        return _compare(left, low, lambda a, b: a >= b) and _compare(left, high, lambda a, b: a <= b)
+    if operator == 'IN':
+        return left is not _MISSING and left in values[1]
+    if operator == 'begins_with':
+        prefix = _resolve(values[1], item)
+        return isinstance(left, (str, bytes)) and type(left) is type(prefix) and left.startswith(prefix)
+    if operator == 'contains':
+        operand = _resolve(values[1], item)
+        return _compare(left, operand, lambda a, b: b in a)
+
+    raise NotImplementedError(f"지원하지 않는 조건 연산자: {operator}")
+
+
+def split_key_condition(key_condition, partition_key: str) -> tuple:
+    """
+    KeyConditionExpression을 (파티션 키 값, 정렬 키 조건 또는 None)으로 분리합니다.
+    """
+    expression = key_condition.get_expression()
+    parts = expression['values'] if expression['operator'] == 'AND' else (key_condition,)
+
+    pk_value, sk_condition = _MISSING, None
+    for part in parts:
+        part_expression = part.get_expression()
+        attribute = part_expression['values'][0]
+        if part_expression['operator'] == '=' and getattr(attribute, 'name', None) == partition_key:
+            pk_value = part_expression['values'][1]
+        else:
+            sk_condition = part
+
+    if pk_value is _MISSING:
+        raise ValueError(f"Query에는 파티션 키({partition_key}) 동등 조건이 필요합니다.")
+
+    return pk_value, sk_condition
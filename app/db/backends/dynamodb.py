@@ -0,0 +1,152 @@
+from typing import Optional
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from botocore.exceptions import ClientError
+
+from app.db.backends.base import StorageBackend
+from app.db.connection import dynamodb_manager, get_dynamodb_client
+from app.db.serializer import deserialize_item, serialize_item, serialize_value
+from app.db.utils import build_projection
+
+
+class DynamoDBBackend(StorageBackend):
+    """
+    실제 DynamoDB(aioboto3) 구현
+    - 공유 커넥션 풀(dynamodb_manager)의 저수준 client를 사용
+    - 아이템/키는 app.db.serializer로 직접 wire 포맷 변환 (resource 계층의 TypeSerializer 생략)
+    - 스로틀링 ClientError는 그대로 올려보냄 (재시도는 공용 엔진 담당)
+    """
+
+    name = "dynamodb"
+
+    async def start(self):
+        await dynamodb_manager.start(warmup_tables=(self.table_name,))
+
+    async def stop(self):
+        await dynamodb_manager.stop()
+
+    async def health_check(self) -> dict:
+        return await dynamodb_manager.health_check(self.table_name)
+
+    async def put_item(self, item: dict):
+        async with get_dynamodb_client() as client:
+            await client.put_item(TableName=self.table_name, Item=serialize_item(item))
+
+    async def get_item(self, key: dict, projection: Optional[list] = None) -> Optional[dict]:
+        async with get_dynamodb_client() as client:
+            response = await client.get_item(
+                TableName=self.table_name, Key=serialize_item(key), **build_projection(projection)
+            )
+        item = response.get('Item')
+        return deserialize_item(item) if item is not None else None
+
+    async def update_attributes(self, key: dict, values: dict):
+        names = {f"#a{i}": name for i, name in enumerate(values)}
+        async with get_dynamodb_client() as client:
+            await client.update_item(
+                TableName=self.table_name,
+                Key=serialize_item(key),
+                UpdateExpression="SET " + ", ".join(f"#a{i} = :a{i}" for i in range(len(values))),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues={f":a{i}": serialize_value(value) for i, value in enumerate(values.values())}
+            )
+
+    async def append_to_list(self, key: dict, attribute: str, values: list, size_attribute: str, size: int,
+                             max_size: int, defaults: Optional[dict] = None, updates: Optional[dict] = None) -> bool:
+        if size > max_size:
+            return False
+
+        names = {"#list": attribute, "#size": size_attribute}
+        attr_values = {
+            ":values": serialize_value(values),
+            ":empty": {"L": []},
+            ":zero": serialize_value(0),
+            ":size": serialize_value(size),
+            ":room": serialize_value(max_size - size)
+        }
+        clauses = ["#list = list_append(if_not_exists(#list, :empty), :values)",
+                   "#size = if_not_exists(#size, :zero) + :size"]
+        for prefix, attributes, template in (("d", defaults, "{n} = if_not_exists({n}, {v})"), ("u", updates, "{n} = {v}")):
+            for i, (name, value) in enumerate((attributes or {}).items()):
+                names[f"#{prefix}{i}"] = name
+                attr_values[f":{prefix}{i}"] = serialize_value(value)
+                clauses.append(template.format(n=f"#{prefix}{i}", v=f":{prefix}{i}"))
+
+        try:
+            async with get_dynamodb_client() as client:
+                await client.update_item(
+                    TableName=self.table_name,
+                    Key=serialize_item(key),
+                    UpdateExpression="SET " + ", ".join(clauses),
+                    ConditionExpression="attribute_not_exists(#size) OR #size <= :room",
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=attr_values
+                )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            raise
+        return True
+
+    async def query(self, key_condition, filter_condition=None, projection: Optional[list] = None,
+                    limit: Optional[int] = None, exclusive_start_key: Optional[dict] = None) -> tuple[list, Optional[dict]]:
+        query_kwargs = {'TableName': self.table_name, **build_projection(projection)}
+        attr_names = query_kwargs.pop('ExpressionAttributeNames', {})
+        attr_values = {}
+
+        # 조건 객체 -> 표현식 문자열 (#n0 / :v0 placeholder, projection의 #p0과 겹치지 않음)
+        builder = ConditionExpressionBuilder()
+        expression = builder.build_expression(key_condition, is_key_condition=True)
+        query_kwargs['KeyConditionExpression'] = expression.condition_expression
+        attr_names.update(expression.attribute_name_placeholders)
+        attr_values.update(expression.attribute_value_placeholders)
+
+        if filter_condition is not None:
+            expression = builder.build_expression(filter_condition)
+            query_kwargs['FilterExpression'] = expression.condition_expression
+            attr_names.update(expression.attribute_name_placeholders)
+            attr_values.update(expression.attribute_value_placeholders)
+
+        query_kwargs['ExpressionAttributeNames'] = attr_names
+        query_kwargs['ExpressionAttributeValues'] = {
+            placeholder: serialize_value(value) for placeholder, value in attr_values.items()
+        }
+        if limit:
+            query_kwargs['Limit'] = limit
+        if exclusive_start_key:
+            query_kwargs['ExclusiveStartKey'] = serialize_item(exclusive_start_key)
+
+        async with get_dynamodb_client() as client:
+            response = await client.query(**query_kwargs)
+
+        last_key = response.get('LastEvaluatedKey')
+        return (
+            [deserialize_item(item) for item in response.get('Items', [])],
+            deserialize_item(last_key) if last_key else None
+        )
+
+    async def batch_get(self, keys: list, projection: Optional[list] = None,
+                        consistent_read: bool = False) -> tuple[list, list]:
+        request = {
+            'Keys': [serialize_item(key) for key in keys],
+            'ConsistentRead': consistent_read,
+            **build_projection(projection)
+        }
+
+        async with get_dynamodb_client() as client:
+            response = await client.batch_get_item(RequestItems={self.table_name: request})
+
+        items = response.get('Responses', {}).get(self.table_name, [])
+        unprocessed = response.get('UnprocessedKeys', {}).get(self.table_name, {})
+        return [deserialize_item(item) for item in items], [deserialize_item(key) for key in unprocessed.get('Keys', [])]
+
+    async def batch_write(self, items: list) -> list:
+        request_items = {
+            self.table_name: [{'PutRequest': {'Item': serialize_item(item)}} for item in items]
+        }
+
+        async with get_dynamodb_client() as client:
+            response = await client.batch_write_item(RequestItems=request_items)
+
+        unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+        return [deserialize_item(req['PutRequest']['Item']) for req in unprocessed]
@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import time
+from decimal import Decimal
+from typing import Optional
+
+from app.db.backends.base import StorageBackend
+from app.db.backends.conditions import evaluate_condition, split_key_condition
+
+
+def _normalize(value):
+    """
+    DynamoDB에 저장/조회되는 것과 같은 형태로 값을 변환 + 복사합니다.
+    - 숫자(int)는 Decimal로 (boto3 조회 결과와 동일)
+    - float은 boto3처럼 거부
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, (str, Decimal)):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if hasattr(value, "value") and isinstance(value.value, (bytes, bytearray)):
+        return bytes(value.value)  # boto3 Binary
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {_normalize(v) for v in value}
+    raise TypeError(f"Unsupported type \"{type(value)}\" for value \"{value}\"")
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    정렬된 인메모리 Single Table 구현 (DynamoDB 없이 벤치마크/부하 테스트용)
+    - 파티션(PK)별로 정렬 키(SK)를 정렬된 리스트로 유지 -> 범위 조회는 bisect
+    - KeyCondition/Filter는 boto3 조건 객체를 그대로 평가
+    - TTL: ttl 속성이 현재 시각보다 과거인 아이템은 만료된 것으로 보고 조회에서 제외 (접근 시 삭제)
+    - latency: 호출마다 넣을 인위적 지연(초) -> 네트워크 왕복 비용 흉내
+    """
+
+    name = "memory"
+
+    def __init__(self, table_name: str, partition_key: str = "PK", sort_key: str = "SK",
+                 ttl_attribute: Optional[str] = "ttl", latency: float = 0.0):
+        super().__init__(table_name)
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.ttl_attribute = ttl_attribute
+        self.latency = latency
+
+        self._items: dict[tuple, dict] = {}
+        self._sort_keys: dict[str, list] = {}
+
+    async def health_check(self) -> dict:
+        return {"status": "ok", "table": self.table_name, "backend": self.name, "item_count": len(self._items)}
+
+    async def put_item(self, item: dict):
+        await self._simulate_latency()
+        self._put(item)
+
+    async def get_item(self, key: dict, projection: Optional[list] = None) -> Optional[dict]:
+        await self._simulate_latency()
+        item = self._get((key[self.partition_key], key[self.sort_key]))
+        return self._project(item, projection) if item is not None else None
+
+    async def update_attributes(self, key: dict, values: dict):
+        await self._simulate_latency()
+        current = self._get((key[self.partition_key], key[self.sort_key]))
+        self._put({**(_copy(current) if current else dict(key)), **values})
+
+    async def append_to_list(self, key: dict, attribute: str, values: list, size_attribute: str, size: int,
+                             max_size: int, defaults: Optional[dict] = None, updates: Optional[dict] = None) -> bool:
+        await self._simulate_latency()
+        current = self._get((key[self.partition_key], key[self.sort_key]))
+        item = _copy(current) if current else dict(key)
+
+        current_size = int(item.get(size_attribute, 0))
+        if current_size + size > max_size:
+            return False
+
+        item[attribute] = list(item.get(attribute, [])) + list(values)
+        item[size_attribute] = current_size + size
+        for name, value in (defaults or {}).items():
+            item.setdefault(name, value)
+        item.update(updates or {})
+        self._put(item)
+        return True
+
+    async def query(self, key_condition, filter_condition=None, projection: Optional[list] = None,
+                    limit: Optional[int] = None, exclusive_start_key: Optional[dict] = None) -> tuple[list, Optional[dict]]:
+        await self._simulate_latency()
+
+        pk_value, sk_condition = split_key_condition(key_condition, self.partition_key)
+        sort_keys = self._sort_keys.get(pk_value, [])
+
+        start, end = self._sort_key_range(sort_keys, sk_condition)
+        if exclusive_start_key:
+            start = max(start, bisect.bisect_right(sort_keys, exclusive_start_key[self.sort_key]))
+
+        items, evaluated = [], 0
+        for index in range(start, end):
+            sk = sort_keys[index]
+            # 순회 중에는 리스트를 건드리지 않도록 만료 아이템은 삭제하지 않고 건너뜀
+            item = self._get((pk_value, sk), purge_expired=False)
+            if item is None or (sk_condition is not None and not evaluate_condition(sk_condition, item)):
+                continue
+
+            evaluated += 1
+            if filter_condition is None or evaluate_condition(filter_condition, item):
+                items.append(self._project(item, projection))
+
+            if limit and evaluated >= limit:
+                if index + 1 < end:
+                    return items, {self.partition_key: pk_value, self.sort_key: sk}
+                break
+
+        return items, None
+
+    async def batch_get(self, keys: list, projection: Optional[list] = None,
+                        consistent_read: bool = False) -> tuple[list, list]:
+        if len(keys) > 100:
+            raise ValueError("Too many items requested for the BatchGetItem call")
+        key_tuples = [(key[self.partition_key], key[self.sort_key]) for key in keys]
+        if len(set(key_tuples)) != len(key_tuples):
+            raise ValueError("Provided list of item keys contains duplicates")
+
+        await self._simulate_latency()
+        items = []
+        for key in key_tuples:
+            item = self._get(key)
+            if item is not None:
+                items.append(self._project(item, projection))
+        return items, []
+
+    async def batch_write(self, items: list) -> list:
+        if len(items) > 25:
+            raise ValueError("Too many items requested for the BatchWriteItem call")
+        key_tuples = [(item[self.partition_key], item[self.sort_key]) for item in items]
+        if len(set(key_tuples)) != len(key_tuples):
+            raise ValueError("Provided list of item keys contains duplicates")
+
+        await self._simulate_latency()
+        for item in items:
+            self._put(item)
+        return []
+
+    def _put(self, item: dict):
+        stored = _normalize(item)
+        key = (stored[self.partition_key], stored[self.sort_key])
+        if key not in self._items:
+            bisect.insort(self._sort_keys.setdefault(key[0], []), key[1])
+        self._items[key] = stored
+
+    def _get(self, key: tuple, purge_expired: bool = True) -> Optional[dict]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if self._is_expired(item):
+            if purge_expired:
+                self._delete(key)
+            return None
+        return item
+
+    @staticmethod
+    def _sort_key_range(sort_keys: list, sk_condition) -> tuple[int, int]:
+        """정렬 키 조건으로 순회할 인덱스 범위를 bisect로 좁힘 (나머지 조건은 평가 단계에서 확인)"""
+        if sk_condition is None:
+            return 0, len(sort_keys)
+
+        expression = sk_condition.get_expression()
+        operator, values = expression['operator'], expression['values']
+
+        if operator == 'BETWEEN':
+            return bisect.bisect_left(sort_keys, values[1]), bisect.bisect_right(sort_keys, values[2])
+        if operator == '=':
+            return bisect.bisect_left(sort_keys, values[1]), bisect.bisect_right(sort_keys, values[1])
+        if operator == 'begins_with' and isinstance(values[1], str):
+            return bisect.bisect_left(sort_keys, values[1]), bisect.bisect_left(sort_keys, values[1] + '\U0010ffff')
+        if operator in ('>', '>='):
+            return bisect.bisect_left(sort_keys, values[1]), len(sort_keys)
+        if operator in ('<', '<='):
+            return 0, bisect.bisect_right(sort_keys, values[1])
+
+        return 0, len(sort_keys)
+
+    def _delete(self, key: tuple):
+        self._items.pop(key, None)
+        sort_keys = self._sort_keys.get(key[0], [])
+        index = bisect.bisect_left(sort_keys, key[1])
+        if index < len(sort_keys) and sort_keys[index] == key[1]:
+            sort_keys.pop(index)
+
+    def _is_expired(self, item: dict) -> bool:
+        if not self.ttl_attribute:
+            return False
+        expire_at = item.get(self.ttl_attribute)
+        return isinstance(expire_at, Decimal) and expire_at < time.time()
+
+    @staticmethod
+    def _project(item: dict, projection: Optional[list]) -> dict:
+        if not projection:
+            return _copy(item)
+        return {attr: _copy(item[attr]) for attr in projection if attr in item}
+
+    async def _simulate_latency(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        else:
+            await asyncio.sleep(0)
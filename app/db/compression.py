@@ -0,0 +1,59 @@
+import gzip
+from typing import Optional
+
+# 저장 시 사용하는 기본 압축 포맷 (아이템의 content_encoding 속성에 함께 기록)
+DEFAULT_CONTENT_ENCODING = "gzip"
+
+# content_encoding 마커 -> (압축 함수, 해제 함수)
+_CODECS = {
+    "gzip": (
+        lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+        gzip.decompress
+    ),
+    "identity": (
+        lambda data: data,
+        lambda data: data
+    ),
+}
+
+
+def to_bytes(value) -> Optional[bytes]:
+    """DynamoDB Binary 타입(boto3 Binary) / bytes / bytearray를 bytes로 통일"""
+    if value is None:
+        return None
+    if hasattr(value, "value"):
+        value = value.value
+    return bytes(value)
+
+
+def compress_text(text: str, encoding: str = DEFAULT_CONTENT_ENCODING) -> bytes:
+    compress, _ = _CODECS[encoding]
+    return compress(text.encode("utf-8"))
+
+
+def decompress_text(data, encoding: str = DEFAULT_CONTENT_ENCODING) -> str:
+    _, decompress = _CODECS[encoding]
+    return decompress(to_bytes(data)).decode("utf-8")
+
+
+def accepts_encoding(accept_encoding_header: Optional[str], encoding: str) -> bool:
+    """
+    Accept-Encoding 헤더가 해당 인코딩을 허용하는지 확인합니다.
+    (예: "gzip, deflate, br" / "gzip;q=0" 은 거부)
+    """
+    if not accept_encoding_header:
+        return False
+
+    for token in accept_encoding_header.split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+
+    return False
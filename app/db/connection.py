@@ -1,7 +1,15 @@
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Optional
+
 import aioboto3
-from contextlib import asynccontextmanager
+from aiobotocore.config import AioConfig
+
 from app.core.settings import settings
 
+logger = logging.getLogger("DynamoDB")
+
 # 1. 세션 설정 (환경에 따라 분기)
 session_args = {"region_name": settings.AWS_REGION}
 resource_args = {}
@@ -21,11 +29,110 @@ else:
 # 전역 세션 생성
 session = aioboto3.Session(**session_args)
 
+
+class DynamoDBConnectionManager:
+    """
+    앱 라이프사이클 동안 하나의 DynamoDB 저수준 client(커넥션 풀)를 유지하는 매니저
+    - start(): client 생성 + 테이블 describe로 자격증명/TLS 연결 미리 확보 (pre-warm)
+    - stop(): 커넥션 풀 정리
+    - 아이템 직렬화는 resource 계층 대신 app.db.serializer가 담당
+    """
+
+    def __init__(self, max_pool_connections: int = 50, connect_timeout: float = 5.0, read_timeout: float = 10.0):
+        self.max_pool_connections = max_pool_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._stack: Optional[AsyncExitStack] = None
+        self._client = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None
+
+    async def start(self, warmup_tables: tuple = ("StockProjectData",)):
+        """client(커넥션 풀) 생성 및 워밍업"""
+        if self.is_started:
+            return
+
+        config = AioConfig(
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            tcp_keepalive=True
+        )
+
+        stack = AsyncExitStack()
+        try:
+            self._client = await stack.enter_async_context(
+                session.client("dynamodb", config=config, **resource_args)
+            )
+        except Exception:
+            await stack.aclose()
+            raise
+        self._stack = stack
+
+        # 첫 요청에서 자격증명 조회 + TLS 핸드셰이크 비용을 내지 않도록 미리 연결해둠
+        for table_name in warmup_tables:
+            health = await self.health_check(table_name)
+            if health["status"] != "ok":
+                logger.warning(f"⚠️ DynamoDB 워밍업 실패 ({table_name}): {health.get('error')}")
+
+        logger.info(f"🔌 DynamoDB 커넥션 풀 준비 완료 (max_pool_connections={self.max_pool_connections})")
+
+    async def stop(self):
+        """커넥션 풀 정리"""
+        if self._stack is not None:
+            await self._stack.aclose()
+        self._stack = None
+        self._client = None
+        logger.info("🔌 DynamoDB 커넥션 풀 종료")
+
+    @property
+    def client(self):
+        return self._client
+
+    async def health_check(self, table_name: str = "StockProjectData") -> dict:
+        """테이블 describe 호출로 연결 상태 확인"""
+        if not self.is_started:
+            return {"status": "stopped", "table": table_name}
+
+        started = time.perf_counter()
+        try:
+            response = await self._client.describe_table(TableName=table_name)
+            return {
+                "status": "ok",
+                "table": table_name,
+                "table_status": response["Table"].get("TableStatus"),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "table": table_name,
+                "error": str(e),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+
+
+# 앱 전체에서 공유하는 매니저 (main.py / main_worker.py의 lifespan에서 start/stop)
+dynamodb_manager = DynamoDBConnectionManager(
+    max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+    connect_timeout=settings.DYNAMODB_CONNECT_TIMEOUT,
+    read_timeout=settings.DYNAMODB_READ_TIMEOUT
+)
+
+
 @asynccontextmanager
-async def get_dynamodb_table(table_name: str):
+async def get_dynamodb_client():
     """
-    DynamoDB Table 리소스를 제공하는 비동기 Context Manager
+    DynamoDB 저수준 client를 제공하는 비동기 Context Manager
+    - 매니저가 가동 중이면 공유 커넥션 풀의 client를 그대로 사용
+    - 단독 스크립트처럼 매니저가 없을 때만 요청마다 client를 새로 생성
     """
-    async with session.resource("dynamodb", **resource_args) as dynamodb:
-        table = await dynamodb.Table(table_name)
-        yield table
\ No newline at end of file
+    if dynamodb_manager.is_started:
+        yield dynamodb_manager.client
+        return
+
+    async with session.client("dynamodb", **resource_args) as client:
+        yield client
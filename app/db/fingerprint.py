@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from app.db.utils import execute_batch_get
+
+logger = logging.getLogger("Fingerprint")
+
+# 아이템에 함께 저장되는 지문 속성 이름
+FINGERPRINT_ATTRIBUTE = "content_hash"
+
+# 지문 계산에서 항상 빼는 속성 (키 / 지문 자신)
+_ALWAYS_EXCLUDED = frozenset({"PK", "SK", FINGERPRINT_ATTRIBUTE})
+
+
+def _normalize(value):
+    if isinstance(value, Decimal):
+        # 1.50 / 1.5 처럼 표현만 다른 숫자는 같은 값으로
+        return str(value.normalize())
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.blake2b(value, digest_size=16).hexdigest()
+    if isinstance(value, (set, frozenset)):
+        return sorted(_normalize(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def compute_fingerprint(item: dict, exclude: Iterable[str] = ()) -> str:
+    """
+    아이템의 정규화된 내용으로 지문(해시)을 만듭니다.
+    - None 값 / 키 / exclude 속성(갱신 시각 등)은 제외
+    - 속성 순서와 숫자 표현 차이는 결과에 영향 없음
+    """
+    excluded = _ALWAYS_EXCLUDED.union(exclude)
+    content = {k: _normalize(v) for k, v in item.items() if k not in excluded and v is not None}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FingerprintCache:
+    """
+    (PK, SK) -> 마지막으로 저장된 지문 LRU 캐시
+    - 캐시에 없는 키는 DB에서 지문 속성만 batch_get으로 읽어와 채움 (seed)
+    - filter_changed(): 내용이 바뀐(또는 처음 보는) 아이템만 돌려줌 -> 불필요한 쓰기(WCU, 스트림 이벤트) 방지
+    - 저장이 끝난 뉴스/프로필만 remember()로 기록 (유실된 아이템은 다음 실행에서 다시 씀)
+    """
+
+    def __init__(self, max_entries: int = 100_000, exclude: Iterable[str] = ()):
+        self.max_entries = max_entries
+        self.exclude = tuple(exclude)
+
+        self._fingerprints: OrderedDict[tuple, str] = OrderedDict()
+
+        # 통계
+        self.seeded = 0
+        self.changed = 0
+        self.unchanged = 0
+
+    def stamp(self, item: dict) -> dict:
+        """아이템에 지문 속성을 붙여서 반환"""
+        item[FINGERPRINT_ATTRIBUTE] = compute_fingerprint(item, self.exclude)
+        return item
+
+    async def seed(self, backend, keys: list[tuple]):
+        """캐시에 없는 키의 저장된 지문을 DB에서 한 번에 읽어옴 (지문 속성만 조회)"""
+        missing = [key for key in dict.fromkeys(keys) if key not in self._fingerprints]
+        if not missing:
+            return
+
+        items, _ = await execute_batch_get(
+            backend,
+            [{'PK': pk, 'SK': sk} for pk, sk in missing],
+            projection=['PK', 'SK', FINGERPRINT_ATTRIBUTE]
+        )
+        for item in items:
+            if item.get(FINGERPRINT_ATTRIBUTE):
+                self._remember((item['PK'], item['SK']), item[FINGERPRINT_ATTRIBUTE])
+                self.seeded += 1
+
+    async def filter_changed(self, items: list[dict], backend=None) -> list[dict]:
+        """
+        지문이 붙은 아이템 중 저장된 지문과 다른 것만 반환합니다.
+        - backend가 주어지면 캐시에 없는 키를 먼저 DB에서 seed (실패하면 전부 변경된 것으로 취급)
+        """
+        if backend is not None:
+            try:
+                await self.seed(backend, [(item['PK'], item['SK']) for item in items])
+            except Exception as e:
+                logger.warning(f"⚠️ 지문 조회 실패 (전부 저장): {e}")
+
+        changed = []
+        for item in items:
+            key = (item['PK'], item['SK'])
+            if self._fingerprints.get(key) == item[FINGERPRINT_ATTRIBUTE]:
+                self._fingerprints.move_to_end(key)
+                self.unchanged += 1
+                continue
+            changed.append(item)
+            self.changed += 1
+        return changed
+
+    def remember(self, items: list[dict], dropped: Optional[list[dict]] = None):
+        """저장에 성공한 아이템의 지문을 기록"""
+        dropped_keys = {(item['PK'], item['SK']) for item in dropped or []}
+        for item in items:
+            key = (item['PK'], item['SK'])
+            if key not in dropped_keys:
+                self._remember(key, item[FINGERPRINT_ATTRIBUTE])
+
+    def get_stats(self) -> dict:
+        total = self.changed + self.unchanged
+        return {
+            "size": len(self._fingerprints),
+            "seeded": self.seeded,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "skip_ratio": round(self.unchanged / total, 4) if total else 0.0
+        }
+
+    def _remember(self, key: tuple, fingerprint: str):
+        self._fingerprints[key] = fingerprint
+        self._fingerprints.move_to_end(key)
+        while len(self._fingerprints) > self.max_entries:
+            self._fingerprints.popitem(last=False)
@@ -1,16 +1,77 @@
-from typing import List, Optional
+import asyncio
+import json
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
-# 우리가 정의한 Schema와 Connection을 가져옵니다.
-from app.db.connection import get_dynamodb_table
-from app.db.utils import execute_batch_write
+# 우리가 정의한 Schema와 저장소 백엔드를 가져옵니다.
+from app.core.settings import settings
+from app.db.backends import get_storage_backend
+from app.db.fingerprint import FingerprintCache
+from app.db.serializer import serialize_news
+from app.db.utils import execute_batch_write, execute_batch_get
+from app.db.write_buffer import BatchWriteBuffer
 from app.schemas.stockNews import StockNews
 
 
+# 다이제스트에 필요한 컬럼만 조회 (재구축용)
+DIGEST_SOURCE_PROJECTION = ['id', 'datetime', 'summary', 'content', 'url', 'impact_score']
+
+
+def news_date_utc(timestamp) -> str:
+    """뉴스 발행 시각(Unix Timestamp)의 UTC 날짜 (다이제스트 SK 기준)"""
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def build_digest_entry(news: dict) -> dict:
+    """
+    뉴스 아이템 -> 다이제스트용 압축 형태
+    - 중요도 8 이상은 본문, 나머지는 요약 (리포트 작성 규칙과 동일)
+    - 본문은 NEWS_DIGEST_CONTENT_MAX_CHARS 길이로 자름
+    """
+    impact = int(news['impact_score'])
+    content = news.get('content') if impact >= 8 else None
+    content = content or news.get('summary') or '내용없음'
+
+    return {
+        'id': int(news['id']),
+        'datetime': int(news['datetime']),
+        'content': content[:settings.NEWS_DIGEST_CONTENT_MAX_CHARS],
+        'url': news.get('url') or '',
+        'impact_score': impact
+    }
+
+
+def digest_entry_size(entry: dict) -> int:
+    """다이제스트 항목의 대략적인 저장 크기 (bytes, 아이템 크기 상한 계산용)"""
+    return len(json.dumps(entry, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def merge_digest_entries(entries: list[dict], new_entries: list[dict]) -> list[dict]:
+    """id 기준으로 합치고 (같은 뉴스가 다시 저장돼 중복으로 붙은 경우 나중 것 사용) 발행 시각순으로 정렬"""
+    merged = {int(entry['id']): entry for entry in entries}
+    for entry in new_entries:
+        merged[int(entry['id'])] = entry
+    return sorted(merged.values(), key=lambda entry: int(entry['datetime']))
+
+
 class NewsRepository:
     def __init__(self):
         self.table_name = "StockProjectData"
+        # (symbol, date) -> 다이제스트 갱신용 Lock, (symbol, 'WATERMARK') -> 워터마크 갱신용 Lock (사용 중인 동안만 유지)
+        self._item_locks = weakref.WeakValueDictionary()
+        # 뉴스 내용 지문 (같은 내용의 재저장 방지, DB 존재 확인은 SeenNewsIndex 담당이라 seed 없이 사용)
+        self.fingerprints = FingerprintCache()
+        # 이 시각 이후에 시작한 날짜의 다이제스트는 그날 저장된 뉴스가 모두 반영됨 (완전한 다이제스트)
+        self._digest_live_since = int(time.time())
+
+    @property
+    def storage(self):
+        """설정에 맞는 저장소 백엔드 (DynamoDB / 인메모리)"""
+        return get_storage_backend(self.table_name)
 
     async def save_news(self, news_item: StockNews) -> bool:
         """
@@ -18,68 +79,316 @@ class NewsRepository:
         기존 모델의 to_dynamodb_item 로직이 이곳으로 이사 왔습니다.
         StockNews 객체를 받아 DynamoDB Item 형태로 변환 후 저장합니다.
         """
-        # 1. Pydantic -> Dict 변환
-        item_dict = news_item.model_dump()
-
-        # 2. PK, SK 생성 (Repository가 결정)
+        # 1. Pydantic -> Dict 변환 + PK, SK 생성 (model_dump() 없이)
         # PK: STOCK#{symbol}
         # SK: NEWS#{timestamp}#{id}
-        pk = f"STOCK#{news_item.symbol}"
-        sk = f"NEWS#{news_item.datetime}#{news_item.id}"
-
-        item_dict['PK'] = pk
-        item_dict['SK'] = sk
+        item_dict = serialize_news(news_item)
+        self.fingerprints.stamp(item_dict)
 
         # (필요시 GSI 데이터 추가 등도 여기서 수행)
 
         try:
-            async with get_dynamodb_table(self.table_name) as table:
-                await table.put_item(Item=item_dict)
+            await self.storage.put_item(item_dict)
+            self.fingerprints.remember([item_dict])
+            await self.update_digests([item_dict])
             return True
         except ClientError as e:
             print(f"❌ News Save Error: {e}")
             return False
 
-    async def fetch_news_by_date(self, symbol: str, start_ts: int, end_ts: int, min_importance: int = 6) -> List[dict]:
+    async def fetch_news_by_date(self, symbol: str, start_ts: int, end_ts: int, min_importance: int = 6,
+                                 projection: Optional[List[str]] = None) -> List[dict]:
         """
-        특정 기간의 뉴스 조회
+        특정 기간의 뉴스 조회 (페이지네이션을 끝까지 따라간 전체 결과를 리스트로 반환)
         """
-        pk_value = f"STOCK#{symbol}"
-        sk_start = f"NEWS#{start_ts}#000000000"
-        sk_end = f"NEWS#{end_ts}#999999999"
-
         try:
-            async with get_dynamodb_table(self.table_name) as table:
-                response = await table.query(
-                    KeyConditionExpression=Key('PK').eq(pk_value) & Key('SK').between(sk_start, sk_end),
-                    FilterExpression = Attr('impact_score').gte(min_importance)
+            return [
+                item async for item in self.stream_news_by_date(
+                    symbol, start_ts, end_ts, min_importance=min_importance, projection=projection
                 )
-                return response.get('Items', [])
+            ]
         except Exception as e:
             print(f"❌ Query Error: {e}")
             return []
 
-    async def save_news_batch(self, news_list: List[StockNews]):
+    async def stream_news_by_date(self, symbol: str, start_ts: int, end_ts: int, min_importance: int = 6,
+                                  projection: Optional[List[str]] = None,
+                                  page_size: Optional[int] = None,
+                                  max_items: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        특정 기간의 뉴스를 페이지 단위로 조회하면서 도착하는 대로 하나씩 흘려보냅니다. (async generator)
+        - LastEvaluatedKey를 따라가므로 1MB 응답 제한에 걸려도 결과가 잘리지 않음
+        - projection: 읽어올 속성 목록 (예: ['datetime', 'summary', 'url']) -> 안 쓰는 컬럼 전송 방지
+        - page_size: 요청 1회당 평가할 아이템 수 (DynamoDB Limit, 필터 적용 전 기준)
+        - max_items: 최대 반환 개수 (도달하면 추가 페이지 요청 없이 종료)
+        """
+        pk_value = f"STOCK#{symbol}"
+        sk_start = f"NEWS#{start_ts}#000000000"
+        sk_end = f"NEWS#{end_ts}#999999999"
+
+        key_condition = Key('PK').eq(pk_value) & Key('SK').between(sk_start, sk_end)
+        filter_condition = Attr('impact_score').gte(min_importance)
+
+        yielded = 0
+        last_key = None
+        while True:
+            items, last_key = await self.storage.query(
+                key_condition,
+                filter_condition=filter_condition,
+                projection=projection,
+                limit=page_size,
+                exclusive_start_key=last_key
+            )
+
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items and yielded >= max_items:
+                    return
+
+            if not last_key:
+                return
+
+    async def find_existing_news_keys(self, news_list: List[StockNews]) -> tuple[set[tuple], set[tuple]]:
+        """
+        이미 저장된 뉴스의 (symbol, id) 집합을 반환합니다. (키만 읽는 batch_get)
+        - 반환: (저장된 뉴스, 확인하지 못한 뉴스)
+          재시도 후에도 처리되지 않은 키(throttling)는 신규로 보지 않고 '확인 못 함'으로 따로 반환
+          -> 이미 저장된 뉴스를 다시 크롤링 / LLM 분석하지 않게
+        """
+        if not news_list:
+            return set(), set()
+
+        keys = [
+            {'PK': f"STOCK#{news.symbol}", 'SK': f"NEWS#{news.datetime}#{news.id}"}
+            for news in news_list
+        ]
+
+        items, unprocessed = await execute_batch_get(self.storage, keys, projection=['PK', 'SK'])
+
+        # PK: STOCK#{symbol} / SK: NEWS#{datetime}#{id}
+        def to_news_key(key: dict) -> tuple:
+            return key['PK'].split('#', 1)[1], int(key['SK'].rsplit('#', 1)[1])
+
+        return {to_news_key(item) for item in items}, {to_news_key(key) for key in unprocessed}
+
+    async def save_news_batch(self, news_list: List[StockNews], write_buffer: Optional[BatchWriteBuffer] = None) -> bool:
         """
         여러 개의 뉴스를 한 번에 저장합니다.
+        - write_buffer가 있으면 다른 워커의 뉴스와 합쳐서 25개 단위로 저장 (저장 완료까지 대기)
+        반환: 모든 뉴스가 저장되었는지 여부 (일부만 저장되면 False, 저장된 뉴스는 다이제스트에 반영됨)
         """
         if not news_list:
-            return
+            return True
 
         # 1. 모델 리스트 -> DynamoDB Item(Dict) 리스트로 변환
-        dynamo_items = []
-        for news in news_list:
-            item_dict = news.model_dump()
+        # PK, SK 생성 책임은 여전히 Repository에 있음! (serialize_news: model_dump() 없이 필드 값 복사)
+        dynamo_items = [self.fingerprints.stamp(serialize_news(news)) for news in news_list]
+
+        # 내용이 바뀌지 않은 뉴스(이미 같은 내용으로 저장됨)는 다시 쓰지 않음
+        dynamo_items = await self.fingerprints.filter_changed(dynamo_items)
+        if not dynamo_items:
+            return True
+
+        # 2-1. 공유 버퍼를 통한 저장
+        if write_buffer is not None:
+            dropped_keys = await write_buffer.submit(dynamo_items)
+        else:
+            # 2-2. 유틸 함수를 통해 배치 저장 실행
+            dropped = await execute_batch_write(self.storage, dynamo_items)
+            dropped_keys = {(item['PK'], item['SK']) for item in dropped}
+
+        # 3. 실제로 저장된 뉴스만 지문 기록 + 일간 다이제스트에 반영 (일부만 저장돼도 저장된 뉴스는 반영)
+        stored_items = [item for item in dynamo_items if (item['PK'], item['SK']) not in dropped_keys]
+        self.fingerprints.remember(stored_items)
+        await self.update_digests(stored_items)
+
+        # 저장하지 못한 뉴스가 속한 날짜의 다이제스트는 불완전으로 표시
+        # (실패한 요청이 실제로 반영됐는지 알 수 없음 -> 조회 시 기간 조회로 대체, digest_rebuild로 복구)
+        if dropped_keys:
+            await self.mark_digests_incomplete(
+                [item for item in dynamo_items if (item['PK'], item['SK']) in dropped_keys]
+            )
+        return not dropped_keys
+
+    # ==========================================
+    # 일간 뉴스 다이제스트 (PK: STOCK#{symbol} / SK: DIGEST#{date})
+    # ==========================================
+    @staticmethod
+    def _digest_key(symbol: str, date: str) -> dict:
+        return {'PK': f"STOCK#{symbol}", 'SK': f"DIGEST#{date}"}
+
+    def _item_lock(self, key: tuple) -> asyncio.Lock:
+        lock = self._item_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._item_locks[key] = lock
+        return lock
+
+    def _digest_lock(self, symbol: str, date: str) -> asyncio.Lock:
+        return self._item_lock((symbol, date))
+
+    def _covers_whole_day(self, date: str) -> bool:
+        """이 프로세스가 해당 날짜의 시작부터 다이제스트를 갱신해 왔는지 (처음 만들 때의 complete 값)"""
+        day_start = int(datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+        return self._digest_live_since <= day_start
+
+    async def _put_digest(self, symbol: str, date: str, entries: list[dict], size: int, truncated: bool):
+        item = {
+            **self._digest_key(symbol, date),
+            'symbol': symbol,
+            'date': date,
+            'entries': [] if truncated else entries,
+            'entries_bytes': size,
+            'entry_count': len(entries),
+            'complete': True,
+            'truncated': truncated,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }
+        await self.storage.put_item(item)
+
+    async def update_digests(self, news_items: List[dict]):
+        """
+        저장된 뉴스를 (종목, 날짜)별 다이제스트 아이템 끝에 붙입니다. (읽기 없이 UpdateItem 1회)
+        - 분석 점수가 없는 뉴스는 제외
+        - 누적 크기가 NEWS_DIGEST_MAX_BYTES를 넘으면 붙이지 않고 truncated로 표시
+          (UpdateItem도 아이템 전체 크기로 WCU가 매겨지므로 아이템 크기 자체를 제한)
+        - complete: 처음 만들 때 그날의 시작부터 갱신해 왔으면 True (배포 당일처럼 그 전에 저장된 뉴스가
+          빠져 있을 수 있으면 False -> 조회 시 기간 조회로 대체, digest_rebuild로 완전한 다이제스트 생성)
+        - 갱신에 실패하면 complete=False로 표시 (그것도 실패하면 digest_rebuild로 복구)
+        - 다이제스트 갱신 실패는 뉴스 저장 결과에 영향을 주지 않음
+        """
+        grouped = self._group_digest_entries(news_items)
+
+        async def update(symbol: str, date: str, new_entries: list[dict]):
+            key = self._digest_key(symbol, date)
+            now = datetime.now(timezone.utc).isoformat()
+            try:
+                # 같은 (종목, 날짜)의 재구축(조회 -> 덮어쓰기)과 겹치지 않게 프로세스 내에서 직렬화
+                async with self._digest_lock(symbol, date):
+                    appended = await self.storage.append_to_list(
+                        key, 'entries', new_entries,
+                        size_attribute='entries_bytes',
+                        size=sum(digest_entry_size(entry) for entry in new_entries),
+                        max_size=settings.NEWS_DIGEST_MAX_BYTES,
+                        defaults={'symbol': symbol, 'date': date, 'complete': self._covers_whole_day(date)},
+                        updates={'updated_at': now}
+                    )
+                    if not appended:
+                        await self.storage.update_attributes(key, {'truncated': True, 'updated_at': now})
+            except Exception as e:
+                print(f"⚠️ [{symbol}] {date} 다이제스트 갱신 실패: {e}")
+                try:
+                    await self.storage.update_attributes(key, {'complete': False, 'updated_at': now})
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(update(symbol, date, entries) for (symbol, date), entries in grouped.items()))
+
+    async def mark_digests_incomplete(self, news_items: List[dict]):
+        """뉴스가 속한 (종목, 날짜) 다이제스트를 complete=False로 표시 (그것도 실패하면 digest_rebuild로 복구)"""
+        now = datetime.now(timezone.utc).isoformat()
+
+        async def mark(symbol: str, date: str):
+            try:
+                async with self._digest_lock(symbol, date):
+                    await self.storage.update_attributes(
+                        self._digest_key(symbol, date), {'complete': False, 'updated_at': now}
+                    )
+            except Exception as e:
+                print(f"⚠️ [{symbol}] {date} 다이제스트 불완전 표시 실패: {e}")
 
-            # PK, SK 생성 책임은 여전히 Repository에 있음!
-            item_dict['PK'] = f"STOCK#{news.symbol}"
-            item_dict['SK'] = f"NEWS#{news.datetime}#{news.id}"
+        await asyncio.gather(*(mark(symbol, date) for symbol, date in self._group_digest_entries(news_items)))
 
-            dynamo_items.append(item_dict)
+    @staticmethod
+    def _group_digest_entries(news_items: List[dict]) -> dict[tuple, list]:
+        """다이제스트에 들어갈 뉴스(분석 점수가 있는 뉴스)를 (종목, 날짜)별 항목으로 묶음"""
+        grouped: dict[tuple, list] = {}
+        for news in news_items:
+            if news.get('impact_score') is None:
+                continue
+            key = (news['symbol'], news_date_utc(news['datetime']))
+            grouped.setdefault(key, []).append(build_digest_entry(news))
+        return grouped
+
+    async def get_digests(self, symbol: str, dates: List[str]) -> dict[str, Optional[list]]:
+        """
+        여러 날짜의 다이제스트를 한 번에 조회합니다.
+        반환: {날짜: 다이제스트 항목 리스트 또는 None}
+        - None: 다이제스트 없음 / 불완전(complete가 아님) / 크기 상한으로 잘림 / 조회 실패
+          -> 호출하는 쪽에서 기간 조회로 대체
+        """
+        dates = list(dict.fromkeys(dates))
+        keys = [self._digest_key(symbol, date) for date in dates]
+
+        items, _ = await execute_batch_get(self.storage, keys, projection=['SK', 'entries', 'complete', 'truncated'])
+
+        result = {date: None for date in dates}
+        for item in items:
+            if item.get('complete') and not item.get('truncated'):
+                result[item['SK'].split('#', 1)[1]] = merge_digest_entries([], item.get('entries', []))
+        return result
+
+    async def rebuild_digest(self, symbol: str, date: str) -> int:
+        """해당 날짜의 뉴스 전체를 다시 읽어 완전한 다이제스트를 새로 만듭니다. (백필 / 배포 당일 복구용) 반환: 항목 수"""
+        day_start = int(datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+        async with self._digest_lock(symbol, date):
+            entries = [
+                build_digest_entry(item)
+                async for item in self.stream_news_by_date(
+                    symbol, day_start, day_start + 86399, min_importance=0, projection=DIGEST_SOURCE_PROJECTION
+                )
+            ]
+            entries = merge_digest_entries([], entries)
+            size = sum(digest_entry_size(entry) for entry in entries)
+            # 상한을 넘으면 항목 없이 truncated로만 기록 (조회는 기간 조회로, 이후 추가도 바로 거절됨)
+            await self._put_digest(symbol, date, entries, size, truncated=size > settings.NEWS_DIGEST_MAX_BYTES)
+        return len(entries)
+
+
+    # ==========================================
+    # 종목별 뉴스 수집 워터마크 (PK: STOCK#{symbol} / SK: WATERMARK#NEWS)
+    # ==========================================
+    @staticmethod
+    def _watermark_key(symbol: str) -> dict:
+        return {'PK': f"STOCK#{symbol}", 'SK': "WATERMARK#NEWS"}
+
+    async def get_news_watermarks(self, symbols: List[str]) -> dict[str, Optional[tuple[int, int]]]:
+        """
+        종목별로 저장까지 끝난 가장 최신 뉴스의 (datetime, id)를 조회합니다.
+        반환: {symbol: (datetime, id) 또는 None(워터마크 없음)}
+        """
+        symbols = list(dict.fromkeys(symbols))
+        keys = [self._watermark_key(symbol) for symbol in symbols]
+
+        items, _ = await execute_batch_get(self.storage, keys, projection=['PK', 'last_datetime', 'last_id'])
+
+        result = {symbol: None for symbol in symbols}
+        for item in items:
+            result[item['PK'].split('#', 1)[1]] = (int(item['last_datetime']), int(item['last_id']))
+        return result
+
+    async def advance_news_watermark(self, symbol: str, last_datetime: int, last_id: int) -> bool:
+        """
+        워터마크를 (last_datetime, last_id)로 올립니다. (현재 값보다 클 때만, 뒤로 가지 않음)
+        - 같은 종목은 프로세스 내에서 Lock으로 직렬화
+        반환: 실제로 갱신했는지 여부
+        """
+        key = self._watermark_key(symbol)
+        async with self._item_lock((symbol, 'WATERMARK')):
+            current = await self.storage.get_item(key, projection=['last_datetime', 'last_id'])
+            if current and (int(current['last_datetime']), int(current['last_id'])) >= (last_datetime, last_id):
+                return False
 
-        # 2. 유틸 함수를 통해 배치 저장 실행
-        async with get_dynamodb_table(self.table_name) as table:
-            await execute_batch_write(table, dynamo_items)
+            await self.storage.put_item({
+                **key,
+                'symbol': symbol,
+                'last_datetime': int(last_datetime),
+                'last_id': int(last_id),
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            })
+        return True
 
 
 # 싱글톤처럼 사용
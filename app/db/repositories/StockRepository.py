@@ -1,5 +1,12 @@
+import asyncio
+from datetime import datetime
+from typing import List
+
 from app.schemas.stock import StockProfile
-from app.db.connection import get_dynamodb_table  # aws_service 대신 이거 import!
+from app.db.backends import get_storage_backend
+from app.db.fingerprint import FingerprintCache
+from app.db.serializer import serialize_profile
+from app.db.utils import execute_batch_get, execute_batch_write
 from botocore.exceptions import ClientError
 import logging
 
@@ -9,21 +16,32 @@ logger = logging.getLogger("StockRepo")
 class StockRepository:
     def __init__(self):
         self.table_name = "StockProjectData"
+        # 프로필 내용 지문 (조회 시각은 지문에서 제외 -> 내용이 같으면 다시 쓰지 않고 last_updated_at만 갱신)
+        self.fingerprints = FingerprintCache(exclude=("last_updated_at",))
+
+    @property
+    def storage(self):
+        """설정에 맞는 저장소 백엔드 (DynamoDB / 인메모리)"""
+        return get_storage_backend(self.table_name)
+
+    @staticmethod
+    def to_item(profile: StockProfile) -> dict:
+        """Pydantic 모델 -> DynamoDB Item 변환 (PK: FIGI#{figi} / SK: METADATA, model_dump() 없이)"""
+        return serialize_profile(profile)
+
+    def _to_stamped_item(self, profile: StockProfile) -> dict:
+        return self.fingerprints.stamp(self.to_item(profile))
 
     async def save_profile(self, profile: StockProfile) -> bool:
         """
         주식 프로필 정보를 저장합니다.
         """
         try:
-            # Pydantic 모델 -> DynamoDB Item 변환
-            item = profile.to_dynamodb_item()
-
-            item['PK'] = f"FIGI#{profile.figi}"
-            item['SK'] = "METADATA"
+            item = self._to_stamped_item(profile)
 
-            # [변경] put_item_dynamodb 대신 직접 context manager 사용
-            async with get_dynamodb_table(self.table_name) as table:
-                await table.put_item(Item=item)
+            # [변경] put_item_dynamodb 대신 저장소 백엔드 사용
+            await self.storage.put_item(item)
+            self.fingerprints.remember([item])
 
             # 로그도 여기서 찍으면 훨씬 명확합니다.
             logger.info(f"✅ Saved Profile: {profile.symbol}")
@@ -31,4 +49,79 @@ class StockRepository:
 
         except ClientError as e:
             logger.error(f"❌ Failed to save profile {profile.symbol}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    async def save_profiles_batch(self, profiles: List[StockProfile], skip_unchanged: bool = True) -> dict:
+        """
+        여러 프로필을 batch_write(25개 단위)로 저장합니다.
+        - skip_unchanged: 저장된 지문과 내용이 같은 프로필은 다시 쓰지 않고 last_updated_at(마지막 조회 시각)만 갱신
+          (지문은 캐시 -> 없으면 DB에서 조회)
+        반환: {"written": 저장 개수, "unchanged": 건너뛴 개수, "dropped": 저장하지 못한 아이템 리스트}
+        """
+        items = [self._to_stamped_item(profile) for profile in profiles]
+        changed = await self.fingerprints.filter_changed(items, backend=self.storage) if skip_unchanged else items
+
+        dropped = await execute_batch_write(self.storage, changed)
+        self.fingerprints.remember(changed, dropped)
+
+        changed_keys = {(item['PK'], item['SK']) for item in changed}
+        await self.touch_profiles([item for item in items if (item['PK'], item['SK']) not in changed_keys])
+
+        return {
+            "written": len(changed) - len(dropped),
+            "unchanged": len(items) - len(changed),
+            "dropped": dropped
+        }
+
+    async def touch_profiles(self, items: List[dict]) -> int:
+        """
+        내용이 같은 프로필의 last_updated_at만 갱신 (UpdateItem, 나머지 속성은 그대로)
+        -> DB의 last_updated_at이 항상 '마지막으로 조회한 시각'을 뜻하도록
+        반환: 갱신하지 못한 개수
+        """
+        if not items:
+            return 0
+
+        results = await asyncio.gather(*[
+            self.storage.update_attributes(
+                {'PK': item['PK'], 'SK': item['SK']}, {'last_updated_at': item.get('last_updated_at')}
+            )
+            for item in items
+        ], return_exceptions=True)
+
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        if failed:
+            logger.warning(f"⚠️ 프로필 조회 시각 갱신 실패 {failed}/{len(items)}건")
+        return failed
+
+    async def get_profile_check_states(self, figis: List[str]) -> dict:
+        """
+        저장된 프로필의 마지막 조회 시각 / 시가총액 / 상장일 (증분 갱신 상태 복구용)
+        반환: {figi: {"checked_at": unix time, "market_cap", "ipo"}} (저장되지 않은 FIGI는 없음)
+        """
+        if not figis:
+            return {}
+
+        items, _ = await execute_batch_get(
+            self.storage,
+            [{'PK': f"FIGI#{figi}", 'SK': "METADATA"} for figi in dict.fromkeys(figis)],
+            projection=['PK', 'last_updated_at', 'marketCapitalization', 'ipo']
+        )
+
+        states = {}
+        for item in items:
+            try:
+                checked_at = datetime.fromisoformat(item['last_updated_at']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue
+            market_cap = item.get('marketCapitalization')
+            states[item['PK'].split('#', 1)[1]] = {
+                "checked_at": checked_at,
+                "market_cap": float(market_cap) if market_cap is not None else None,
+                "ipo": item.get('ipo')
+            }
+        return states
+
+
+# 싱글톤처럼 사용
+stock_repo = StockRepository()
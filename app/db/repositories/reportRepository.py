@@ -1,21 +1,35 @@
 from datetime import datetime, timedelta
+from typing import Optional
 from botocore.exceptions import ClientError
 import logging
 
 # [중요] 뉴스 때 만들었던 connection을 그대로 재사용합니다.
-from app.db.connection import get_dynamodb_table
-from app.db.utils import chunk_list
-import asyncio
+from app.db.compression import DEFAULT_CONTENT_ENCODING, compress_text, decompress_text, to_bytes
+from app.db.backends import get_storage_backend
+from app.db.utils import execute_batch_get
 
 logger = logging.getLogger("ReportRepo")
 
+# 상태만 확인할 때 읽을 속성 (리포트 본문은 건너뜀)
+REPORT_STATUS_PROJECTION = ['PK', 'SK', 'symbol', 'status', 'created_at']
+
 
 class ReportRepository:
     def __init__(self):
         # [핵심] 뉴스 데이터와 같은 테이블을 사용합니다 (Single Table Design)
         self.table_name = "StockProjectData"
 
-    async def save_report(self, symbol: str, html: str, invest_type: str, category: str = "DAILY") -> bool:
+    @property
+    def storage(self):
+        """설정에 맞는 저장소 백엔드 (DynamoDB / 인메모리)"""
+        return get_storage_backend(self.table_name)
+
+    async def save_report(self, symbol: str, html: str, invest_type: str, category: str = "DAILY",
+                          report_body: Optional[bytes] = None) -> dict:
+        """
+        리포트를 압축(gzip)해서 저장하고, 저장한 아이템을 반환합니다.
+        - report_body: 이미 압축해둔 본문이 있으면 그대로 저장 (응답에 재사용하기 위해 라우터에서 미리 압축한 경우)
+        """
 
         # 날짜 및 시간 데이터 생성
         now = datetime.now()
@@ -37,63 +51,83 @@ class ReportRepository:
             'date': today_str,
             'report_category': category,  # DAILY / URGENT
             'investment_type': invest_type,  # trader / investor
-            'report_html': html,  # 리포트 본문
+            'report_body': report_body if report_body is not None else compress_text(html),  # 압축된 리포트 본문
+            'content_encoding': DEFAULT_CONTENT_ENCODING,  # 압축 포맷 마커
             'created_at': created_at_iso,
             'status': 'COMPLETED',
             'ttl': ttl_expire
         }
 
         try:
-            # 비동기 Context Manager를 통해 테이블 리소스 획득 및 저장
-            async with get_dynamodb_table(self.table_name) as table:
-                await table.put_item(Item=item)
+            # 저장소 백엔드를 통해 저장
+            await self.storage.put_item(item)
 
             logger.info(f"✅ Report Saved: {pk} / {sk}")
-            return True
+            return item
 
         except ClientError as e:
             logger.error(f"❌ DynamoDB Save Failed: {e}")
             raise e  # 라우터에서 500 에러 처리를 위해 예외를 다시 던짐
 
-    async def get_report_batch(self, symbols: list[str], date: str, investment_type: str) -> dict[str, dict]:
+    async def get_report_batch(self, symbols: list[str], date: str, investment_type: str,
+                               projection: Optional[list[str]] = None,
+                               decompress: bool = True) -> dict[str, Optional[dict]]:
+        """
+        여러 종목의 리포트를 한 번에 조회합니다.
+        - projection: 읽어올 속성 목록 (예: REPORT_STATUS_PROJECTION -> 본문 없이 상태만 조회)
+        - decompress: True면 압축된 본문을 풀어서 report_html로 채워줌 (기존 호출부 호환)
+                      False면 report_body(압축 bytes) + content_encoding을 그대로 반환
+
+        반환: {symbol: item}
+        - 리포트가 없는 종목은 키 자체가 없음
+        - 스로틀링 등으로 재시도 후에도 조회하지 못한 종목은 값이 None (존재 여부 알 수 없음)
+        """
         if not symbols:
             return {}
 
-        found_items_map = {}
-
-        chunks = list(chunk_list(symbols, 100))  # DynamoDB 제한
-        sem = asyncio.Semaphore(5)  # 동시 요청 제한 (Throttling)
-
-        # 내부 함수: 청크 단위 비동기 조회
-        async def _fetch_chunk(chunk_symbols):
-            async with sem:
-                keys = [
-                    {"PK": f"REPORT#{sym}", "SK": f"DT#{date}#DAILY#{investment_type}"}
-                    for sym in chunk_symbols
-                ]
-                try:
-                    async with get_dynamodb_table(self.table_name) as table:
-                        response = await table.meta.client.batch_get_item(
-                            RequestItems={
-                                self.table_name: {'Keys': keys, 'ConsistentRead': False}
-                            }
-                        )
-                        return response.get('Responses', {}).get(self.table_name, [])
-                except Exception as e:
-                    logger.error(f"Batch Get Error: {e}")
-                    return []
-
-        # 병렬 실행 (Parallel Execution)
-        tasks = [_fetch_chunk(chunk) for chunk in chunks]
-        results = await asyncio.gather(*tasks)
-
-        # 결과 병합
-        for batch in results:
-            for item in batch:
-                found_items_map[item['symbol']] = item
+        keys = [
+            {"PK": f"REPORT#{sym}", "SK": f"DT#{date}#DAILY#{investment_type}"}
+            for sym in dict.fromkeys(symbols)  # 중복 키가 있으면 batch_get_item이 ValidationException을 던짐
+        ]
+
+        items, unprocessed_keys = await execute_batch_get(self.storage, keys, projection=projection)
+
+        found_items_map: dict[str, Optional[dict]] = {}
+        for item in items:
+            if decompress:
+                item['report_html'] = self.decode_report_html(item)
+                item.pop('report_body', None)
+            found_items_map[item['symbol']] = item
+
+        for key in unprocessed_keys:
+            found_items_map[key['PK'].split('#', 1)[1]] = None
+
+        if unprocessed_keys:
+            logger.warning(f"⚠️ 리포트 조회 미완료: {len(unprocessed_keys)}개 종목 (상태 알 수 없음)")
 
         return found_items_map
 
+    @staticmethod
+    def decode_report_html(item: dict) -> Optional[str]:
+        """
+        아이템에서 HTML 본문을 꺼냅니다.
+        (압축 저장 이전에 만들어진 report_html 문자열 아이템도 그대로 지원)
+        """
+        if item.get('report_body') is not None:
+            return decompress_text(item['report_body'], item.get('content_encoding', DEFAULT_CONTENT_ENCODING))
+        return item.get('report_html')
+
+    @staticmethod
+    def get_report_body(item: dict) -> tuple[Optional[bytes], str]:
+        """
+        아이템에서 (본문 bytes, content_encoding)을 꺼냅니다. 압축 본문이면 압축 해제 없이 그대로 반환합니다.
+        (예전 report_html 문자열 아이템은 identity 인코딩으로 반환)
+        """
+        if item.get('report_body') is not None:
+            return to_bytes(item['report_body']), item.get('content_encoding', DEFAULT_CONTENT_ENCODING)
+        html = item.get('report_html')
+        return (html.encode('utf-8') if html is not None else None), 'identity'
+
 
 # 싱글톤 인스턴스 생성
 report_repo = ReportRepository()
\ No newline at end of file
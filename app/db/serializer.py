@@ -0,0 +1,240 @@
+"""
+DynamoDB 저수준 wire 포맷(AttributeValue) 직렬화
+- boto3 resource 계층의 TypeSerializer/TypeDeserializer 대신 사용 (저수준 client 전용)
+- 타입별 변환 함수를 dict로 바로 찾아서 호출 (isinstance 체인 없음)
+- pydantic 모델은 model_dump() 없이 필드 값을 바로 wire 포맷으로 변환
+- 저장 경로: Repository가 serialize_news / serialize_profile로 model_dump() 없이 아이템(dict)을 만들고
+  DynamoDBBackend가 serialize_item으로 wire 포맷 변환
+  (아이템은 지문 / write-behind 버퍼 / 다이제스트 / 인메모리 백엔드가 dict로 다루므로 wire 변환은 백엔드에서)
+- 숫자는 boto3와 동일하게 Decimal로 돌려줌 (조회 결과 호환)
+"""
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+def _serialize_number(value) -> dict:
+    return {'N': str(value)}
+
+
+def _serialize_float(value: float) -> dict:
+    # StockProfile.to_dynamodb_item의 Decimal(str(value))와 같은 표현
+    if math.isnan(value) or math.isinf(value):
+        raise TypeError(f"Infinity and NaN not supported: {value}")
+    return {'N': repr(value)}
+
+
+def _serialize_map(value: dict) -> dict:
+    return {'M': {key: serialize_value(v) for key, v in value.items()}}
+
+
+def _serialize_list(value) -> dict:
+    return {'L': [serialize_value(v) for v in value]}
+
+
+def _serialize_set(value) -> dict:
+    if not value:
+        raise TypeError("Empty sets are not supported by DynamoDB")
+    sample = next(iter(value))
+    if isinstance(sample, str):
+        return {'SS': list(value)}
+    if isinstance(sample, (bytes, bytearray)):
+        return {'BS': [bytes(v) for v in value]}
+    if isinstance(sample, (int, Decimal, float)) and not isinstance(sample, bool):
+        return {'NS': [str(v) for v in value]}
+    raise TypeError(f"Unsupported set element type: {type(sample)}")
+
+
+_SERIALIZERS = {
+    str: lambda value: {'S': value},
+    bool: lambda value: {'BOOL': value},
+    int: _serialize_number,
+    Decimal: _serialize_number,
+    float: _serialize_float,
+    type(None): lambda value: {'NULL': True},
+    bytes: lambda value: {'B': value},
+    bytearray: lambda value: {'B': bytes(value)},
+    dict: _serialize_map,
+    list: _serialize_list,
+    tuple: _serialize_list,
+    set: _serialize_set,
+    frozenset: _serialize_set,
+    date: lambda value: {'S': value.isoformat()},
+    datetime: lambda value: {'S': value.isoformat()},
+}
+
+
+def serialize_value(value: Any) -> dict:
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is not None:
+        return serializer(value)
+
+    # 드문 경우 (하위 클래스, boto3 Binary, 중첩 모델 등)
+    if isinstance(value, BaseModel):
+        return {'M': serialize_model(value)}
+    if hasattr(value, 'value') and isinstance(value.value, (bytes, bytearray)):
+        return {'B': bytes(value.value)}
+    for base, serializer in _SERIALIZERS.items():
+        if isinstance(value, base):
+            return serializer(value)
+    raise TypeError(f"Unsupported type \"{type(value)}\" for value \"{value}\"")
+
+
+def serialize_item(item: dict) -> dict:
+    """{'PK': 'STOCK#AAPL', 'id': 1} -> {'PK': {'S': 'STOCK#AAPL'}, 'id': {'N': '1'}}"""
+    return {key: serialize_value(value) for key, value in item.items()}
+
+
+def serialize_model(model: BaseModel, extra: Optional[dict] = None) -> dict:
+    """
+    pydantic 모델 -> wire 포맷 아이템 (model_dump() 생략)
+    - 필드 이름 기준 (alias 미사용, model_dump(by_alias=False)와 동일)
+    - extra: PK/SK 등 Repository가 붙이는 속성
+    """
+    wire = {key: serialize_value(value) for key, value in model.__dict__.items()}
+    if extra:
+        wire.update((key, serialize_value(value)) for key, value in extra.items())
+    return wire
+
+
+def serialize_news(news) -> dict:
+    """
+    StockNews -> 저장용 아이템 (PK: STOCK#{symbol} / SK: NEWS#{datetime}#{id})
+    - 필드가 모두 기본 타입이라 model_dump() 결과와 같은 dict를 필드 값 복사만으로 만듦
+    """
+    item = dict(news.__dict__)
+    item['PK'] = f"STOCK#{news.symbol}"
+    item['SK'] = f"NEWS#{news.datetime}#{news.id}"
+    return item
+
+
+def serialize_profile(profile) -> dict:
+    """
+    StockProfile -> 저장용 아이템 (PK: FIGI#{figi} / SK: METADATA)
+    - StockProfile.to_dynamodb_item()과 같은 결과 (ipo는 ISO 문자열, 숫자는 Decimal)를 model_dump() 없이 만듦
+    """
+    item = dict(profile.__dict__)
+    ipo = item.get('ipo')
+    if isinstance(ipo, date):
+        item['ipo'] = ipo.isoformat()
+    for key in ('marketCapitalization', 'shareOutstanding'):
+        value = item.get(key)
+        if value is not None and not isinstance(value, Decimal):
+            item[key] = Decimal(str(value))
+    item['PK'] = f"FIGI#{profile.figi}"
+    item['SK'] = "METADATA"
+    return item
+
+
+def _deserialize_map(value: dict) -> dict:
+    return {key: deserialize_value(v) for key, v in value.items()}
+
+
+_DESERIALIZERS = {
+    'S': lambda value: value,
+    'N': Decimal,
+    'BOOL': lambda value: value,
+    'NULL': lambda value: None,
+    'B': bytes,
+    'M': _deserialize_map,
+    'L': lambda value: [deserialize_value(v) for v in value],
+    'SS': set,
+    'NS': lambda value: {Decimal(v) for v in value},
+    'BS': lambda value: {bytes(v) for v in value},
+}
+
+
+def deserialize_value(attribute_value: dict) -> Any:
+    for type_tag, value in attribute_value.items():
+        return _DESERIALIZERS[type_tag](value)
+    raise TypeError("Value must be a nonempty dictionary whose key is a valid dynamodb type")
+
+
+def deserialize_item(wire_item: dict) -> dict:
+    """wire 포맷 아이템 -> 파이썬 dict (boto3 resource 조회 결과와 동일한 형태)"""
+    return {key: deserialize_value(value) for key, value in wire_item.items()}
+
+
+# ==========================================
+# 마이크로 벤치마크: python -m app.db.serializer
+# ==========================================
+def _benchmark(count: int = 20_000):
+    import time
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+    from app.schemas.stock import StockProfile
+    from app.schemas.stockNews import StockNews
+
+    news_list = [
+        StockNews(
+            id=100_000_000 + i, symbol="AAPL", datetime=1_764_000_000 + i, headline=f"headline {i}",
+            summary="summary " * 20, url=f"https://example.com/{i}", source="Benchmark",
+            content="body " * 400, sentiment="POSITIVE", impact_score=i % 10, ai_summary="ai summary"
+        )
+        for i in range(count)
+    ]
+    profiles = [
+        StockProfile(
+            _id=f"BBG{i:09d}", symbol=f"SYM{i}", name="Benchmark Inc", country="US", currency="USD",
+            exchange="NASDAQ", finnhubIndustry="Technology", ipo=date(2000, 1, 1), logo="https://example.com/logo.png",
+            marketCapitalization=Decimal("12345.678"), phone="1-800", shareOutstanding=Decimal("987.65"),
+            weburl="https://example.com"
+        )
+        for i in range(count)
+    ]
+
+    type_serializer = TypeSerializer()
+    type_deserializer = TypeDeserializer()
+
+    def boto3_news(news):
+        item = news.model_dump()
+        item['PK'] = f"STOCK#{news.symbol}"
+        item['SK'] = f"NEWS#{news.datetime}#{news.id}"
+        return {key: type_serializer.serialize(value) for key, value in item.items()}
+
+    def fast_news(news):
+        # 실제 저장 경로와 같음 (NewsRepository -> DynamoDBBackend)
+        return serialize_item(serialize_news(news))
+
+    def boto3_profile(profile):
+        item = profile.to_dynamodb_item()
+        item['PK'] = f"FIGI#{profile.figi}"
+        item['SK'] = "METADATA"
+        return {key: type_serializer.serialize(value) for key, value in item.items()}
+
+    def fast_profile(profile):
+        # 실제 저장 경로와 같음 (StockRepository -> DynamoDBBackend)
+        return serialize_item(serialize_profile(profile))
+
+    def measure(label, func, inputs):
+        started = time.perf_counter()
+        outputs = [func(value) for value in inputs]
+        elapsed = time.perf_counter() - started
+        print(f"⏱️ {label:<28} {elapsed * 1000:9.1f}ms ({len(inputs) / elapsed:,.0f}건/s)")
+        return elapsed, outputs
+
+    print(f"🚀 {count}건 직렬화 비교")
+    for label, baseline, fast, inputs in [
+        ("StockNews", boto3_news, fast_news, news_list),
+        ("StockProfile", boto3_profile, fast_profile, profiles),
+    ]:
+        base_elapsed, base_out = measure(f"{label} (boto3)", baseline, inputs)
+        fast_elapsed, fast_out = measure(f"{label} (serializer)", fast, inputs)
+        assert base_out == fast_out, f"{label} 직렬화 결과 불일치"
+        print(f"📊 {label} 직렬화 {base_elapsed / fast_elapsed:.1f}배")
+
+        base_elapsed, base_items = measure(
+            f"{label} 역직렬화 (boto3)",
+            lambda wire: {key: type_deserializer.deserialize(value) for key, value in wire.items()},
+            base_out
+        )
+        fast_elapsed, fast_items = measure(f"{label} 역직렬화 (serializer)", deserialize_item, fast_out)
+        assert base_items == fast_items, f"{label} 역직렬화 결과 불일치"
+        print(f"📊 {label} 역직렬화 {base_elapsed / fast_elapsed:.1f}배")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -1,59 +1,246 @@
 import asyncio
+import random
+import time
+from collections import deque
+from typing import Optional
+
 from botocore.exceptions import ClientError
 import logging
 
+from app.core.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+
 logger = logging.getLogger("DBUtils")
 
+# DynamoDB가 용량 초과 시 돌려주는 에러 코드들
+THROTTLE_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+}
+
+# 프로세스 전체에서 공유하는 batch_get 동시성 제한기 (스로틀링에 따라 자동 조절)
+batch_get_limiter = AdaptiveConcurrencyLimiter(initial_limit=5, min_limit=1, max_limit=20)
+
 
 def chunk_list(data, size):
     for i in range(0, len(data), size):
         yield data[i:i + size]
 
 
-async def execute_batch_write(table, items: list):
+class BatchWriteGovernor:
     """
-    DynamoDB Table 객체와 Item 리스트(Dict 형태)를 받아 배치 저장을 수행합니다.
-    (재시도 로직 및 세마포어 포함)
+    테이블 단위로 프로세스 전체에서 공유하는 batch_write 제어기
+    - 동시 batch_write 수를 AIMD로 조절 (UnprocessedItems / 용량 초과 시 감소, 성공 시 회복)
+    - 처리량(items/sec), 재시도, 재시도 예산 초과로 유실된 아이템 수를 기록
+    """
+
+    def __init__(self, table_name: str, limiter: AdaptiveConcurrencyLimiter, max_retries: int = 8,
+                 rate_window: float = 60.0):
+        self.table_name = table_name
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.rate_window = rate_window
+
+        self.items_written = 0
+        self.batches_sent = 0
+        self.retries = 0
+        self.throttle_events = 0
+        self.items_dropped = 0
+        self._started_at = time.monotonic()
+        self._recent_writes = deque()  # (시각, 저장 개수) - 최근 처리량 계산용
+
+    def record_written(self, count: int):
+        now = time.monotonic()
+        self.items_written += count
+        self._recent_writes.append((now, count))
+        while self._recent_writes and now - self._recent_writes[0][0] > self.rate_window:
+            self._recent_writes.popleft()
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        elapsed = max(now - self._started_at, 1e-9)
+        recent = sum(count for ts, count in self._recent_writes if now - ts <= self.rate_window)
+        return {
+            "table": self.table_name,
+            "items_written": self.items_written,
+            "batches_sent": self.batches_sent,
+            "retries": self.retries,
+            "throttle_events": self.throttle_events,
+            "items_dropped": self.items_dropped,
+            "items_per_sec": round(self.items_written / elapsed, 2),
+            "recent_items_per_sec": round(recent / min(elapsed, self.rate_window), 2),
+            "concurrency": self.limiter.get_stats()
+        }
+
+    async def write_chunk(self, backend, chunk_items: list) -> list:
+        """
+        25개 이하 아이템을 저장소 백엔드의 batch_write로 저장합니다.
+        반환: 재시도 예산을 다 쓰고도 저장하지 못한 아이템 리스트
+        """
+        pending = chunk_items
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self.retries += 1
+
+            try:
+                async with self.limiter.slot():
+                    self.batches_sent += 1
+                    unprocessed = await backend.batch_write(pending)
+
+            except ClientError as e:
+                if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                    self.throttle_events += 1
+                    self.limiter.on_throttle()
+                    await asyncio.sleep(backoff_with_jitter(attempt, base=0.1))
+                    continue
+                logger.error(f"Batch Write Error: {e}")
+                return self._drop(pending)
+
+            except Exception as e:
+                # 네트워크 오류 등은 재시도
+                logger.warning(f"Batch Write 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(backoff_with_jitter(attempt, base=0.1))
+                continue
+
+            self.record_written(len(pending) - len(unprocessed))
+
+            if not unprocessed:
+                self.limiter.on_success()
+                return []  # 성공
+
+            # 일부만 처리됨 = 파티션 스로틀링 신호 -> 동시성 줄이고 남은 것만 재시도
+            self.throttle_events += 1
+            self.limiter.on_throttle()
+            pending = unprocessed
+            await asyncio.sleep(backoff_with_jitter(attempt, base=0.1))
+
+        return self._drop(pending)
+
+    def _drop(self, dropped: list) -> list:
+        self.items_dropped += len(dropped)
+        logger.error(f"❌ Batch Write 유실: {len(dropped)}개 아이템 (누적 {self.items_dropped}개)")
+        return dropped
+
+
+# 테이블 이름별 공유 governor
+_write_governors: dict[str, BatchWriteGovernor] = {}
+
+
+def get_write_governor(table_name: str) -> BatchWriteGovernor:
+    governor = _write_governors.get(table_name)
+    if governor is None:
+        governor = BatchWriteGovernor(
+            table_name=table_name,
+            limiter=AdaptiveConcurrencyLimiter(initial_limit=5, min_limit=1, max_limit=25)
+        )
+        _write_governors[table_name] = governor
+    return governor
+
+
+def get_write_governor_stats() -> list[dict]:
+    return [governor.get_stats() for governor in _write_governors.values()]
+
+
+async def execute_batch_write(backend, items: list) -> list:
+    """
+    저장소 백엔드와 Item 리스트(Dict 형태)를 받아 배치 저장을 수행합니다.
+    (테이블 공용 governor를 통해 동시성 제어 + 재시도)
+
+    반환: 재시도 예산 초과로 저장하지 못한 아이템 리스트 (모두 성공하면 빈 리스트)
     """
     if not items:
-        return
+        return []
+
+    governor = get_write_governor(backend.table_name)
+
+    # 같은 배치 안에 중복 키가 있으면 ValidationException -> (PK, SK) 기준으로 마지막 값만 유지
+    items = list({(item['PK'], item['SK']): item for item in items}.values())
 
     # DynamoDB 배치 쓰기 제한 (25개)
-    chunks = list(chunk_list(items, 25))
-
-    # 동시 실행 제어 (너무 많은 요청 방지)
-    sem = asyncio.Semaphore(5)
-
-    async def _write_chunk(chunk_items):
-        async with sem:
-            request_items = {
-                table.name: [{'PutRequest': {'Item': item}} for item in chunk_items]
-            }
-
-            max_retries = 5
-            for attempt in range(max_retries + 1):
-                try:
-                    # aioboto3 테이블 객체의 batch_write_item 호출
-                    # 주의: table.meta.client가 아니라 resource 레벨 메서드 사용 시 문법이 다를 수 있음
-                    # 여기서는 low-level client 접근 방식을 유지합니다.
-                    response = await table.meta.client.batch_write_item(RequestItems=request_items)
-
-                    unprocessed = response.get("UnprocessedItems", {})
-                    if not unprocessed:
-                        return  # 성공
-
-                    # 실패한 것만 남겨서 재시도
-                    request_items = unprocessed
-                    sleep_time = (0.1 * (2 ** attempt))
-                    await asyncio.sleep(sleep_time)
-
-                except ClientError as e:
-                    if e.response['Error']['Code'] == 'ProvisionedThroughputExceededException':
-                        await asyncio.sleep(1 * (2 ** attempt))
-                    else:
-                        logger.error(f"Batch Write Error: {e}")
-                        break
-
-    tasks = [_write_chunk(chunk) for chunk in chunks]
-    if tasks:
-        await asyncio.gather(*tasks)
\ No newline at end of file
+    tasks = [governor.write_chunk(backend, chunk) for chunk in chunk_list(items, 25)]
+    results = await asyncio.gather(*tasks)
+
+    return [item for dropped in results for item in dropped]
+
+
+def backoff_with_jitter(attempt: int, base: float = 0.05, cap: float = 5.0) -> float:
+    """Full Jitter 지수 백오프: 0 ~ min(cap, base * 2^attempt) 사이 랜덤"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def build_projection(projection: Optional[list]) -> dict:
+    """
+    속성 이름 리스트를 ProjectionExpression 파라미터로 변환합니다.
+    (예약어 충돌을 피하기 위해 모든 속성을 placeholder로 치환)
+    """
+    if not projection:
+        return {}
+    attr_names = {f"#p{i}": attr for i, attr in enumerate(projection)}
+    return {
+        'ProjectionExpression': ", ".join(attr_names.keys()),
+        'ExpressionAttributeNames': attr_names
+    }
+
+
+async def execute_batch_get(backend, keys: list, projection: Optional[list] = None, consistent_read: bool = False,
+                            max_retries: int = 6, limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+    """
+    저장소 백엔드와 Key 리스트를 받아 batch_get을 수행합니다. (Single Table 공용 엔진)
+    - 100개 단위로 나눠 병렬 조회
+    - UnprocessedKeys는 Jitter 백오프로 재시도
+    - 동시 요청 수는 스로틀링 여부에 따라 AIMD로 자동 조절
+    - projection: 읽어올 속성 목록 (큰 속성을 건너뛸 때 사용)
+
+    반환: (조회된 아이템 리스트, 재시도 후에도 처리되지 못한 Key 리스트)
+    """
+    if not keys:
+        return [], []
+
+    limiter = limiter or batch_get_limiter
+
+    async def _get_chunk(chunk_keys):
+        pending = chunk_keys
+        items = []
+
+        for attempt in range(max_retries + 1):
+            try:
+                async with limiter.slot():
+                    found, unprocessed = await backend.batch_get(
+                        pending, projection=projection, consistent_read=consistent_read
+                    )
+
+            except ClientError as e:
+                if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                    limiter.on_throttle()
+                    await asyncio.sleep(backoff_with_jitter(attempt))
+                    continue
+                logger.error(f"Batch Get Error: {e}")
+                return items, pending
+
+            except Exception as e:
+                logger.error(f"Batch Get Error: {e}")
+                return items, pending
+
+            items.extend(found)
+
+            if not unprocessed:
+                limiter.on_success()
+                return items, []
+
+            # 일부 키가 처리되지 않음 = 스로틀링 신호 -> 남은 키만 재시도
+            limiter.on_throttle()
+            pending = unprocessed
+            await asyncio.sleep(backoff_with_jitter(attempt))
+
+        logger.warning(f"⚠️ Batch Get 재시도 초과: {len(pending)}개 키 미처리")
+        return items, pending
+
+    results = await asyncio.gather(*[_get_chunk(chunk) for chunk in chunk_list(keys, 100)])
+
+    found_items, unprocessed_keys = [], []
+    for items, leftover in results:
+        found_items.extend(items)
+        unprocessed_keys.extend(leftover)
+
+    return found_items, unprocessed_keys
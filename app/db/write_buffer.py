@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.db.backends import get_storage_backend
+from app.db.utils import execute_batch_write
+
+logger = logging.getLogger("WriteBuffer")
+
+
+class _Submission:
+    """submit() 1회에 대한 완료 추적용 (남은 키 개수 + 저장하지 못한 키)"""
+
+    def __init__(self, future: asyncio.Future, remaining: int):
+        self.future = future
+        self.remaining = remaining
+        self.dropped: set[tuple] = set()
+
+    def resolve_key(self, key: tuple, stored: bool):
+        if not stored:
+            self.dropped.add(key)
+        self.remaining -= 1
+        if self.remaining == 0 and not self.future.done():
+            self.future.set_result(self.dropped)
+
+
+class BatchWriteBuffer:
+    """
+    여러 워커가 공유하는 write-behind 버퍼
+    - 아이템을 모아 25개 단위의 batch_write로 저장 (반쯤 빈 배치 전송 방지)
+    - 같은 flush 구간 안의 중복 (PK, SK)는 하나로 합침 (마지막 값 유지)
+    - 25개가 차거나, 가장 오래된 아이템이 max_age를 넘거나, 종료(stop) 시 flush
+    - submit()은 해당 아이템의 저장이 끝나면 저장하지 못한 (PK, SK) 집합으로 완료되는 Future를 반환
+      (모두 저장되면 빈 집합 -> 호출하는 쪽이 실제로 저장된 아이템만 후속 처리할 수 있음)
+    """
+
+    def __init__(self, table_name: str, batch_size: int = 25, max_age: float = 1.0):
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.max_age = max_age
+
+        self._pending: dict[tuple, dict] = {}
+        self._key_waiters: dict[tuple, list[_Submission]] = {}
+        self._queued_at: dict[tuple, float] = {}  # 키가 버퍼에 처음 들어온 시각 (_pending과 같은 순서)
+        self._oldest_at: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self._direct_flushes: set[asyncio.Task] = set()  # start() 없이 submit()된 경우의 즉시 flush
+
+        # 통계
+        self.items_submitted = 0
+        self.duplicates_merged = 0
+        self.items_flushed = 0
+        self.flush_count = 0
+
+    async def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """남은 아이템을 모두 flush한 뒤 종료"""
+        if self._direct_flushes:
+            await asyncio.gather(*self._direct_flushes, return_exceptions=True)
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def submit(self, items: list[dict]) -> asyncio.Future:
+        """
+        PK/SK가 포함된 DynamoDB Item 리스트를 버퍼에 넣습니다.
+        반환된 Future를 await하면 저장 완료(durable)까지 기다릴 수 있습니다. (결과: 저장하지 못한 (PK, SK) 집합)
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        keys = list(dict.fromkeys((item['PK'], item['SK']) for item in items))
+        if not keys:
+            future.set_result(set())
+            return future
+
+        submission = _Submission(future, remaining=len(keys))
+
+        now = time.monotonic()
+        for item in items:
+            key = (item['PK'], item['SK'])
+            if key in self._pending:
+                self.duplicates_merged += 1
+            else:
+                self._queued_at[key] = now
+            self._pending[key] = item
+            self.items_submitted += 1
+
+        for key in keys:
+            self._key_waiters.setdefault(key, []).append(submission)
+
+        if self._oldest_at is None:
+            self._oldest_at = now
+
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+        if self._task is None:
+            # start() 없이 쓰인 경우에도 유실되지 않도록 즉시 flush (stop()에서 끝날 때까지 기다림)
+            task = asyncio.create_task(self._flush())
+            self._direct_flushes.add(task)
+            task.add_done_callback(self._on_direct_flush_done)
+
+        return future
+
+    def _on_direct_flush_done(self, task: asyncio.Task):
+        self._direct_flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Write-behind 즉시 flush 실패: {task.exception()}")
+
+    def get_stats(self) -> dict:
+        return {
+            "table": self.table_name,
+            "pending": len(self._pending),
+            "items_submitted": self.items_submitted,
+            "duplicates_merged": self.duplicates_merged,
+            "items_flushed": self.items_flushed,
+            "flush_count": self.flush_count,
+            "avg_items_per_flush": round(self.items_flushed / self.flush_count, 2) if self.flush_count else 0
+        }
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            age = time.monotonic() - self._oldest_at
+            if len(self._pending) < self.batch_size and age < self.max_age and not self._closing:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_age - age)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            # 크기 조건으로 깨어난 경우엔 꽉 찬 배치만 보내고 나머지는 계속 모음
+            is_size_only = age < self.max_age and not self._closing
+            limit = (len(self._pending) // self.batch_size) * self.batch_size if is_size_only else None
+
+            # 같은 키가 서로 다른 flush에서 순서가 뒤바뀌지 않도록 flush는 한 번에 하나씩
+            await self._flush(limit)
+
+    async def _flush(self, limit: Optional[int] = None):
+        if not self._pending:
+            return
+
+        if limit is None or limit >= len(self._pending):
+            items = self._pending
+            key_waiters = self._key_waiters
+            self._pending = {}
+            self._key_waiters = {}
+            self._queued_at = {}
+            self._oldest_at = None
+        else:
+            flush_keys = list(self._pending.keys())[:limit]
+            items = {key: self._pending.pop(key) for key in flush_keys}
+            key_waiters = {key: self._key_waiters.pop(key) for key in flush_keys}
+            for key in flush_keys:
+                self._queued_at.pop(key, None)
+            # 남은 아이템 중 가장 먼저 들어온 것 기준으로 다시 max_age를 잼 (앞서 보낸 아이템의 시각을 물려받지 않게)
+            self._oldest_at = self._queued_at[next(iter(self._pending))]
+
+        dropped_keys = set()
+        try:
+            dropped = await execute_batch_write(get_storage_backend(self.table_name), list(items.values()))
+            dropped_keys = {(item['PK'], item['SK']) for item in dropped}
+        except Exception as e:
+            logger.error(f"❌ Write-behind flush 실패 ({len(items)}건): {e}")
+            dropped_keys = set(items.keys())
+
+        self.flush_count += 1
+        self.items_flushed += len(items) - len(dropped_keys)
+
+        for key, submissions in key_waiters.items():
+            stored = key not in dropped_keys
+            for submission in submissions:
+                submission.resolve_key(key, stored)
@@ -7,7 +7,7 @@ from langchain.tools import tool
 from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel, Field
 
-from app.db.repositories.StockNewsRepository import news_repo
+from app.db.repositories.StockNewsRepository import news_repo, build_digest_entry
 from app.jobs.Daily_report_agent.state.state import StockReportSchema
 # from app.services.aws_service import fetch_news_by_date
 import pandas as pd
@@ -228,6 +228,24 @@ class DBNewsInput(BaseModel):
     min_importance: int = Field(default=6, description="중요도 필터")
 
 
+# 리포트 작성에 실제로 쓰는 컬럼만 조회 (나머지 컬럼은 읽지 않음)
+DB_NEWS_PROJECTION = ['id', 'datetime', 'summary', 'content', 'url', 'impact_score']
+
+
+def _simplify_news(entry: dict) -> dict:
+    """다이제스트 항목 -> LLM에 넘길 형태"""
+    timestamp = int(entry['datetime'])
+    #날짜 변환 (추후 수정)
+    date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    return {
+        "date": date_str,
+        "content": entry.get('content'),
+        "url": entry.get('url'),
+        "impact_score": str(entry.get('impact_score'))
+    }
+
+
 @tool(args_schema=DBNewsInput)
 async def fetch_db_news(symbol: str, days: int = 1, min_importance: int = 6) -> List[dict]:
     """DynamoDB에서 특정 기간의 중요도 있는 뉴스를 조회합니다."""
@@ -237,45 +255,41 @@ async def fetch_db_news(symbol: str, days: int = 1, min_importance: int = 6) ->
     from_date = now_utc - timedelta(days=days)
 
     # from_date의 00:00:00
-    from_dt = from_date.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    from_dt = from_date.replace(hour=0, minute=0, second=0, microsecond=0)
     # to_date(현재)
-    to_dt = now_utc.timestamp()
+    to_ts = int(now_utc.timestamp())
 
     print(f"📚 [Tool] DynamoDB 조회: {symbol} (지난 {days}일)")
 
     try:
-        # 실제 AWS 서비스 호출
-        raw_items = await news_repo.fetch_news_by_date(symbol, from_dt, to_dt, min_importance=min_importance)
-
-
-        if not raw_items:
+        # 1. 날짜별 다이제스트(그날 저장된 뉴스 전체)를 한 번에 조회
+        dates = [(from_dt + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days + 1)]
+        digests = await news_repo.get_digests(symbol, dates)
+
+        entries = []
+        for date, digest in digests.items():
+            if digest is not None:
+                entries.extend(digest)
+                continue
+
+            # 2. 다이제스트가 없거나 불완전/잘린 날짜(백필 전, 배포 당일 등)만 기존 기간 조회로 대체
+            day_start = int(datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+            async for item in news_repo.stream_news_by_date(
+                    symbol, day_start, min(day_start + 86399, to_ts), min_importance=min_importance,
+                    projection=DB_NEWS_PROJECTION
+            ):
+                entries.append(build_digest_entry(item))
+
+        simplified_items = [
+            _simplify_news(entry)
+            for entry in sorted(entries, key=lambda entry: int(entry['datetime']))
+            if int(entry['impact_score']) >= min_importance and int(entry['datetime']) <= to_ts
+        ]
+
+        if not simplified_items:
             print("조회된 뉴스가 없습니다.")
             return []
 
-        simplified_items = []
-        for item in raw_items:
-            raw_date = item.get('datetime')
-            timestamp = int(raw_date)
-            #날짜 변환 (추후 수정)
-            date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
-
-            impact = item.get('impact_score')
-            if impact >=8 :
-                content = item.get('content')
-            else:
-                content = item.get('summary', '내용없음')
-
-            url = item.get('url')
-            impact = str(impact)
-
-
-            simplified_items.append({
-                "date": date_str,
-                "content": content,
-                "url": url,
-                "impact_score": impact
-            })
-
         return simplified_items
 
     except Exception as e:
@@ -1,5 +1,143 @@
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core.AsyncRateLimiter import parse_retry_after, rate_limiters
+from app.core.settings import settings
+from app.services.response_cache import ResponseCache, finnhub_cache
+
+# 엔드포인트 계열 (계열마다 별도 버킷 -> 프로필 동기화가 뉴스 수집 몫을 다 쓰지 못하게)
+FAMILY_NEWS = "news"
+FAMILY_REFERENCE = "reference"  # /stock/symbol, /stock/profile2
+
+_FAMILY_LIMITS = {
+    FAMILY_NEWS: lambda: (settings.FINNHUB_NEWS_RATE_PER_MINUTE, settings.FINNHUB_BURST),
+    FAMILY_REFERENCE: lambda: (settings.FINNHUB_REFERENCE_RATE_PER_MINUTE, settings.FINNHUB_BURST),
+}
+
+
+def cache_ttl(path: str, params: dict) -> float:
+    """엔드포인트별 응답 캐시 TTL (0이면 캐시하지 않음)"""
+    if path == "/stock/symbol":
+        return settings.FINNHUB_CACHE_TTL_SYMBOLS_SECONDS
+    if path == "/stock/profile2":
+        return settings.FINNHUB_CACHE_TTL_PROFILE_SECONDS
+    if path == "/company-news":
+        # 어제 이전에 끝난 구간은 새 뉴스가 거의 붙지 않으므로 길게
+        try:
+            to_date = date.fromisoformat(str(params.get("to")))
+        except ValueError:
+            return settings.FINNHUB_CACHE_TTL_NEWS_SECONDS
+        if to_date < datetime.now(timezone.utc).date():
+            return settings.FINNHUB_CACHE_TTL_PAST_NEWS_SECONDS
+        return settings.FINNHUB_CACHE_TTL_NEWS_SECONDS
+    if path == "/news":
+        return settings.FINNHUB_CACHE_TTL_NEWS_SECONDS
+    return 0.0
+
 
 class FinnhubCollector:
-    def __init__(self, api_key):
-        self.api_key = api_key
+    """
+    Finnhub API 호출 공통 부모 클래스
+    - 모든 호출은 _get()을 거쳐서 공용 토큰 버킷(API 키 전체 + 엔드포인트 계열)을 통과
+    - 429 응답이면 Retry-After만큼 버킷을 멈추고 재시도
+    - 응답은 엔드포인트별 TTL로 디스크에 캐시 (적중하면 토큰을 쓰지 않음, 만료 시 ETag/Last-Modified로 재검증)
+    """
+
+    BASE_URL = "https://finnhub.io/api/v1"
+
+    def __init__(self, client: httpx.AsyncClient, api_key: Optional[str] = None, max_429_retries: int = 3,
+                 cache: Optional[ResponseCache] = finnhub_cache):
+        self.client = client
+        self.api_key = api_key or settings.FINNHUB_API_KEY
+        self.max_429_retries = max_429_retries
+        self.cache = cache
+
+        # API 키 전체 한도 (키 값 자체는 이름에 남기지 않음)
+        self._key_bucket = f"finnhub:key:{self.api_key[-4:]}"
+        rate_limiters.register(self._key_bucket, settings.FINNHUB_RATE_PER_MINUTE, settings.FINNHUB_BURST)
+
+    def _buckets(self, family: str) -> tuple[str, str]:
+        family_bucket = f"finnhub:{family}"
+        rate_per_minute, burst = _FAMILY_LIMITS[family]()
+        rate_limiters.register(family_bucket, rate_per_minute, burst)
+        return self._key_bucket, family_bucket
+
+    async def _get(self, path: str, params: dict, family: str, use_cache: bool = True) -> httpx.Response:
+        """
+        Finnhub GET 요청 (path 예: '/company-news')
+        - 성공 시 응답 반환 (캐시 적중이면 저장된 본문으로 만든 응답), 그 외 상태 코드는 httpx.HTTPStatusError
+        """
+        ttl = cache_ttl(path, params) if use_cache and self.cache is not None else 0.0
+        if ttl <= 0:
+            return await self._request(path, params, family)
+
+        return await self.cache.get_or_fetch(
+            path, params, ttl,
+            fetch=lambda conditional_headers: self._request(path, params, family, conditional_headers)
+        )
+
+    async def _request(self, path: str, params: dict, family: str,
+                       headers: Optional[dict] = None) -> httpx.Response:
+        """토큰 버킷을 통과해서 실제로 호출 (304는 캐시 재검증 응답이라 예외로 보지 않음)"""
+        buckets = self._buckets(family)
+        params = {**params, "token": self.api_key}
+
+        attempt = 0
+        while True:
+            await rate_limiters.acquire(*buckets)
+            response = await self.client.get(self.BASE_URL + path, params=params, headers=headers)
+
+            if response.status_code != 429 or attempt >= self.max_429_retries:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+
+            attempt += 1
+            retry_after = parse_retry_after(response.headers.get("Retry-After"), default=2.0 ** attempt)
+            print(f"⏳ Finnhub 429 ({path}): {retry_after:.1f}초 후 재시도 ({attempt}/{self.max_429_retries})")
+            rate_limiters.penalize(buckets, retry_after)
+
+    async def _stream(self, path: str, params: dict, family: str, use_cache: bool = True) -> AsyncIterator[bytes]:
+        """
+        Finnhub GET 응답 본문을 chunk 단위로 흘려보냄 (수 MB짜리 응답을 통째로 메모리에 올리지 않음)
+        - 캐시가 유효하면 디스크에서 읽고, 아니면 받는 대로 흘려보내면서 캐시 파일에도 씀
+        - 끝까지 받은 응답만 캐시에 반영 (동일 요청 합치기/304 재검증은 _get에서만)
+        """
+        ttl = cache_ttl(path, params) if use_cache and self.cache is not None else 0.0
+        if ttl > 0:
+            cached = await self.cache.iter_fresh(path, params)
+            if cached is not None:
+                async for chunk in cached:
+                    yield chunk
+                return
+
+        buckets = self._buckets(family)
+        request_params = {**params, "token": self.api_key}
+
+        attempt = 0
+        while True:
+            await rate_limiters.acquire(*buckets)
+            async with self.client.stream("GET", self.BASE_URL + path, params=request_params) as response:
+                if response.status_code == 429 and attempt < self.max_429_retries:
+                    attempt += 1
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"), default=2.0 ** attempt)
+                    print(f"⏳ Finnhub 429 ({path}): {retry_after:.1f}초 후 재시도 ({attempt}/{self.max_429_retries})")
+                    rate_limiters.penalize(buckets, retry_after)
+                    continue
 
+                response.raise_for_status()
+                writer = self.cache.open_writer(path, params, ttl) if ttl > 0 else None
+                try:
+                    async for chunk in response.aiter_bytes():
+                        if writer is not None:
+                            await writer.write(chunk)
+                        yield chunk
+                except BaseException:
+                    if writer is not None:
+                        await writer.abort()
+                    raise
+                if writer is not None:
+                    await writer.commit(response)
+                return
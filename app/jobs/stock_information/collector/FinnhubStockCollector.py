@@ -1,39 +1,22 @@
 import asyncio
+from contextlib import aclosing
 
 import httpx
 import yfinance as yf
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
 
-from app.core.settings import settings
+from app.jobs.stock_information.collector.FinnhubCollector import FinnhubCollector, FAMILY_REFERENCE
+from app.jobs.stock_information.collector.symbol_stream import parse_major_symbols
 from app.services.http_client import get_http_client
 
 
 # 주식 정보 수집만 하는 역할
-class FinnhubStockCollector:
-
-    def __init__(self, client: httpx.AsyncClient):
-        self.BASE_URL = "https://finnhub.io/api/v1/stock"
-        self.api_key = settings.FINNHUB_API_KEY
-        self.client = client
+class FinnhubStockCollector(FinnhubCollector):
 
     async def fetch_mojor_symbols(self, exchange: str = "US"):
-        print("🔍 Fetching stock symbols...")
-        url = f"{self.BASE_URL}/symbol"
-        params = {"exchange": exchange, "token": self.api_key}
-        target_mics = ["XNYS", "XNAS", "XASE"] #하드 코딩 추후 수정 필요
-
+        """메이저 거래소 보통주 (symbol, figi) 목록 (스트리밍 파싱 결과를 모아서 반환)"""
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()  # 오류 발생 시 예외 처리
-
-            filtered_response = [
-                (item['symbol'],item['figi'])
-                for item in response.json()
-                if item.get('type') == 'Common Stock'  # 보통주만 (ETF, 워런트 제외)
-                   and item.get('mic') in target_mics  # 메이저 거래소만
-            ]
-
-            return filtered_response
+            return [entry async for entry in self.iter_major_symbols(exchange)]
 
         except httpx.HTTPStatusError as e:
             print(f"⚠️ HTTP Error while fetching symbols: {e.response.status_code} - {e}")
@@ -42,28 +25,43 @@ class FinnhubStockCollector:
             print(f"⚠️ Failed to fetch symbols: {e}")
             return []
 
+    async def iter_major_symbols(self, exchange: str = "US") -> AsyncIterator[Tuple[str, str]]:
+        """
+        메이저 거래소 보통주 (symbol, figi)를 하나씩 흘려보냅니다. (파이프라인 입력용)
+        - /stock/symbol 본문을 받는 대로 파싱/필터링 -> 다운로드가 끝나기 전에 프로필 동기화 시작 가능
+        - 전체 심볼 dict 리스트를 만들지 않으므로 메모리가 심볼 수에 비례해서 늘지 않음
+        """
+        print("🔍 Fetching stock symbols...")
+        params = {"exchange": exchange}
 
-
+        # 공용 rate limiter 통과 + 응답 캐시 (오류는 호출부로 전달)
+        # (중간에 멈추거나 파싱이 실패해도 응답 스트림을 바로 닫음)
+        async with aclosing(self._stream("/stock/symbol", params, family=FAMILY_REFERENCE)) as chunks:
+            async for symbol, figi in parse_major_symbols(chunks):
+                yield symbol, figi
 
     async def fetch_profile(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """finnhub 통해 주식 정보(info) 수집"""
+        """
+        finnhub 통해 주식 정보(info) 수집
+        - 프로필이 없는 심볼(빈 응답)이면 None
+        - HTTP/네트워크 오류(429 재시도 초과 포함)는 예외로 전달 -> 호출부가 '조회 실패'로 구분해서 다시 시도
+        """
         print(f"🔍 Collecting profile for {symbol}...")
 
-        url = f"{self.BASE_URL}/profile2"
-        params = {"symbol": symbol, "token": self.api_key}
+        params = {"symbol": symbol}
 
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status() # 오류 발생 시 예외 처리
-            return response.json()
+            # 공용 rate limiter 통과
+            response = await self._get("/stock/profile2", params, family=FAMILY_REFERENCE)
+            return response.json() or None
 
         except httpx.HTTPStatusError as e:
             print(f"⚠️ HTTP Error for {symbol}: {e.response.status_code} - {e}")
-            return None
+            raise
 
         except Exception as e:
             print(f"⚠️ Failed to fetch profile for {symbol}: {e}")
-            return None
+            raise
 
 
 # 테스트
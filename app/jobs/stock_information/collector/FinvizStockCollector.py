@@ -1,118 +1,98 @@
-import time
+import asyncio
 import random
-import requests
-from bs4 import BeautifulSoup
 from typing import List
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.core.AsyncRateLimiter import parse_retry_after, rate_limiters
+from app.core.settings import settings
+
+PAGE_SIZE = 20  # 스크리너 한 페이지당 심볼 수
+_BUCKET = "finviz"
+# 동시 요청 수 제한은 버킷처럼 프로세스 전체에서 공유 (수집기 인스턴스마다 만들면 호출이 겹칠 때 한도를 넘음)
+_SEMAPHORE = asyncio.Semaphore(settings.FINVIZ_MAX_CONCURRENCY)
+
+
+class FinvizBlockedError(Exception):
+    """스크리너 결과 테이블이 없는 응답 (봇 확인 / 캡차 페이지 등)"""
+
+
+def parse_screener_symbols(html: str) -> List[str]:
+    """
+    스크리너 HTML에서 심볼 추출 (CPU 작업이라 이벤트 루프 밖에서 실행)
+    - 결과 테이블이 없거나 심볼이 하나도 없으면 FinvizBlockedError (200으로 오는 봇 확인 페이지를 빈 결과로 착각하지 않게)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # "table.screener_table" 테이블 안의 "a.tab-link" 링크들
+    elements = soup.select("table.screener_table a.tab-link")
+    symbols = [el.text.strip() for el in elements if el.text.strip()]
+    if not symbols:
+        raise FinvizBlockedError("스크리너 결과 테이블을 찾을 수 없습니다 (봇 확인 / 차단 페이지로 추정)")
+    return symbols
 
 
 class FinvizStockCollector:
     """
-    Finviz에서 시가총액 상위 심볼 크롤링(레이트 리밋 대응 포함)
+    Finviz 스크리너에서 시가총액 상위 심볼 수집 (async, 공유 httpx "finviz" 풀 사용)
+    - 봇 차단을 피하기 위한 예의(politeness) 예산: 공용 토큰 버킷(분당 호출 수) + 공용 동시 요청 수 제한
+    - 429 응답이면 Retry-After(없으면 지수 백오프 + 지터)만큼 버킷을 멈추고 재시도
+    - HTML 파싱은 스레드에서 실행 (이벤트 루프를 막지 않음)
+    - import 시점에는 아무 작업도 하지 않음
     """
-    def __init__(self, max_retries: int = 5, backoff_factor: float = 1.5):
-        # requests.Session: 연결을 재사용해서 효율적으로 여러 요청을 보낼 수 있음
-        self.session = requests.Session()
-        self.BASE_URL = "https://finviz.com/screener.ashx?v=152&f=cap_largeover&o=-marketcap&r={}"
-
-        # Retry 객체: HTTP 요청 실패 시 자동으로 재시도하는 정책 설정
-        retry = Retry(
-            total=max_retries,  # 최대 재시도 횟수
-            backoff_factor=backoff_factor,  # 재시도 간격: 1.5초, 3초, 4.5초... (지수적 증가)
-            status_forcelist=(429, 500, 502, 503, 504),  # 이 status code들이 오면 자동 재시도
-            allowed_methods=frozenset(["GET"]),  # GET 요청만 재시도 허용
-            raise_on_status=False,  # 에러 발생 시 예외를 던지지 않고 응답 객체 반환
-        )
-
-        # HTTPAdapter: Session에 재시도 정책을 적용하는 어댑터
-        adapter = HTTPAdapter(max_retries=retry)
-        # https:// 와 http:// 로 시작하는 모든 URL에 이 어댑터 적용
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
-
-        # HTTP 요청 헤더: 일반 브라우저처럼 보이게 위장 (봇 차단 우회)
-        self.headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/126.0.0.0 Safari/537.36"
-            ),
-            "Referer": "https://finviz.com/",  # 어디서 왔는지 (finviz 내부에서 온 것처럼)
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Cache-Control": "no-cache",  # 캐시 사용 안함
-        }
+
+    BASE_URL = "https://finviz.com/screener.ashx"
+
+    def __init__(self, client: httpx.AsyncClient, max_retries: int = 5, backoff_factor: float = 1.5):
+        self.client = client
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        rate_limiters.register(_BUCKET, settings.FINVIZ_RATE_PER_MINUTE, settings.FINVIZ_BURST)
 
-    def crawl_top_symbols(self, pages: int = 5, delay_range: tuple[float, float] = (1.5, 3.5)) -> List[str]:
+    async def crawl_top_symbols(self, pages: int = 5) -> List[str]:
         """
-        여러 페이지를 순회하며 symbol 리스트를 수집
+        여러 페이지를 동시에(예산 안에서) 받아 시가총액 순서대로 심볼 리스트 반환 (중복 제거)
         - pages: 페이지 수(페이지당 20개)
-        - delay_range: 각 요청 사이 랜덤 슬립 범위(초)
         """
-        all_symbols: List[str] = []
-        for page in range(pages):
-            # offset 계산: 1페이지=1, 2페이지=21, 3페이지=41, ...
-            offset = page * 20 + 1
-
-            # 각 페이지에서 심볼들을 가져옴
-            symbols = self._fetch_symbols_from_page(offset)
-            all_symbols.extend(symbols)
+        results = await asyncio.gather(*(self.fetch_page(page) for page in range(pages)))
+        return list(dict.fromkeys(symbol for symbols in results for symbol in symbols))
 
-            # 요청 간 랜덤 지연: 너무 빠르게 요청하면 봇으로 인식되어 차단됨
-            # 1.5~3.5초 사이의 랜덤한 시간만큼 대기
-            time.sleep(random.uniform(*delay_range))
+    async def fetch_page(self, page: int) -> List[str]:
+        """page번째(0부터) 스크리너 페이지의 심볼 (1페이지=r1, 2페이지=r21, ...)"""
+        html = await self._get_html(page * PAGE_SIZE + 1)
+        return await asyncio.to_thread(parse_screener_symbols, html)
 
-        # 중복 제거 후 정렬: set()으로 중복 제거, sorted()로 알파벳 순 정렬
-        return sorted(set(all_symbols))
+    async def _get_html(self, offset: int) -> str:
+        params = {"v": "152", "f": "cap_largeover", "o": "-marketcap", "r": offset}
 
-    def _fetch_symbols_from_page(self, r: int) -> List[str]:
-        """
-        개별 페이지에서 symbol 추출(429 대응: 지수 백오프 재시도)
+        attempt = 0
+        while True:
+            async with _SEMAPHORE:
+                await rate_limiters.acquire(_BUCKET)
+                response = await self.client.get(self.BASE_URL, params=params)
 
-        429 에러 = "Too Many Requests": 서버가 짧은 시간에 너무 많은 요청을 받았다고 판단
-        이 경우 점점 더 긴 시간을 기다렸다가 재시도 (지수 백오프)
-        """
-        url = self.BASE_URL.format(r)
+            if response.status_code != 429 or attempt >= self.max_retries:
+                response.raise_for_status()
+                return response.text
 
-        attempt = 0  # 시도 횟수
-        while True:  # 성공하거나 최대 재시도 초과할 때까지 무한 반복
             attempt += 1
+            # 지수 백오프 + 지터 (모든 요청이 동시에 재시도하지 않게)
+            default = self.backoff_factor ** attempt + random.uniform(0.2, 0.8)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"), default=default)
+            print(f"⏳ Finviz 429 (r={offset}): {retry_after:.2f}초 후 재시도 ({attempt}/{self.max_retries})")
+            rate_limiters.penalize([_BUCKET], retry_after)
+
+
+# 테스트
+async def main():
+    from app.services.http_client import get_http_client
+
+    async with get_http_client("finviz") as client:
+        collector = FinvizStockCollector(client)
+        top_symbols = await collector.crawl_top_symbols(pages=5)
+        print(f"총 {len(top_symbols)}개 심볼 수집:")
+        print(top_symbols)
 
-            # HTTP GET 요청 실행
-            resp = self.session.get(url, headers=self.headers, timeout=15)
-            status = resp.status_code
-
-            # 성공 케이스: 200 OK
-            if status == 200:
-                # BeautifulSoup로 HTML 파싱
-                soup = BeautifulSoup(resp.text, "html.parser")
-
-                # CSS 선택자로 심볼 링크 찾기
-                # "table.screener_table" 테이블 안의 "a.tab-link" 링크들
-                elements = soup.select("table.screener_table a.tab-link")
-
-                # 각 링크의 텍스트(심볼)를 추출, 공백 제거
-                return [el.text.strip() for el in elements if el.text.strip()]
-
-            # 실패 케이스: 429 (레이트 리밋) 에러이고 아직 재시도 횟수가 남았다면
-            if status == 429 and attempt <= self.max_retries:
-                # 지수 백오프: 1.5^1=1.5초, 1.5^2=2.25초, 1.5^3=3.375초, ...
-                # + 지터(jitter): 0.2~0.8초 랜덤 추가 (모든 클라이언트가 동시에 재시도하는 것 방지)
-                sleep_sec = (self.backoff_factor ** attempt) + random.uniform(0.2, 0.8)
-                print(f"429 에러 발생, {sleep_sec:.2f}초 대기 후 재시도 ({attempt}/{self.max_retries})")
-                time.sleep(sleep_sec)
-                continue  # while 루프 처음으로 돌아가서 재시도
-
-            # 기타 에러 (400, 500 등) 또는 재시도 횟수 초과
-            # raise_for_status(): 에러 상태 코드면 예외 발생
-            resp.raise_for_status()
-
-crawler = FinvizStockCollector()
-    # 45페이지 = 900개의 심볼 수집 (페이지당 20개)
-    # 주의: 많은 페이지를 크롤링하면 시간이 오래 걸림 (페이지당 2~3초 대기)
-top_symbols = crawler.crawl_top_symbols(pages=5)
-print(f"총 {len(top_symbols)}개 심볼 수집:")
-print(top_symbols)
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Tuple
+
+TARGET_MICS = ("XNYS", "XNAS", "XASE")  # 하드 코딩 추후 수정 필요
+
+_decoder = json.JSONDecoder()
+_SKIP = " \t\n\r,"
+# 숫자/리터럴 바로 뒤에 와야 하는 문자 (이게 아니면 아직 덜 받은 값: "1." + "5", "1e" + "3")
+_SCALAR_END = " \t\n\r,]"
+
+# 원소 하나가 이보다 커지도록 끝나지 않으면 깨진 JSON으로 판단 (버퍼가 끝없이 커지지 않게)
+MAX_ELEMENT_CHARS = 1024 * 1024
+
+
+def _parse_available(buffer: str, pos: int) -> tuple[list, int, bool]:
+    """
+    buffer[pos:]에서 완성된 배열 원소를 최대한 꺼냄
+    반환: (원소들, 다음 위치, 배열이 닫혔는지)
+    """
+    values = []
+    length = len(buffer)
+    while True:
+        while pos < length and buffer[pos] in _SKIP:
+            pos += 1
+        if pos >= length:
+            return values, pos, False
+        if buffer[pos] == "]":
+            return values, pos + 1, True
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 아직 덜 받은 원소 -> 다음 chunk를 기다림
+            return values, pos, False
+
+        if not isinstance(value, (dict, list, str)) and (end >= length or buffer[end] not in _SCALAR_END):
+            # 숫자/리터럴이 버퍼 끝에서 잘렸을 수 있음 (예: "12" + "3", "1." + "5" -> raw_decode는 1까지만 읽음)
+            return values, pos, False
+
+        values.append(value)
+        pos = end
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    최상위가 JSON 배열인 응답 본문을 chunk 단위로 읽으면서 원소를 하나씩 흘려보냄
+    - 전체 본문/전체 리스트를 메모리에 만들지 않음 (버퍼에는 아직 덜 받은 원소 하나 정도만 남음)
+    - 원소 파싱은 json.JSONDecoder.raw_decode (C 구현) 사용
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    closed = False
+
+    async for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+
+        if not started:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            if stripped[0] != "[":
+                raise ValueError("JSON 배열이 아닙니다.")
+            buffer = stripped[1:]
+            started = True
+
+        values, pos, closed = _parse_available(buffer, pos)
+        for value in values:
+            yield value
+        if closed:
+            return
+        if len(buffer) - pos > MAX_ELEMENT_CHARS:
+            raise ValueError(f"배열 원소가 {MAX_ELEMENT_CHARS}자를 넘습니다. (깨진 JSON?)")
+
+    # 마지막 chunk 뒤: 끝에서 잘려 있던 숫자/리터럴까지 처리
+    buffer = buffer[pos:] + utf8.decode(b"", final=True) + " "
+    values, pos, closed = _parse_available(buffer, 0)
+    for value in values:
+        yield value
+    if not closed:
+        raise ValueError("JSON 배열이 끝나기 전에 본문이 끝났습니다.")
+
+
+def is_major_common_stock(item: dict) -> bool:
+    return (
+        item.get('type') == 'Common Stock'  # 보통주만 (ETF, 워런트 제외)
+        and item.get('mic') in TARGET_MICS  # 메이저 거래소만
+    )
+
+
+async def parse_major_symbols(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[str, str]]:
+    """/stock/symbol 본문 chunk -> 메이저 거래소 보통주 (symbol, figi)"""
+    async for item in iter_json_array(chunks):
+        if is_major_common_stock(item):
+            yield item['symbol'], item['figi']
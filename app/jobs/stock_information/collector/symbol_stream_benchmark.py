@@ -0,0 +1,127 @@
+"""
+/stock/symbol 파싱 방식별 최대 메모리(peak RSS) 비교
+
+    python -m app.jobs.stock_information.collector.symbol_stream_benchmark --symbols 30000
+    python -m app.jobs.stock_information.collector.symbol_stream_benchmark --file symbols.json
+
+- full: 본문 전체를 받은 뒤 json.loads -> 필터 (기존 fetch_mojor_symbols 방식)
+- stream: 64KB chunk 단위로 읽으면서 파싱/필터 (iter_major_symbols 방식)
+각 방식은 별도 프로세스에서 실행해서 ru_maxrss가 서로 섞이지 않게 함
+(Linux는 exec 후에도 부모의 ru_maxrss를 이어받으므로 합성 데이터 생성도 별도 프로세스에서 함)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.jobs.stock_information.collector.symbol_stream import is_major_common_stock, parse_major_symbols
+
+CHUNK_SIZE = 64 * 1024
+_MICS = ["XNYS", "XNAS", "XASE", "OOTC", "BATS", "XOTC"]
+_TYPES = ["Common Stock", "Common Stock", "ETP", "ADR", "REIT", "Warrant"]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _make_payload(path: str, count: int, seed: int = 42):
+    """Finnhub /stock/symbol과 같은 모양의 합성 응답"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        symbol = f"S{i:05d}"
+        items.append({
+            "currency": "USD",
+            "description": f"SYNTHETIC COMPANY {i} INC",
+            "displaySymbol": symbol,
+            "figi": f"BBG{i:09d}",
+            "isin": None,
+            "mic": rng.choice(_MICS),
+            "shareClassFIGI": f"BBG{i + 1:09d}",
+            "symbol": symbol,
+            "symbol2": "",
+            "type": rng.choice(_TYPES)
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(items, f)
+
+
+def _run_full(path: str) -> int:
+    with open(path, "rb") as f:
+        body = f.read()
+    return len([(item['symbol'], item['figi']) for item in json.loads(body) if is_major_common_stock(item)])
+
+
+async def _run_stream(path: str) -> int:
+    async def chunks():
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    count = 0
+    async for _ in parse_major_symbols(chunks()):
+        count += 1
+    return count
+
+
+def _child(mode: str, path: str):
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    count = _run_full(path) if mode == "full" else asyncio.run(_run_stream(path))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"mode": mode, "symbols": count, "elapsed": elapsed,
+                      "baseline_mb": baseline, "peak_mb": _peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/stock/symbol 파싱 peak RSS 비교")
+    parser.add_argument("--file", help="실제 /stock/symbol 응답을 저장한 JSON 파일 (없으면 합성 데이터)")
+    parser.add_argument("--symbols", type=int, default=30000, help="합성 데이터 심볼 수")
+    parser.add_argument("--child", choices=["full", "stream", "payload"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "payload":
+        _make_payload(args.file, args.symbols)
+        return
+    if args.child:
+        _child(args.child, args.file)
+        return
+
+    tmp_path = None
+    path = args.file
+    if path is None:
+        fd, tmp_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        subprocess.run([sys.executable, "-m", __spec__.name, "--child", "payload",
+                        "--file", tmp_path, "--symbols", str(args.symbols)], check=True)
+        path = tmp_path
+
+    try:
+        print(f"📦 본문 크기: {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+        for mode in ("full", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--child", mode, "--file", path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"📊 {result['mode']:<6} | {result['symbols']:>6}개 | {result['elapsed']:6.2f}s"
+                f" | peak RSS {result['peak_mb']:7.1f}MB (시작 {result['baseline_mb']:.1f}MB,"
+                f" 증가 {result['peak_mb'] - result['baseline_mb']:.1f}MB)"
+            )
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from app.core.settings import settings
+from app.db.repositories.StockRepository import StockRepository, stock_repo
+from app.jobs.stock_information.collector.FinnhubStockCollector import FinnhubStockCollector
+from app.jobs.stock_information.service.StockCollectionService import StockCollectionService
+from app.schemas.stock import StockProfile
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger("ProfileRefresh")
+
+# 심볼 목록(/stock/symbol)은 하루에 한 번만 다시 받음
+_UNIVERSE_MAX_AGE = 24 * 3600
+
+
+class ProfileRefreshState:
+    """
+    프로필 갱신 상태를 로컬 JSON 파일에 보관
+    - symbols: {symbol: {"figi", "checked_at", "market_cap", "ipo"}}
+      (checked_at = 마지막으로 profile2를 조회한 시각. 내용이 같아 쓰지 않은 경우도 갱신, 호출/저장 실패는 갱신하지 않음)
+    - universe_fetched_at: 심볼 목록을 마지막으로 받은 시각
+    - 파일은 캐시일 뿐이고 기준은 DB의 last_updated_at (파일이 없으면 DB에서 복구)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.symbols: dict[str, dict] = {}
+        self.universe_fetched_at = 0.0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 갱신 상태 파일을 읽지 못했습니다 (처음부터 시작): {e}")
+            return
+
+        self.symbols = data.get("symbols", {})
+        self.universe_fetched_at = data.get("universe_fetched_at", 0.0)
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 죽어도 파일이 깨지지 않음)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"symbols": self.symbols, "universe_fetched_at": self.universe_fetched_at}, f)
+        os.replace(tmp_path, self.path)
+
+    def sync_universe(self, symbols: list[tuple[str, str]]):
+        """현재 심볼 목록 반영 (상장 폐지된 심볼 제거, 새 심볼 추가)"""
+        current = {symbol: figi for symbol, figi in symbols}
+        self.symbols = {
+            symbol: {**self.symbols.get(symbol, {}), "figi": figi}
+            for symbol, figi in current.items()
+        }
+        self.universe_fetched_at = time.time()
+
+    def unchecked(self) -> list[tuple[str, str]]:
+        """checked_at이 없는 (symbol, figi)"""
+        return [(symbol, entry["figi"]) for symbol, entry in self.symbols.items() if entry.get("checked_at") is None]
+
+    def restore(self, symbol: str, checked: dict):
+        """DB에 저장된 조회 시각 / 시가총액 / 상장일 반영"""
+        self.symbols[symbol].update(checked)
+
+    def record(self, symbol: str, figi: str, profile: Optional[StockProfile]):
+        entry = self.symbols.setdefault(symbol, {"figi": figi})
+        entry["checked_at"] = time.time()
+        if profile is not None:
+            entry["market_cap"] = float(profile.marketCapitalization) if profile.marketCapitalization is not None else None
+            entry["ipo"] = profile.ipo.isoformat() if profile.ipo else None
+
+
+class ProfileRefreshScheduler:
+    """
+    오래된 프로필만 골라서 갱신하는 증분 스케줄러
+    - 한 번도 조회하지 않은 심볼(신규 상장 포함) -> 가장 먼저
+    - 대형주 / 최근 상장 종목은 더 짧은 주기(hot_max_age)로, 나머지는 max_age로 갱신
+    - 같은 우선순위 안에서는 시가총액이 큰 순, 오래된 순
+    - 하루 호출 예산(daily_budget)을 interval 단위로 나눠서 하루 종일 고르게 사용
+    - 상태 파일에 조회 시각이 없는 심볼은 프로세스당 한 번 DB의 last_updated_at으로 복구
+      (상태 파일이 없어진 채로 재시작해도 전체를 다시 조회하지 않음)
+    """
+
+    def __init__(self, state_path: str = settings.PROFILE_REFRESH_STATE_PATH,
+                 max_age_hours: float = settings.PROFILE_REFRESH_MAX_AGE_HOURS,
+                 hot_max_age_hours: float = settings.PROFILE_REFRESH_HOT_MAX_AGE_HOURS,
+                 hot_market_cap: float = settings.PROFILE_REFRESH_HOT_MARKET_CAP,
+                 new_listing_days: int = settings.PROFILE_REFRESH_NEW_LISTING_DAYS,
+                 daily_budget: int = settings.PROFILE_REFRESH_DAILY_BUDGET,
+                 interval: float = settings.PROFILE_REFRESH_INTERVAL_SECONDS,
+                 repo: StockRepository = stock_repo):
+        self.state = ProfileRefreshState(state_path)
+        self.repo = repo
+        self.max_age = max_age_hours * 3600
+        self.hot_max_age = hot_max_age_hours * 3600
+        self.hot_market_cap = hot_market_cap
+        self.new_listing_days = new_listing_days
+        self.daily_budget = daily_budget
+        self.interval = interval
+
+        self._lock = asyncio.Lock()  # 한 번에 한 회차만 실행
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+        self._restored = False
+        self.last_run: Optional[dict] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def budget_per_run(self) -> int:
+        """interval 한 회차에 쓸 수 있는 호출 수 (심볼 목록 조회 1회 포함)"""
+        return max(1, int(self.daily_budget * self.interval / 86400))
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def select_due(self, limit: int, now: Optional[float] = None) -> list[tuple[str, str]]:
+        """갱신이 필요한 (symbol, figi)를 우선순위 순으로 최대 limit개 반환"""
+        now = now or time.time()
+        today = datetime.fromtimestamp(now, tz=timezone.utc).date()
+
+        due = []
+        for symbol, entry in self.state.symbols.items():
+            checked_at = entry.get("checked_at")
+            if checked_at is None:
+                # 한 번도 조회하지 않은 심볼
+                due.append(((0, 0.0, 0.0), symbol, entry["figi"]))
+                continue
+
+            is_hot = self._is_hot(entry, today)
+            age = now - checked_at
+            if age < (self.hot_max_age if is_hot else self.max_age):
+                continue
+
+            priority = 1 if is_hot else 2
+            due.append(((priority, -(entry.get("market_cap") or 0.0), checked_at), symbol, entry["figi"]))
+
+        due.sort(key=lambda candidate: candidate[0])
+        return [(symbol, figi) for _, symbol, figi in due[:limit]]
+
+    async def run_once(self, limit: Optional[int] = None) -> dict:
+        """
+        한 회차 실행: (필요하면 심볼 목록 갱신) -> 오래된 프로필 선택 -> 파이프라인으로 갱신
+        반환: 선택/갱신 통계
+        """
+        async with self._lock:
+            await self._load_state()
+            budget = limit or self.budget_per_run
+
+            async with get_http_client() as client:
+                collector = FinnhubStockCollector(client=client)
+                service = StockCollectionService(collector=collector)
+
+                if time.time() - self.state.universe_fetched_at > _UNIVERSE_MAX_AGE or not self.state.symbols:
+                    symbols = await collector.fetch_mojor_symbols()
+                    budget -= 1
+                    if symbols:
+                        self.state.sync_universe(symbols)
+
+                await self._restore_checked_at()
+                due = self.select_due(max(budget, 0))
+                stats = {"selected": len(due), "tracked_symbols": len(self.state.symbols)}
+
+                if due:
+                    stats.update(await service.update_stock_profiles(
+                        symbol_source=self._iter_symbols(due),
+                        on_result=self.state.record
+                    ))
+
+            await asyncio.to_thread(self.state.save)
+            stats["remaining_due"] = len(self.select_due(len(self.state.symbols)))
+
+            self.last_run = stats
+            logger.info(f"🔄 프로필 증분 갱신: {stats}")
+            return stats
+
+    async def _run_forever(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ 프로필 증분 갱신 실패: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def _load_state(self):
+        if not self._loaded:
+            await asyncio.to_thread(self.state.load)
+            self._loaded = True
+
+    async def _restore_checked_at(self):
+        """조회 시각이 없는 심볼을 DB의 last_updated_at으로 채움 (실패하면 다음 회차에 다시 시도)"""
+        if self._restored:
+            return
+        unchecked = self.state.unchecked()
+        if unchecked:
+            try:
+                states = await self.repo.get_profile_check_states([figi for _, figi in unchecked])
+            except Exception as e:
+                logger.warning(f"⚠️ 프로필 조회 시각 복구 실패: {e}")
+                return
+            restored = 0
+            for symbol, figi in unchecked:
+                if figi in states:
+                    self.state.restore(symbol, states[figi])
+                    restored += 1
+            logger.info(f"♻️ 프로필 조회 시각 복구: {restored}/{len(unchecked)}건 (DB last_updated_at)")
+        self._restored = True
+
+    def _is_hot(self, entry: dict, today: date) -> bool:
+        if (entry.get("market_cap") or 0.0) >= self.hot_market_cap:
+            return True
+        ipo = entry.get("ipo")
+        if ipo:
+            try:
+                return (today - date.fromisoformat(ipo)).days <= self.new_listing_days
+            except ValueError:
+                return False
+        return False
+
+    @staticmethod
+    async def _iter_symbols(symbols: list[tuple[str, str]]):
+        for symbol, figi in symbols:
+            yield symbol, figi
+
+
+# 앱 전체에서 공유 (lifespan / 라우터)
+profile_refresh_scheduler = ProfileRefreshScheduler()
@@ -1,81 +1,231 @@
-from app.core.AsyncRateLimiter import FinnhubAsyncRateLimiter
+from app.db.repositories.StockRepository import StockRepository, stock_repo
 from app.schemas.stock import StockProfile
 from app.jobs.stock_information.collector.FinnhubStockCollector import FinnhubStockCollector
-# from app.services.aws_service import put_item_dynamodb
 import asyncio
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterable, Callable, Optional, Tuple
+
+# 큐 종료 신호
+_DONE = object()
+
+
+class ProfileSyncProgress:
+    """프로필 동기화 진행 상황 (처리량/남은 시간 계산용)"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.symbols_total: Optional[int] = None  # 심볼 목록을 다 읽으면 확정
+        self.symbols_queued = 0
+        self.fetched = 0
+        self.skipped = 0  # 프로필 없음 / 검증 실패
+        self.failed = 0
+        self.written = 0
+        self.unchanged = 0  # 지문이 같아 쓰지 않은 프로필
+        self.dropped = 0
+
+    @property
+    def processed(self) -> int:
+        return self.fetched + self.skipped + self.failed
+
+    def get_stats(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        rate = self.processed / elapsed
+        remaining = (self.symbols_total or self.symbols_queued) - self.processed
+
+        return {
+            "symbols_total": self.symbols_total,
+            "symbols_queued": self.symbols_queued,
+            "fetched": self.fetched,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "written": self.written,
+            "unchanged": self.unchanged,
+            "dropped": self.dropped,
+            "elapsed_sec": round(elapsed, 1),
+            "symbols_per_min": round(rate * 60, 1),
+            "eta_sec": round(remaining / rate, 1) if rate and self.symbols_total is not None else None
+        }
 
 
 class StockCollectionService:
-    def __init__(self, collector: FinnhubStockCollector):
+    """
+    주식 프로필 동기화 파이프라인 (producer -> fetcher pool -> batching sink)
+    - 심볼은 스트리밍으로 읽어 크기 제한 큐에 넣음 (미리 수만 개의 코루틴을 만들지 않음)
+    - fetcher는 고정 개수만 띄우고 호출 빈도는 collector의 공용 Finnhub 토큰 버킷이 제한
+    - 프로필은 25개씩 모아 batch_write로 저장 (FIGI#{figi} / METADATA)
+    """
+
+    def __init__(self, collector: FinnhubStockCollector, repo: StockRepository = stock_repo,
+                 fetcher_count: int = 5, batch_size: int = 25, flush_interval: float = 5.0,
+                 progress_interval: float = 30.0):
         self.collector = collector
+        self.repo = repo
+        self.fetcher_count = fetcher_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.progress_interval = progress_interval
         self.table_name = "StockProjectData"
 
-
-    async def update_stock_profiles(self):
+    async def update_stock_profiles(self, symbol_source: Optional[AsyncIterable[Tuple[str, str]]] = None,
+                                    on_result: Optional[Callable[[str, str, Optional[StockProfile]], None]] = None) -> dict:
+        """
+        - symbol_source: (symbol, figi)를 흘려보내는 async iterable (없으면 메이저 거래소 전체)
+        - on_result: 조회 결과가 확정된 심볼마다 호출
+          (프로필 없음이면 조회 직후 None으로, 프로필은 저장(또는 변경 없음 확인)이 끝난 뒤 호출
+           -> 호출 실패 / 저장 실패한 심볼은 호출하지 않음 (다음 회차에 다시 조회))
+        """
         print("주식 정보 업데이트 시작")
 
-        symbols = await self.collector.fetch_mojor_symbols()
-        if not symbols:
-            print("⚠️ No symbols fetched.")
-            return
-
-        # 1. Rate Limiter 설정 (안전하게 1분에 55회 정도로 설정 추천)
-        # 60초 동안 60회 = 1초에 1회
-        rate_limiter = FinnhubAsyncRateLimiter(max_calls=55, period=60)
+        progress = ProfileSyncProgress()
+        symbol_queue = asyncio.Queue(maxsize=self.fetcher_count * 4)
+        profile_queue = asyncio.Queue(maxsize=self.batch_size * 4)
 
-        # 2. Semaphore 설정 (동시 연결 수 제한)
-        semaphore = asyncio.Semaphore(5)
+        fetchers = [
+            asyncio.create_task(self._fetcher(symbol_queue, profile_queue, progress, on_result))
+            for _ in range(self.fetcher_count)
+        ]
+        sink = asyncio.create_task(self._sink(profile_queue, progress, on_result))
+        reporter = asyncio.create_task(self._report_progress(progress))
 
-        async def process_with_limit(sym, figi):
-            # Semaphore로 동시 실행 제어 (내 서버 보호)
-            async with semaphore:
-                # RateLimiter로 빈도 제어 (상대 서버 보호)
-                # 여기서 1초가 안 지났으면 대기하게 됨
-                await rate_limiter.wait()
+        try:
+            await self._produce(symbol_queue, progress, symbol_source)
+            await asyncio.gather(*fetchers)
+            await profile_queue.put(_DONE)
+            await sink
+        finally:
+            reporter.cancel()
+            for task in (*fetchers, sink):
+                task.cancel()
+
+        stats = progress.get_stats()
+        if not progress.symbols_total:
+            print("⚠️ No symbols fetched.")
+        print(f"🎉 주식 정보 업데이트 완료: {stats}")
+        return stats
 
-                try:
-                    return await self._process_single_symbol(sym, figi)
-                except Exception as e:
-                    print(f"Error processing {sym}: {e}")
-                    return None
+    async def _produce(self, symbol_queue: asyncio.Queue, progress: ProfileSyncProgress,
+                       symbol_source: Optional[AsyncIterable[Tuple[str, str]]] = None):
+        """심볼 목록을 읽는 대로 큐에 넣음 (큐가 차면 fetcher가 따라올 때까지 대기)"""
+        if symbol_source is None:
+            symbol_source = self.collector.iter_major_symbols()
 
-        # Task 생성
-        tasks = [process_with_limit(sym, figi) for sym,figi in symbols]
+        try:
+            async for symbol, figi in symbol_source:
+                await symbol_queue.put((symbol, figi))
+                progress.symbols_queued += 1
+        except Exception as e:
+            # 심볼 목록을 받다가 끊긴 경우 -> 이미 넣은 심볼까지만 처리
+            print(f"⚠️ 심볼 목록 수신 중단 ({progress.symbols_queued}개까지 처리): {e}")
+        finally:
+            progress.symbols_total = progress.symbols_queued
+            for _ in range(self.fetcher_count):
+                await symbol_queue.put(_DONE)
+
+    async def _fetcher(self, symbol_queue: asyncio.Queue, profile_queue: asyncio.Queue,
+                       progress: ProfileSyncProgress, on_result: Optional[Callable] = None):
+        while True:
+            entry = await symbol_queue.get()
+            if entry is _DONE:
+                return
+
+            symbol, figi = entry
+            try:
+                profile = await self._process_single_symbol(symbol, figi)
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                progress.failed += 1
+                continue
+
+            if profile is None:
+                progress.skipped += 1
+                if on_result is not None:
+                    on_result(symbol, figi, None)
+                continue
+
+            progress.fetched += 1
+            await profile_queue.put(profile)
+
+    async def _sink(self, profile_queue: asyncio.Queue, progress: ProfileSyncProgress,
+                    on_result: Optional[Callable] = None):
+        """프로필을 batch_size개씩 모아서 저장 (flush_interval이 지나면 덜 찼어도 저장)"""
+        batch: list[StockProfile] = []
+        done = False
+
+        while not done:
+            try:
+                profile = await asyncio.wait_for(profile_queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                profile = None
+
+            if profile is _DONE:
+                done = True
+            elif profile is not None:
+                batch.append(profile)
+
+            if batch and (len(batch) >= self.batch_size or profile is None or done):
+                await self._flush(batch, progress, on_result)
+                batch = []
+
+    async def _flush(self, batch: list[StockProfile], progress: ProfileSyncProgress,
+                     on_result: Optional[Callable] = None):
+        try:
+            result = await self.repo.save_profiles_batch(batch)
+        except Exception as e:
+            print(f"❌ 프로필 {len(batch)}건 저장 실패: {e}")
+            progress.dropped += len(batch)
+            return
 
-        # 실행
-        await asyncio.gather(*tasks, return_exceptions=True)
+        progress.written += result["written"]
+        progress.unchanged += result["unchanged"]
+        progress.dropped += len(result["dropped"])
+
+        # 저장됐거나 내용이 같은 것으로 확인된 프로필만 '조회 완료'로 알림
+        if on_result is not None:
+            dropped_keys = {item['PK'] for item in result["dropped"]}
+            for profile in batch:
+                if f"FIGI#{profile.figi}" not in dropped_keys:
+                    on_result(profile.symbol, profile.figi, profile)
+
+    async def _report_progress(self, progress: ProfileSyncProgress):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            stats = progress.get_stats()
+            total = stats['symbols_total'] if stats['symbols_total'] is not None else f"{stats['symbols_queued']}+"
+            print(
+                f"📈 프로필 동기화 {progress.processed}/{total} "
+                f"(저장 {stats['written']}, 변경 없음 {stats['unchanged']}, 건너뜀 {stats['skipped']}, "
+                f"실패 {stats['failed']}, 유실 {stats['dropped']}) "
+                f"| {stats['symbols_per_min']}개/분 | ETA {stats['eta_sec']}s"
+            )
 
-    async def _process_single_symbol(self, symbol, figi):
+    async def _process_single_symbol(self, symbol, figi) -> Optional[StockProfile]:
         raw_data = await self.collector.fetch_profile(symbol)
         if not raw_data:
-            return
+            return None
 
         # 2. 데이터 변환 (Pydantic)
         try:
-            profile = StockProfile(
+            return StockProfile(
                 figi = figi,
                 symbol=symbol,
                 name=raw_data.get("name"),
                 country=raw_data.get("country"),
                 currency=raw_data.get("currency"),
                 exchange=raw_data.get("exchange"),
-                ipo=raw_data.get("ipo"),
+                finnhubIndustry=raw_data.get("finnhubIndustry"),
+                ipo=raw_data.get("ipo") or None,
                 logo=raw_data.get("logo"),
                 marketCapitalization=raw_data.get("marketCapitalization"),
                 phone=raw_data.get("phone"),
                 shareOutstanding=raw_data.get("shareOutstanding"), # 주식 발행 수
-                weburl=raw_data.get("weburl")
+                weburl=raw_data.get("weburl"),
+                # 프로필을 마지막으로 조회한 시각 (지문에서는 제외 -> 내용이 같으면 다시 쓰지 않음)
+                last_updated_at=datetime.now(timezone.utc).isoformat()
             )
         except Exception as e:
             print(f"⚠️ Validation Error for {symbol}: {e}")
-            return
-
-        # 3. 데이터 저장 (사용자님의 aws_service 함수 활용)
-        await put_item_dynamodb(
-            table_name=self.table_name,
-            item=profile.to_dynamodb_item()
-        )
-        print(f"✅ Saved profile for {symbol}")
+            return None
 
 
 # # 테스트용 메인 함수
@@ -85,4 +235,4 @@ class StockCollectionService:
 #         await stock_collection_service.update_stock_profiles()
 #
 # if __name__ == "__main__":
-#     asyncio.run(main())
\ No newline at end of file
+#     asyncio.run(main())
@@ -0,0 +1,94 @@
+import asyncio
+import math
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+from app.jobs.stock_information.collector.FinvizStockCollector import PAGE_SIZE, FinvizStockCollector
+from app.services.http_client import get_http_client
+
+_MARKET_TZ = ZoneInfo("America/New_York")
+
+
+def current_trading_day(now: Optional[datetime] = None) -> date:
+    """미국 장 기준 거래일 (주말이면 직전 금요일, 공휴일은 구분하지 않음)"""
+    day = (now or datetime.now(_MARKET_TZ)).astimezone(_MARKET_TZ).date()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class TopSymbolService:
+    """
+    시가총액 상위 N개 심볼 제공 (Finviz 스크리너)
+    - 페이지 결과는 거래일 단위로 캐시 (거래일이 바뀌면 비움)
+      한 페이지(20개)를 다 채우지 못한 페이지는 캐시하지 않음 (차단 페이지 / 일부만 받은 응답이 하루 종일 남지 않게)
+    - 같은 페이지를 동시에 요청하면 한 번만 받아옴
+    """
+
+    def __init__(self, max_symbols: int = 1000):
+        self.max_symbols = max_symbols
+
+        self._trading_day: Optional[date] = None
+        self._pages: dict[int, List[str]] = {}
+        self._inflight: dict[int, asyncio.Task] = {}
+
+        # 통계
+        self.page_hits = 0
+        self.page_fetches = 0
+
+    async def get_top_symbols(self, n: int = 100) -> List[str]:
+        """시가총액 상위 n개 심볼 (시가총액 순서)"""
+        n = max(1, min(n, self.max_symbols))
+        pages = math.ceil(n / PAGE_SIZE)
+
+        self._roll_trading_day()
+        results = {page: self._pages[page] for page in range(pages) if page in self._pages}
+        missing = [page for page in range(pages) if page not in results]
+        self.page_hits += len(results)
+
+        if missing:
+            async with get_http_client("finviz") as client:
+                collector = FinvizStockCollector(client)
+                loaded = await asyncio.gather(*(self._load_page(collector, page) for page in missing))
+            results.update(zip(missing, loaded))
+
+        symbols = (symbol for page in range(pages) for symbol in results[page])
+        return list(dict.fromkeys(symbols))[:n]
+
+    def get_stats(self) -> dict:
+        return {
+            "trading_day": self._trading_day.isoformat() if self._trading_day else None,
+            "cached_pages": len(self._pages),
+            "page_hits": self.page_hits,
+            "page_fetches": self.page_fetches
+        }
+
+    async def _load_page(self, collector: FinvizStockCollector, page: int) -> List[str]:
+        task = self._inflight.get(page)
+        if task is None:
+            task = asyncio.create_task(collector.fetch_page(page))
+            self._inflight[page] = task
+            self.page_fetches += 1
+            trading_day = self._trading_day
+            task.add_done_callback(lambda done: self._store_page(page, trading_day, done))
+        return await asyncio.shield(task)
+
+    def _store_page(self, page: int, trading_day: date, task: asyncio.Task):
+        self._inflight.pop(page, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        # 받는 도중 거래일이 바뀌었으면 지난 거래일 결과는 버림
+        symbols = task.result()
+        if trading_day == self._trading_day and len(symbols) >= PAGE_SIZE:
+            self._pages[page] = symbols
+
+    def _roll_trading_day(self):
+        today = current_trading_day()
+        if today != self._trading_day:
+            self._trading_day = today
+            self._pages = {}
+
+
+# 앱 전체에서 공유 (라우터 / 작업)
+top_symbol_service = TopSymbolService()
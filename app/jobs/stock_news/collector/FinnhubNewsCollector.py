@@ -1,53 +1,51 @@
 import httpx
 
-from app.core.settings import settings
+from app.jobs.stock_information.collector.FinnhubCollector import FinnhubCollector, FAMILY_NEWS
 
 
-class FinnhubNewsCollector:
+class FinnhubNewsCollector(FinnhubCollector):
 
-    def __init__(self, client: httpx.AsyncClient):
-        self.BASE_URL = "https://finnhub.io/api/v1"
-        self.api_key = settings.FINNHUB_API_KEY
-        self.client = client
-
-    async def fetch_stock_news(self, symbol: str, from_date: str, to_date: str):
-        """finnhub 통해 주식 뉴스 수집"""
+    async def fetch_stock_news(self, symbol: str, from_date: str, to_date: str, raise_on_error: bool = False):
+        """
+        finnhub 통해 주식 뉴스 수집
+        - raise_on_error: 실패 시 빈 리스트 대신 예외를 그대로 올림 (호출부에서 실패 집계용)
+        """
         print(f"🔍 Collecting news for {symbol} from {from_date} to {to_date}...")
 
-        url = self.BASE_URL + "/company-news"
         params = {
             "symbol": symbol,
             "from": from_date,
-            "to": to_date,
-            "token": self.api_key
+            "to": to_date
         }
 
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()  # 오류 발생 시 예외 처리
+            # 공용 rate limiter 통과 + 오류 발생 시 예외 처리
+            response = await self._get("/company-news", params, family=FAMILY_NEWS)
             return response.json()
 
         except httpx.HTTPStatusError as e:
             print(f"⚠️ HTTP Error for {symbol}: {e.response.status_code} - {e}")
+            if raise_on_error:
+                raise
             return []
 
         except Exception as e:
             print(f"⚠️ Failed to fetch news for {symbol}: {e}")
+            if raise_on_error:
+                raise
             return []
 
     async def fetch_general_news(self, category: str = "general"):
         """finnhub 통해 일반 뉴스 수집"""
         print(f"🔍 Collecting general news for category: {category}...")
 
-        url = self.BASE_URL + "/news"
         params = {
-            "category": category,
-            "token": self.api_key
+            "category": category
         }
 
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()  # 오류 발생 시 예외 처리
+            # 공용 rate limiter 통과 + 오류 발생 시 예외 처리
+            response = await self._get("/news", params, family=FAMILY_NEWS)
             return response.json()
 
         except httpx.HTTPStatusError as e:
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+from app.db.backends import get_storage_backend
+from app.db.repositories.StockNewsRepository import news_repo
+
+
+def _date_range(start_date: str, end_date: str) -> list[str]:
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+
+async def rebuild_digests(symbols: list[str], start_date: str, end_date: str, concurrency: int = 5):
+    """(종목 x 날짜)별 다이제스트를 저장된 뉴스로부터 다시 만듭니다."""
+    semaphore = asyncio.Semaphore(concurrency)
+    dates = _date_range(start_date, end_date)
+
+    async def rebuild(symbol: str, date: str):
+        async with semaphore:
+            try:
+                count = await news_repo.rebuild_digest(symbol, date)
+                print(f"✅ [{symbol}] {date} 다이제스트 {count}건")
+            except Exception as e:
+                print(f"❌ [{symbol}] {date} 다이제스트 재구축 실패: {e}")
+
+    print(f"🚀 다이제스트 재구축: {len(symbols)}개 종목 x {len(dates)}일")
+    await asyncio.gather(*(rebuild(symbol, date) for symbol in symbols for date in dates))
+    print("🎉 다이제스트 재구축 완료")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="백필된 날짜의 종목별 일간 뉴스 다이제스트(DIGEST#{date}) 재구축")
+    parser.add_argument("symbols", nargs="+", help="종목 심볼 (예: AAPL MSFT)")
+    parser.add_argument("--start-date", required=True, help="시작 날짜 (YYYY-MM-DD, UTC)")
+    parser.add_argument("--end-date", help="종료 날짜 (YYYY-MM-DD, UTC). 없으면 시작 날짜와 동일")
+    parser.add_argument("--concurrency", type=int, default=5)
+    args = parser.parse_args()
+
+    load_dotenv()
+    storage = get_storage_backend()
+    await storage.start()
+    try:
+        await rebuild_digests(args.symbols, args.start_date, args.end_date or args.start_date, args.concurrency)
+    finally:
+        await storage.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
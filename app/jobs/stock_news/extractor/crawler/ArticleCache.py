@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.settings import settings
+from app.jobs.stock_news.extractor.crawler.CrawlScheduler import CRAWL_MISS, CRAWL_OK, CrawlOutcome
+
+logger = logging.getLogger("ArticleCache")
+
+# 같은 기사인데 URL만 달라지게 만드는 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "guccounter", "guce_referrer", "guce_referrer_sig", "mc_cid", "mc_eid",
+                    "ncid", "cmpid", "soc_src", "soc_trk", "yptr", ".tsrc"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_accessed_at ON articles (accessed_at);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    url TEXT NOT NULL
+);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """캐시 키용 URL 정규화 (스킴/호스트 소문자, fragment / 추적 파라미터 제거, 쿼리 정렬, 끝 슬래시 제거)"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in _TRACKING_PARAMS and not name.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class ArticleCache:
+    """
+    기사 본문 캐시 (SQLite, 종목/수집 회차와 상관없이 공유)
+    - 키: 리다이렉트를 따라간 최종 URL(정규화), 요청 URL은 별칭(aliases)으로 최종 URL에 연결
+      -> 같은 기사가 여러 종목에 붙어 와도 한 번만 받아서 파싱
+    - 저장 내용: 추출된 본문, 결과 상태(ok / miss), 받은 시각
+      (miss = 받았지만 본문 추출 실패 -> miss_ttl 동안만 재사용, 오류/서킷 건너뜀은 저장하지 않음)
+    - 전체 본문 크기가 max_bytes를 넘으면 가장 오래 안 쓰인 기사부터 삭제 (LRU)
+    - 같은 URL을 동시에 요청하면 한 번만 받아옴 (coalescing)
+    - SQLite 작업은 스레드에서 실행 (이벤트 루프를 막지 않음)
+    """
+
+    def __init__(self, path: str, max_bytes: int, miss_ttl: float, enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.miss_ttl = miss_ttl
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._open_lock = asyncio.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._bytes = 0
+        self._entries = 0
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stored = 0
+        self.evictions = 0
+
+    async def get_or_fetch(self, url: str, fetch: Callable[[], Awaitable[CrawlOutcome]]) -> CrawlOutcome:
+        """캐시된 결과를 반환하거나 fetch()로 새로 받아 저장"""
+        if not self.enabled:
+            return await fetch()
+
+        key = normalize_url(url)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            outcome = await self._lookup_or_fetch(key, fetch)
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    # 먼저 호출한 쪽이 취소돼도 기다리던 쪽까지 취소되지는 않게
+                    e = RuntimeError("coalesced crawl was cancelled")
+                future.set_exception(e)
+                future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않게
+            raise
+        else:
+            future.set_result(outcome)
+            return outcome
+        finally:
+            self._inflight.pop(key, None)
+
+    async def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await asyncio.to_thread(conn.close)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0
+        }
+
+    async def _lookup_or_fetch(self, key: str, fetch) -> CrawlOutcome:
+        await self._ensure_open()
+
+        try:
+            cached = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 기사 캐시 조회 실패: {e}")
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        outcome = await fetch()
+        if outcome.status in (CRAWL_OK, CRAWL_MISS):
+            try:
+                await asyncio.to_thread(self._put, key, outcome)
+                self.stored += 1
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 기사 캐시 저장 실패: {e}")
+        return outcome
+
+    async def _ensure_open(self):
+        if self._conn is not None:
+            return
+        async with self._open_lock:
+            if self._conn is None:
+                self._conn = await asyncio.to_thread(self._open)
+                logger.info(f"💾 기사 캐시 열림: {self._entries}건 ({self._bytes / 1024 / 1024:.1f}MB)")
+
+    # --- SQLite (스레드에서 실행) ---
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._entries, self._bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM articles").fetchone()
+        return conn
+
+    def _get(self, key: str) -> Optional[CrawlOutcome]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT url, status, content, fetched_at FROM articles "
+                "WHERE url = COALESCE((SELECT url FROM aliases WHERE alias = ?), ?)",
+                (key, key)
+            ).fetchone()
+            if row is None:
+                return None
+
+            url, status, content, fetched_at = row
+            now = time.time()
+            if status == CRAWL_MISS and now - fetched_at > self.miss_ttl:
+                # 본문 추출 실패는 일정 시간 뒤 다시 시도 (추출기 개선 / 일시적 차단 대비)
+                return None
+
+            self._conn.execute("UPDATE articles SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+        return CrawlOutcome(status, content, url)
+
+    def _put(self, key: str, outcome: CrawlOutcome):
+        final_key = normalize_url(outcome.final_url) if outcome.final_url else key
+        content = outcome.content or ""
+        size = len(content.encode("utf-8"))
+        now = time.time()
+
+        with self._db_lock:
+            previous = self._conn.execute("SELECT size FROM articles WHERE url = ?", (final_key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url, status, content, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (final_key, outcome.status, content, size, now, now)
+            )
+            if final_key != key:
+                self._conn.execute("INSERT OR REPLACE INTO aliases (alias, url) VALUES (?, ?)", (key, final_key))
+
+            if previous is None:
+                self._entries += 1
+                self._bytes += size
+            else:
+                self._bytes += size - previous[0]
+
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """가장 오래 안 쓰인 기사부터 max_bytes의 90%까지 삭제 (매번 조금씩 지우지 않게 여유를 둠)"""
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        for url, size in self._conn.execute("SELECT url, size FROM articles ORDER BY accessed_at"):
+            if self._bytes <= target:
+                break
+            victims.append((url,))
+            self._bytes -= size
+            self._entries -= 1
+
+        self._conn.executemany("DELETE FROM articles WHERE url = ?", victims)
+        self._conn.execute("DELETE FROM aliases WHERE url NOT IN (SELECT url FROM articles)")
+        self.evictions += len(victims)
+
+
+# 앱 전체에서 공유 (뉴스 파이프라인 워커 전체)
+article_cache = ArticleCache(
+    path=settings.ARTICLE_CACHE_PATH,
+    max_bytes=settings.ARTICLE_CACHE_MAX_BYTES,
+    miss_ttl=settings.ARTICLE_CACHE_MISS_TTL_SECONDS,
+    enabled=settings.ARTICLE_CACHE_ENABLED
+)
@@ -1,26 +1,122 @@
-from abc import ABC, abstractmethod
+import codecs
+from abc import ABC
+from dataclasses import dataclass
+from typing import Optional
 
 import httpx
 
+from app.core.settings import settings
+from app.jobs.stock_news.extractor.crawler.HtmlExtractor import SelectorExtractor, html_extraction_pool
+
+# 본문을 파싱할 수 있는 Content-Type (헤더가 없으면 일단 받아봄)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+def is_html_content_type(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return True
+    return content_type.split(";", 1)[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+@dataclass
+class CrawledPage:
+    url: str  # 리다이렉트를 따라간 최종 URL
+    content: str
+    bytes_read: int = 0  # 실제로 받은 바이트 (압축된 전송 크기 기준)
+    bytes_saved: int = 0  # Content-Length 대비 받지 않고 끊은 바이트 (길이를 알 때만)
+    stopped_early: bool = False  # 크기 한도 / 본문 끝 표시에서 읽기를 멈춤
+    rejected: bool = False  # HTML이 아니라서 본문을 받지 않음
+
 
 class BaseArticleCrawler(ABC):
-    def __init__(self, client: httpx.AsyncClient):
+    # 본문 셀렉터 (앞에서부터 시도, 사이트별 크롤러에서 지정) -> 클래스마다 한 번만 컴파일
+    selectors: tuple[str, ...] = ()
+    extractor: Optional[SelectorExtractor] = None
+    # 여기까지 읽으면 본문 영역이 끝난 것으로 보고 나머지는 받지 않음 (사이트별 크롤러에서 지정)
+    end_markers: tuple[bytes, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "selectors" in cls.__dict__:
+            cls.extractor = SelectorExtractor(cls.selectors)
+
+    def __init__(self, client: httpx.AsyncClient, max_bytes: int = settings.CRAWL_MAX_BYTES):
         self.client = client
+        self.max_bytes = max_bytes
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0 Safari/537.36"
         }
 
     async def fetch(self, url: str) -> str:
+        """본문 추출 (실패하면 빈 문자열)"""
         try:
-            # follow_redirects=True는 여기서 공통 처리
-            response = await self.client.get(url, headers=self.headers, follow_redirects=True, timeout=10.0)
-            response.raise_for_status()
-            return self.parse(response.text)
+            return (await self.crawl(url)).content
         except Exception as e:
             print(f"⚠️ [{self.__class__.__name__}] Error: {e}")
             return ""
 
-    @abstractmethod
+    async def crawl(self, url: str) -> CrawledPage:
+        """
+        본문 추출 (HTTP/네트워크 오류는 예외로 전달 -> 크롤 스케줄러가 도메인별 실패로 집계)
+        - 응답을 스트리밍으로 받으면서 헤더만 보고 HTML이 아니면(PDF, 동영상 등) 본문을 받지 않음
+        - max_bytes를 넘거나 end_markers가 나오면 나머지는 받지 않고 연결을 끊음
+        """
+        # follow_redirects=True는 여기서 공통 처리
+        async with self.client.stream("GET", url, headers=self.headers, follow_redirects=True,
+                                      timeout=10.0) as response:
+            response.raise_for_status()
+            final_url = str(response.url)
+            content_length = _content_length(response)
+
+            if not is_html_content_type(response.headers.get("Content-Type")):
+                return CrawledPage(url=final_url, content="", bytes_saved=content_length or 0, rejected=True)
+
+            html, stopped_early = await self._read_html(response)
+            bytes_read = response.num_bytes_downloaded
+
+        bytes_saved = max(0, content_length - bytes_read) if stopped_early and content_length else 0
+        # 파싱은 전용 스레드 풀에서 (이벤트 루프를 막지 않음)
+        content = await html_extraction_pool.run(self.parse, html)
+        return CrawledPage(url=final_url, content=content, bytes_read=bytes_read,
+                           bytes_saved=bytes_saved, stopped_early=stopped_early)
+
+    async def _read_html(self, response: httpx.Response) -> tuple[str, bool]:
+        """청크 단위로 디코딩하면서 읽음 (반환: HTML, 중간에 멈췄는지)"""
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        # 청크 경계에 걸친 표시도 찾을 수 있게 직전 청크의 끝부분을 붙여서 검사
+        overlap = max((len(marker) for marker in self.end_markers), default=1) - 1
+        parts, size, tail = [], 0, b""
+        stopped_early = False
+
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            parts.append(decoder.decode(chunk))
+            if size >= self.max_bytes:
+                stopped_early = True
+                break
+            if self.end_markers:
+                window = tail + chunk
+                if any(marker in window for marker in self.end_markers):
+                    stopped_early = True
+                    break
+                tail = window[-overlap:] if overlap else b""
+
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts), stopped_early
+
     def parse(self, html: str) -> str:
-        """각 사이트마다 다른 파싱 로직을 구현해야 함"""
-        pass
+        """selectors로 본문 추출 (셀렉터로 안 되는 사이트는 재정의, 파싱 스레드에서 실행됨)"""
+        if self.extractor is None:
+            raise NotImplementedError(f"{self.__class__.__name__}: selectors 또는 parse()를 지정해야 함")
+        return self.extractor.extract(html)
+
+
+def _content_length(response: httpx.Response) -> Optional[int]:
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
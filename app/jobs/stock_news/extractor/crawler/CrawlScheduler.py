@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.AsyncRateLimiter import TokenBucket
+from app.core.settings import settings
+from app.jobs.stock_news.extractor.crawler.BaseArticleCrawler import BaseArticleCrawler, CrawledPage
+
+logger = logging.getLogger("CrawlScheduler")
+
+# 크롤 결과
+CRAWL_OK = "ok"
+CRAWL_MISS = "miss"  # 받아오긴 했지만 본문 추출 실패 (페이월, 구조 변경 등) / 기사가 없어짐 (404, 410)
+CRAWL_ERROR = "error"  # HTTP 오류 / 타임아웃 / 네트워크 오류
+CRAWL_SKIPPED = "skipped"  # 서킷이 열려 있어 요청하지 않음
+
+# 기사가 삭제된 것으로 보는 응답 코드
+_GONE_STATUSES = (404, 410)
+
+# 서킷 브레이커 상태
+_CLOSED = "closed"
+_OPEN = "open"
+_HALF_OPEN = "half_open"
+
+
+@dataclass
+class CrawlOutcome:
+    status: str
+    content: str = ""
+    final_url: Optional[str] = None  # 리다이렉트를 따라간 최종 URL (받아온 경우만)
+
+
+def crawl_domain(url: str, source: Optional[str] = None) -> str:
+    """
+    크롤 단위(도메인) 키
+    - Finnhub 뉴스 URL은 finnhub.io 리다이렉트 링크라 호스트로는 언론사를 구분할 수 없음 -> source로 구분
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if (host == "finnhub.io" or host.endswith(".finnhub.io")) and source:
+        return f"source:{source.lower().replace(' ', '')}"
+    return host or "unknown"
+
+
+class _DomainState:
+    """도메인 하나의 동시 실행 수 / 호출 빈도 / 서킷 브레이커 / 통계"""
+
+    def __init__(self, name: str, max_concurrency: int, rate_per_minute: float, burst: float, window: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(f"crawl:{name}", rate=rate_per_minute / 60.0, capacity=burst)
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+
+        # 서킷 브레이커
+        self.outcomes: deque[str] = deque(maxlen=window)
+        self.state = _CLOSED
+        self.open_until = 0.0
+        self.cooldown = 0.0
+        self.probing = False
+
+        # 통계
+        self.requests = 0
+        self.ok = 0
+        self.misses = 0
+        self.errors = 0
+        self.short_circuited = 0
+        self.breaker_opens = 0
+        self.fetch_sec = 0.0
+        self.wait_sec = 0.0
+        self.bytes_read = 0
+        self.bytes_saved = 0
+        self.stopped_early = 0
+        self.rejected_content_type = 0
+
+    def get_stats(self) -> dict:
+        return {
+            "domain": self.name,
+            "state": self.state,
+            "open_for_sec": round(max(0.0, self.open_until - time.monotonic()), 1) if self.state == _OPEN else 0.0,
+            "in_flight": self.in_flight,
+            "waiting": sum(1 for future in self.waiters if not future.done()),
+            "requests": self.requests,
+            "ok": self.ok,
+            "misses": self.misses,
+            "errors": self.errors,
+            "short_circuited": self.short_circuited,
+            "breaker_opens": self.breaker_opens,
+            "fetch_sec": round(self.fetch_sec, 2),
+            "avg_fetch_ms": round(self.fetch_sec / self.requests * 1000, 1) if self.requests else 0.0,
+            "avg_wait_ms": round(self.wait_sec / self.requests * 1000, 1) if self.requests else 0.0,
+            "bytes_read": self.bytes_read,
+            "bytes_saved": self.bytes_saved,
+            "stopped_early": self.stopped_early,
+            "rejected_content_type": self.rejected_content_type
+        }
+
+
+class CrawlScheduler:
+    """
+    도메인 단위 기사 크롤 스케줄러
+    - 전체 동시 실행 수(max_concurrency) 안에서 도메인별 동시 실행 수 / 분당 요청 수 제한
+    - 슬롯이 비면 대기 중인 도메인을 라운드 로빈으로 돌아가며 배정 (느린 도메인 하나가 슬롯을 독차지하지 않음)
+    - 최근 window건 중 실패(오류 + 본문 추출 실패) 비율이 높은 도메인은 서킷을 열어 cooldown 동안 바로 건너뜀
+      cooldown이 지나면 1건만 시험 삼아 보내고(half-open), 성공하면 닫고 실패하면 cooldown을 두 배로 늘려 다시 엶
+    """
+
+    def __init__(self, max_concurrency: int = settings.CRAWL_MAX_CONCURRENCY,
+                 per_host_concurrency: int = settings.CRAWL_PER_HOST_CONCURRENCY,
+                 per_host_rate_per_minute: float = settings.CRAWL_PER_HOST_RATE_PER_MINUTE,
+                 per_host_burst: float = settings.CRAWL_PER_HOST_BURST,
+                 breaker_window: int = settings.CRAWL_BREAKER_WINDOW,
+                 breaker_min_samples: int = settings.CRAWL_BREAKER_MIN_SAMPLES,
+                 breaker_failure_ratio: float = settings.CRAWL_BREAKER_FAILURE_RATIO,
+                 breaker_cooldown: float = settings.CRAWL_BREAKER_COOLDOWN_SECONDS,
+                 breaker_max_cooldown: float = settings.CRAWL_BREAKER_MAX_COOLDOWN_SECONDS,
+                 min_content_length: int = 50):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate_per_minute = per_host_rate_per_minute
+        self.per_host_burst = per_host_burst
+        self.breaker_window = breaker_window
+        self.breaker_min_samples = breaker_min_samples
+        self.breaker_failure_ratio = breaker_failure_ratio
+        self.breaker_cooldown = breaker_cooldown
+        self.breaker_max_cooldown = breaker_max_cooldown
+        self.min_content_length = min_content_length
+
+        self._domains: dict[str, _DomainState] = {}
+        self._ready: deque[_DomainState] = deque()  # 대기자가 있는 도메인 (라운드 로빈 순서)
+        self._in_flight = 0
+
+    async def fetch(self, crawler: BaseArticleCrawler, url: str, source: Optional[str] = None) -> CrawlOutcome:
+        """
+        도메인 예산 안에서 본문을 가져옴
+        반환: 결과 상태 + 본문 (실패 / 서킷 열림이면 빈 문자열) + 최종 URL
+        """
+        domain = self._domain(crawl_domain(url, source))
+        if not self._allow(domain):
+            domain.short_circuited += 1
+            return CrawlOutcome(CRAWL_SKIPPED)
+        is_probe = domain.state == _HALF_OPEN
+
+        started = time.monotonic()
+        try:
+            await domain.bucket.acquire()
+            await self._acquire_slot(domain)
+        except BaseException:
+            if is_probe:
+                domain.probing = False
+            raise
+        fetch_started = time.monotonic()
+        domain.wait_sec += fetch_started - started
+
+        if domain.state == _OPEN and not is_probe:
+            # 기다리는 동안 서킷이 열렸음 -> 보내지 않고 슬롯 반납
+            self._release_slot(domain)
+            domain.short_circuited += 1
+            return CrawlOutcome(CRAWL_SKIPPED)
+        domain.requests += 1
+
+        outcome = CrawlOutcome(CRAWL_ERROR)
+        try:
+            page = await crawler.crawl(url)
+            self._record_transfer(domain, page)
+            is_valid = page.content and len(page.content.strip()) >= self.min_content_length
+            outcome = CrawlOutcome(CRAWL_OK if is_valid else CRAWL_MISS, page.content or "", page.url)
+        except asyncio.CancelledError:
+            if is_probe:
+                domain.probing = False
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"⚠️ 크롤링 실패 ({domain.name}): {url} -> {e.response.status_code}")
+            if e.response.status_code in _GONE_STATUSES:
+                # 다시 시도해도 받을 수 없는 기사 -> 본문 추출 실패와 같게 취급
+                outcome = CrawlOutcome(CRAWL_MISS, "", str(e.response.url))
+        except Exception as e:
+            logger.warning(f"⚠️ 크롤링 실패 ({domain.name}): {url} -> {e}")
+        finally:
+            domain.fetch_sec += time.monotonic() - fetch_started
+            self._release_slot(domain)
+
+        self._record(domain, outcome.status, is_probe)
+        return outcome
+
+    def get_stats(self) -> dict:
+        domains = sorted(self._domains.values(), key=lambda domain: domain.fetch_sec, reverse=True)
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "open_circuits": [domain.name for domain in domains if domain.state == _OPEN],
+            "bytes_read": sum(domain.bytes_read for domain in domains),
+            "bytes_saved": sum(domain.bytes_saved for domain in domains),
+            "domains": [domain.get_stats() for domain in domains]
+        }
+
+    @staticmethod
+    def _record_transfer(domain: _DomainState, page: CrawledPage):
+        domain.bytes_read += page.bytes_read
+        domain.bytes_saved += page.bytes_saved
+        domain.stopped_early += page.stopped_early
+        domain.rejected_content_type += page.rejected
+
+    # --- 슬롯 배정 (도메인별 FIFO + 도메인 간 라운드 로빈) ---
+
+    def _domain(self, name: str) -> _DomainState:
+        domain = self._domains.get(name)
+        if domain is None:
+            domain = _DomainState(name, self.per_host_concurrency, self.per_host_rate_per_minute,
+                                  self.per_host_burst, self.breaker_window)
+            self._domains[name] = domain
+        return domain
+
+    async def _acquire_slot(self, domain: _DomainState):
+        if not domain.waiters and not self._ready and self._has_capacity(domain):
+            self._start(domain)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        domain.waiters.append(future)
+        if domain not in self._ready:
+            self._ready.append(domain)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소된 경우 -> 슬롯 반납
+                self._release_slot(domain)
+            raise
+
+    def _release_slot(self, domain: _DomainState):
+        domain.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _has_capacity(self, domain: _DomainState) -> bool:
+        return self._in_flight < self.max_concurrency and domain.in_flight < domain.max_concurrency
+
+    def _start(self, domain: _DomainState):
+        domain.in_flight += 1
+        self._in_flight += 1
+
+    def _dispatch(self):
+        """빈 슬롯을 대기 중인 도메인에 한 건씩 돌아가며 배정"""
+        idle_rounds = 0
+        while self._ready and self._in_flight < self.max_concurrency and idle_rounds < len(self._ready):
+            domain = self._ready.popleft()
+            while domain.waiters and domain.waiters[0].done():
+                domain.waiters.popleft()
+            if not domain.waiters:
+                idle_rounds = 0
+                continue
+
+            if domain.in_flight < domain.max_concurrency:
+                self._start(domain)
+                domain.waiters.popleft().set_result(None)
+                idle_rounds = 0
+            else:
+                # 도메인 한도가 찼음 -> 다음 도메인으로
+                idle_rounds += 1
+
+            if domain.waiters:
+                self._ready.append(domain)
+
+    # --- 서킷 브레이커 ---
+
+    def _allow(self, domain: _DomainState) -> bool:
+        if domain.state == _CLOSED:
+            return True
+        if domain.state == _OPEN:
+            if time.monotonic() < domain.open_until:
+                return False
+            domain.state = _HALF_OPEN
+        # half-open: 시험 요청 1건만 허용
+        if domain.probing:
+            return False
+        domain.probing = True
+        return True
+
+    def _record(self, domain: _DomainState, outcome: str, is_probe: bool):
+        if outcome == CRAWL_OK:
+            domain.ok += 1
+        elif outcome == CRAWL_MISS:
+            domain.misses += 1
+        else:
+            domain.errors += 1
+
+        if is_probe:
+            domain.probing = False
+            if outcome == CRAWL_OK:
+                logger.info(f"✅ 서킷 닫힘: {domain.name}")
+                domain.state = _CLOSED
+                domain.cooldown = 0.0
+                domain.outcomes.clear()
+            else:
+                self._open(domain)
+            return
+
+        domain.outcomes.append(outcome)
+        if domain.state == _CLOSED and len(domain.outcomes) >= self.breaker_min_samples:
+            failures = sum(1 for recent in domain.outcomes if recent != CRAWL_OK)
+            if failures / len(domain.outcomes) >= self.breaker_failure_ratio:
+                self._open(domain)
+
+    def _open(self, domain: _DomainState):
+        domain.cooldown = min(self.breaker_max_cooldown, domain.cooldown * 2 or self.breaker_cooldown)
+        domain.state = _OPEN
+        domain.open_until = time.monotonic() + domain.cooldown
+        domain.breaker_opens += 1
+        logger.warning(f"🚧 서킷 열림: {domain.name} ({domain.cooldown:.0f}초 동안 크롤링 건너뜀)")
@@ -1,56 +1,32 @@
-from bs4 import BeautifulSoup
-
 from app.jobs.stock_news.extractor.crawler.BaseArticleCrawler import BaseArticleCrawler
 from app.services.http_client import get_http_client
 
 
 class YahooCrawler(BaseArticleCrawler):
-    def parse(self, html: str) -> str:
-        soup = BeautifulSoup(html, 'html.parser')
-        selectors = [
-            "div.bodyItems-wrapper p",
-            "div.article-body p",
-            "div.atoms-wrapper p"
-        ]
-
-        for selector in selectors:
-            nodes = soup.select(selector)
-            if nodes:
-                return ' '.join([p.get_text().strip() for p in nodes])
-        return ""
+    # 기사 페이지 아래에 관련 기사들이 이어 붙음 -> 첫 기사가 끝나면 그만 읽음
+    end_markers = (b"</article>",)
+    selectors = (
+        "div.bodyItems-wrapper p",
+        "div.article-body p",
+        "div.atoms-wrapper p"
+    )
 
 class CNBCCrawler(BaseArticleCrawler):
-    def parse(self, html: str) -> str:
-        # SeekingAlpha 전용 파싱 로직
-        soup = BeautifulSoup(html, 'html.parser')
-        selectors = [
-            "div.group p",
-            "div.atoms-wrapper p"
-        ]
-
-        for selector in selectors:
-            nodes = soup.select(selector)
-            if nodes:
-                return ' '.join([p.get_text().strip() for p in nodes])
-        return ""
+    # SeekingAlpha 전용 파싱 로직
+    selectors = (
+        "div.group p",
+        "div.atoms-wrapper p"
+    )
 
 class DefaultCrawler(BaseArticleCrawler):
-    def parse(self, html: str) -> str:
-        # 기본 파싱 로직
-        soup = BeautifulSoup(html, 'html.parser')
-        selectors = [
-            "div.atoms-wrapper p",
-            "div.article-body p",
-            "div.article-content p",
-            "section.article-body p",
-            "div#article-view-content p"
-        ]
-
-        for selector in selectors:
-            nodes = soup.select(selector)
-            if nodes:
-                return ' '.join([p.get_text().strip() for p in nodes])
-        return ""
+    # 기본 파싱 로직
+    selectors = (
+        "div.atoms-wrapper p",
+        "div.article-body p",
+        "div.article-content p",
+        "section.article-body p",
+        "div#article-view-content p"
+    )
 
 # 테스트 코드
 # import asyncio
@@ -0,0 +1,159 @@
+import asyncio
+import importlib.util
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.core.settings import settings
+
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+
+# 기본은 기존 크롤러와 같은 html.parser
+# lxml(C 구현)이 더 빠르지만 잘못된 마크업(<p> 안의 <div> 등)을 다르게 고쳐서 본문 일부가 빠질 수 있음
+# -> extraction_benchmark로 실제 기사 코퍼스에서 차이를 확인한 뒤 HTML_PARSER=lxml로 전환
+HTML_PARSER = settings.HTML_PARSER if settings.HTML_PARSER != "lxml" or LXML_AVAILABLE else "html.parser"
+
+# 셀렉터 맨 앞 요소 (태그명 + .class / #id)
+_ROOT = re.compile(r"^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)(?=[\s>]|$)")
+
+
+def _selector_root(selector: str) -> Optional[tuple[Optional[str], list[str], list[str]]]:
+    """셀렉터 맨 앞 요소의 (태그명, class 목록, id 목록) / 형제 결합자나 쉼표가 있으면 None"""
+    selector = selector.strip()
+    if not selector or any(char in selector for char in ",+~"):
+        return None
+    match = _ROOT.match(selector)
+    if match is None or not match.group(0):
+        return None
+    qualifiers = re.findall(r"([.#])([\w-]+)", match.group(2))
+    classes = [value for kind, value in qualifiers if kind == "."]
+    ids = [value for kind, value in qualifiers if kind == "#"]
+    return match.group(1), classes, ids
+
+
+def _any_token_in(values: set[str]) -> Callable[[object], bool]:
+    """
+    속성값의 토큰 중 하나라도 values에 있으면 True
+    - 파싱 중에는 bs4 버전에 따라 "caas-body bodyItems-wrapper" 같은 원본 문자열이 그대로 오기도 하고
+      토큰 하나씩 오기도 함 -> 공백으로 나눠서 비교 (문자열 그대로 집합과 비교하면 class가 여러 개인 요소를 놓침)
+    """
+    def match(value) -> bool:
+        if value is None:
+            return False
+        tokens = value if isinstance(value, (list, tuple)) else str(value).split()
+        return any(token in values for token in tokens)
+    return match
+
+
+def build_strainer(selectors: Sequence[str]) -> Optional[SoupStrainer]:
+    """
+    셀렉터들의 맨 앞 요소만 남기는 SoupStrainer (그 아래 하위 트리는 통째로 유지)
+    - 모든 셀렉터가 class로 시작하면 class로, id로 시작하면 id로 거름 (없으면 태그명으로)
+    - 셀렉터가 보는 영역보다 넓게 남기기만 하므로 같은 파서라면 추출 결과는 전체 트리와 같음
+      (lxml은 잘못된 마크업을 html.parser와 다르게 고치므로 파서를 바꾸면 결과가 달라질 수 있음)
+    - 거를 수 없는 셀렉터가 있으면 None (전체 트리 생성)
+    """
+    roots = [_selector_root(selector) for selector in selectors]
+    if not roots or any(root is None for root in roots):
+        return None
+
+    names = sorted({name for name, _, _ in roots if name})
+    names = names if all(name for name, _, _ in roots) else None
+    if all(classes for _, classes, _ in roots):
+        classes = {cls for _, root_classes, _ in roots for cls in root_classes}
+        return SoupStrainer(names, attrs={"class": _any_token_in(classes)})
+    if all(ids for _, _, ids in roots):
+        return SoupStrainer(names, attrs={"id": _any_token_in({i for _, _, ids in roots for i in ids})})
+    if names:
+        return SoupStrainer(names)
+    return None
+
+
+class SelectorExtractor:
+    """
+    CSS 셀렉터 목록으로 기사 본문 추출 (크롤러마다 한 번만 생성)
+    - 셀렉터는 생성 시 한 번만 컴파일 (soupsieve)
+    - 셀렉터가 보는 하위 트리만 파싱해서 남김 (SoupStrainer)
+    - 앞의 셀렉터부터 시도해서 처음으로 찾은 노드들의 텍스트를 이어 붙임
+    """
+
+    def __init__(self, selectors: Sequence[str], parser: str = HTML_PARSER):
+        self.selectors = tuple(selectors)
+        self.parser = parser
+        self.patterns = [soupsieve.compile(selector) for selector in self.selectors]
+        self.strainer = build_strainer(self.selectors)
+
+    def extract(self, html: str) -> str:
+        soup = BeautifulSoup(html, self.parser, parse_only=self.strainer)
+        for pattern in self.patterns:
+            nodes = pattern.select(soup)
+            if nodes:
+                return ' '.join([p.get_text().strip() for p in nodes])
+        return ""
+
+
+def _timed(func: Callable[[str], str], html: str) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = func(html)
+    return time.perf_counter() - started, result
+
+
+class ExtractionPool:
+    """
+    HTML 파싱 전용 스레드 풀 (CPU 작업이 FastAPI와 같은 이벤트 루프를 막지 않게)
+    - 워커 수를 제한해서 크롤링이 몰려도 파싱 스레드가 늘어나지 않음
+    - asyncio 기본 executor(파일/SQLite I/O)와 분리
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # 통계
+        self.in_flight = 0
+        self.documents = 0
+        self.failures = 0
+        self.parse_sec = 0.0
+        self.max_parse_sec = 0.0
+
+    async def run(self, func: Callable[[str], str], html: str) -> str:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="html-extract")
+
+        self.in_flight += 1
+        try:
+            elapsed, result = await asyncio.get_running_loop().run_in_executor(self._executor, _timed, func, html)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.documents += 1
+        self.parse_sec += elapsed
+        self.max_parse_sec = max(self.max_parse_sec, elapsed)
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "parser": HTML_PARSER,
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "documents": self.documents,
+            "failures": self.failures,
+            "avg_parse_ms": round(self.parse_sec / self.documents * 1000, 1) if self.documents else 0.0,
+            "max_parse_ms": round(self.max_parse_sec * 1000, 1)
+        }
+
+
+# 앱 전체에서 공유 (모든 크롤러)
+html_extraction_pool = ExtractionPool(max_workers=settings.HTML_PARSE_WORKERS)
@@ -0,0 +1,162 @@
+"""
+기사 본문 추출 방식별 처리량(docs/sec) 비교
+
+    python -m app.jobs.stock_news.extractor.crawler.extraction_benchmark --corpus saved_articles/
+    python -m app.jobs.stock_news.extractor.crawler.extraction_benchmark --docs 200
+
+- legacy: 기존 방식 (html.parser로 전체 트리 생성 -> 셀렉터 문자열로 soup.select)
+- strained/html.parser: 컴파일된 셀렉터 + SoupStrainer, 기본 파서
+- strained/lxml: 컴파일된 셀렉터 + SoupStrainer, lxml 파서 (설치된 경우)
+크롤러(yahoo / cnbc / default)마다 코퍼스 전체를 돌리고, 기존 방식과 결과가 다른 문서 수와 예시를 함께 출력
+(합성 데이터에는 class가 여러 개인 본문 영역과 잘못된 마크업(<p> 안의 <div>)이 섞여 있음
+ -> lxml은 이런 마크업을 html.parser와 다르게 고치므로 결과가 달라지는 문서가 나옴)
+마지막으로 추출을 이벤트 루프에서 직접 할 때와 파싱 풀에서 할 때의 최대 루프 지연을 비교
+"""
+import argparse
+import asyncio
+import glob
+import os
+import random
+import time
+
+from bs4 import BeautifulSoup
+
+from app.jobs.stock_news.extractor.crawler.Crawlers import CNBCCrawler, DefaultCrawler, YahooCrawler
+from app.jobs.stock_news.extractor.crawler.HtmlExtractor import (
+    HTML_PARSER, LXML_AVAILABLE, ExtractionPool, SelectorExtractor
+)
+
+CRAWLERS = {"yahoo": YahooCrawler, "cnbc": CNBCCrawler, "default": DefaultCrawler}
+_WORDS = "market shares revenue quarter analyst growth earnings stock investors guidance rate".split()
+
+
+def legacy_extract(html: str, selectors) -> str:
+    """기존 크롤러들의 parse()와 같은 방식"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in selectors:
+        nodes = soup.select(selector)
+        if nodes:
+            return ' '.join([p.get_text().strip() for p in nodes])
+    return ""
+
+
+def _make_page(rng: random.Random, body_class: str) -> str:
+    """
+    뉴스 기사 페이지와 비슷한 모양의 합성 HTML (헤더/내비/스크립트/관련 기사 + 본문)
+    - 실제 페이지처럼 본문 영역에 class가 여러 개 붙은 경우가 많고, 일부는 <p> 안에 <div>가 들어간 잘못된 마크업
+    """
+    def sentence():
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+
+    if rng.random() < 0.6:
+        body_class = f"caas-body {body_class} {rng.choice(['clearfix', 'body-wrap', 'Fz(15px)'])}"
+    nav = "".join(f'<li><a href="/n/{i}">{rng.choice(_WORDS)}</a></li>' for i in range(80))
+    script = "<script>var data = {" + ",".join(f'"k{i}": {i}' for i in range(300)) + "};</script>"
+    body = "".join(f"<p>{sentence()} {sentence()}</p>" for _ in range(rng.randint(8, 30)))
+    if rng.random() < 0.2:
+        body += f"<p>{sentence()} <div>{sentence()}</div> {sentence()}</p>"
+    related = "".join(
+        f'<div class="card"><h3>{sentence()}</h3><p>{sentence()}</p><img src="/i/{i}.jpg"></div>'
+        for i in range(40)
+    )
+    return (
+        f"<html><head><title>{sentence()}</title>{script}</head><body>"
+        f'<header><nav><ul>{nav}</ul></nav></header>'
+        f'<main><article><div class="{body_class}">{body}</div></article>'
+        f'<aside>{related}</aside></main><footer>{nav}</footer></body></html>'
+    )
+
+
+def _load_corpus(corpus: str, docs: int) -> list[str]:
+    if corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(corpus, "**", "*.htm*"), recursive=True)):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+        return pages
+
+    rng = random.Random(42)
+    classes = ["bodyItems-wrapper", "article-body", "atoms-wrapper", "group", "article-content"]
+    return [_make_page(rng, rng.choice(classes)) for _ in range(docs)]
+
+
+def _first_diff(want: str, got: str, width: int = 40) -> str:
+    """두 결과가 처음 달라지는 위치 주변 (기존 / 새 방식)"""
+    at = next((i for i, (a, b) in enumerate(zip(want, got)) if a != b), min(len(want), len(got)))
+    start = max(0, at - 10)
+    return f"{want[start:start + width]!r} / 새 방식 ...{got[start:start + width]!r}"
+
+
+def _throughput(func, pages: list[str]) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    results = [func(html) for html in pages]
+    return len(pages) / (time.perf_counter() - started), results
+
+
+async def _max_loop_lag(pages: list[str], extract, pool: ExtractionPool = None) -> float:
+    """추출을 돌리는 동안 이벤트 루프가 가장 오래 멈춘 시간 (초)"""
+    lag, running = 0.0, True
+
+    async def heartbeat():
+        nonlocal lag
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - started - 0.001)
+
+    async def inline(html):
+        await asyncio.sleep(0)
+        return extract(html)
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    if pool is None:
+        await asyncio.gather(*(inline(html) for html in pages))
+    else:
+        await asyncio.gather(*(pool.run(extract, html) for html in pages))
+    running = False
+    await ticker
+    return lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 본문 추출 처리량 비교")
+    parser.add_argument("--corpus", help="저장해 둔 기사 HTML 디렉터리 (*.html, 없으면 합성 데이터)")
+    parser.add_argument("--docs", type=int, default=200, help="합성 문서 수")
+    parser.add_argument("--workers", type=int, default=2, help="파싱 풀 워커 수")
+    parser.add_argument("--show-diffs", type=int, default=3, help="결과가 다른 문서 예시 수 (크롤러/파서별)")
+    args = parser.parse_args()
+
+    pages = _load_corpus(args.corpus, args.docs)
+    if not pages:
+        raise SystemExit(f"❌ HTML 파일이 없습니다: {args.corpus}")
+    total_mb = sum(len(html) for html in pages) / 1024 / 1024
+    print(f"📦 문서 {len(pages)}개 ({total_mb:.1f}MB), 현재 설정된 파서: {HTML_PARSER}")
+
+    parsers = ["html.parser"] + (["lxml"] if LXML_AVAILABLE else [])
+    for name, crawler in CRAWLERS.items():
+        legacy_rate, expected = _throughput(lambda html: legacy_extract(html, crawler.selectors), pages)
+        print(f"📊 {name:<8} {'legacy':<20} | {legacy_rate:8.1f} docs/sec")
+
+        for backend in parsers:
+            extractor = SelectorExtractor(crawler.selectors, parser=backend)
+            rate, results = _throughput(extractor.extract, pages)
+            diffs = [i for i, (got, want) in enumerate(zip(results, expected)) if got != want]
+            print(f"📊 {name:<8} {'strained/' + backend:<20} | {rate:8.1f} docs/sec | x{rate / legacy_rate:4.1f}"
+                  f" | 기존과 다른 결과 {len(diffs)}/{len(pages)}")
+            for i in diffs[:args.show_diffs]:
+                print(f"   ↳ #{i}: 기존 {len(expected[i])}자 / 새 방식 {len(results[i])}자"
+                      f" | 기존 ...{_first_diff(expected[i], results[i])}")
+
+    extractor = DefaultCrawler.extractor
+    inline_lag = asyncio.run(_max_loop_lag(pages, extractor.extract))
+    pool = ExtractionPool(max_workers=args.workers)
+    try:
+        pool_lag = asyncio.run(_max_loop_lag(pages, extractor.extract, pool))
+    finally:
+        pool.shutdown()
+    print(f"⏱️ 최대 루프 지연: 루프에서 직접 {inline_lag * 1000:.1f}ms / 파싱 풀 {pool_lag * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,22 @@
 import asyncio
-import httpx
+import time
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 
+from app.jobs.stock_news.extractor.crawler.ArticleCache import article_cache
 from app.jobs.stock_news.extractor.crawler.CrawlerFactory import CrawlerFactory
+from app.jobs.stock_news.extractor.crawler.CrawlScheduler import CrawlScheduler
+from app.jobs.stock_news.extractor.crawler.HtmlExtractor import html_extraction_pool
 from app.jobs.stock_news.collector.FinnhubNewsCollector import FinnhubNewsCollector
 from app.schemas.stockNews import StockNews
 from app.jobs.stock_news.services.news_service import NewsService
 from .worker import NewsBatchWorker
 from ..analyzer.QuickNewsAnalyzer import QuickNewsAnalyzer
-from app.db.repositories.StockNewsRepository import news_repo
+from app.db.repositories.StockNewsRepository import news_repo, news_date_utc
+from app.db.write_buffer import BatchWriteBuffer
+from app.services.http_client import http_clients
+from .seen_index import SeenNewsIndex
+from .watermark import NewsWatermarkTracker
 
 
 # Analyzer 클래스 임포트 (작성하신 파일 경로에 맞게 수정)
@@ -18,22 +25,41 @@ from app.db.repositories.StockNewsRepository import news_repo
 class PipelineManager:
     def __init__(self, analyzer: QuickNewsAnalyzer):
         self.queue = asyncio.Queue()
-        self.client = None
+        self.client = None  # Finnhub API용 공유 풀
+        self.article_client = None  # 기사 원문 크롤링용 공유 풀
         self.workers = []
         self.analyzer = analyzer
+        # 모든 워커가 공유하는 write-behind 버퍼 (25개 단위로 모아서 저장)
+        self.write_buffer = BatchWriteBuffer(news_repo.table_name)
+        # 이미 분석/저장된 뉴스는 큐에 넣지 않기 위한 인덱스
+        self.seen_index = SeenNewsIndex(news_repo)
+        # 종목별 수집 워터마크 (이미 수집한 구간은 다시 요청/변환하지 않음)
+        self.watermarks = NewsWatermarkTracker(news_repo)
+        # 기사 원문 크롤링 스케줄러 (도메인별 한도 + 서킷 브레이커, 워커 전체 공유)
+        self.crawl_scheduler = CrawlScheduler()
+        # 마지막 다중 종목 수집 결과 (종목별 요약)
+        self.last_ingest_summary = None
 
     async def start(self, worker_count=3):
-        """파이프라인 가동 (HTTP Client 생성 & 워커 실행)"""
-        # 1. 커넥션 풀 생성
-        self.client = httpx.AsyncClient(timeout=10.0)
+        """파이프라인 가동 (공유 HTTP 풀 연결 & 워커 실행)"""
+        # 1. 커넥션 풀은 lifespan이 소유한 레지스트리에서 업스트림별로 받아 씀
+        await http_clients.start()
+        self.client = http_clients.get("finnhub")
+        self.article_client = http_clients.get("articles")
 
-        # 2. 크롤러 팩토리 생성 (client 공유)
-        crawler_factory = CrawlerFactory(self.client)
+        # 2. 크롤러 팩토리 생성 (기사 사이트용 풀 공유)
+        crawler_factory = CrawlerFactory(self.article_client)
+
+        await self.write_buffer.start()
 
         news_service = NewsService(
             crawler_factory=crawler_factory,
             analyzer=self.analyzer,
-            news_repo=news_repo
+            news_repo=news_repo,
+            crawl_scheduler=self.crawl_scheduler,
+            write_buffer=self.write_buffer,
+            seen_index=self.seen_index,
+            watermarks=self.watermarks
         )
 
         # 3. 워커 생성 및 배치
@@ -52,23 +78,50 @@ class PipelineManager:
 
     async def stop(self):
         """시스템 종료 처리"""
-        if self.client:
-            await self.client.aclose()
         for task in self.workers:
             task.cancel()
+        # 버퍼에 남아있는 뉴스를 모두 저장한 뒤 종료
+        # (HTTP 풀은 레지스트리 소유라 여기서 닫지 않음)
+        await self.write_buffer.stop()
+        await article_cache.close()
+        html_extraction_pool.shutdown()
         print("🛑 파이프라인 종료")
 
-    async def ingest_news(self, symbol: str, start_date: str, end_date: str):
+    async def ingest_news(self, symbol: str, start_date: str, end_date: str, use_watermark: bool = True) -> dict:
+        """
+        한 종목의 뉴스를 수집해서 처음 보는 뉴스만 큐에 넣습니다.
+        - use_watermark: 워터마크(저장까지 끝난 가장 최신 뉴스)가 있으면 그 날짜부터만 요청하고
+          워터마크 이하 뉴스는 변환 전에 버림 (기간을 직접 지정한 백필 요청은 False)
+        반환: {"symbol", "window", "fetched", "below_watermark", "enqueued", "skipped", "failed", "error"}
+        """
         collector = FinnhubNewsCollector(self.client)
+        summary = {"symbol": symbol, "window": None, "fetched": 0, "below_watermark": 0,
+                   "enqueued": 0, "skipped": 0, "failed": 0, "error": None}
+
+        watermark = await self.watermarks.get(symbol) if use_watermark else None
+        if watermark is not None:
+            # Finnhub는 날짜 단위로만 조회 가능 -> 워터마크가 있는 날부터 요청 (같은 날 이전 뉴스는 아래에서 버림)
+            start_date = min(max(start_date, news_date_utc(watermark[0])), end_date)
+        summary["window"] = f"{start_date} ~ {end_date}"
 
-        print(f"📥 뉴스 수집 시작: {symbol}...")
-        raw_news_list = await collector.fetch_stock_news(symbol, start_date, end_date)
+        print(f"📥 뉴스 수집 시작: {symbol} ({summary['window']})...")
+        try:
+            raw_news_list = await collector.fetch_stock_news(symbol, start_date, end_date, raise_on_error=True)
+        except Exception as e:
+            summary["error"] = str(e)
+            return summary
 
-        count = 0
+        summary["fetched"] = len(raw_news_list)
+
+        if watermark is not None:
+            raw_news_list = [raw for raw in raw_news_list if self._is_after(raw, watermark)]
+            summary["below_watermark"] = summary["fetched"] - len(raw_news_list)
+
+        news_items = []
         for raw_data in raw_news_list:
             try:
                 # 딕셔너리 -> DTO 변환
-                news_item = StockNews(
+                news_items.append(StockNews(
                     id=raw_data['id'],
                     symbol=symbol,  # Finnhub는 symbol을 안 줄 때가 있어서 직접 주입
                     headline=raw_data['headline'],
@@ -77,32 +130,75 @@ class PipelineManager:
                     image=raw_data['image'],
                     source=raw_data['source'],
                     summary=raw_data['summary']
-                )
-
-                # 큐에 투입
-                self.queue.put_nowait(news_item)
-                count += 1
+                ))
             except Exception as e:
+                summary["failed"] += 1
                 print(f"⚠️ 데이터 변환 실패: {e}")
 
-        print(f"✅ 큐 적재 완료: {count}건")
+        # 이미 분석된 뉴스는 크롤링/LLM 단계로 보내지 않음
+        unseen_items, deferred_items = await self.seen_index.filter_unseen(news_items)
+
+        # 이번 수집분 등록 (큐에 넣은 뉴스가 모두 처리되면 워터마크가 올라감)
+        # 저장 여부를 확인하지 못한 뉴스가 있으면 워터마크를 올리지 않음 -> 다음 수집 때 같은 구간을 다시 확인
+        await self.watermarks.begin(symbol, news_items, unseen_items, deferred=bool(deferred_items))
+
+        # 큐에 투입
+        for news_item in unseen_items:
+            self.queue.put_nowait(news_item)
+
+        summary["enqueued"] = len(unseen_items)
+        summary["skipped"] = len(news_items) - len(unseen_items)
+        print(f"✅ 큐 적재 완료: {len(unseen_items)}건 (이미 처리된 뉴스 {len(news_items) - len(unseen_items)}건 제외)")
+        return summary
 
     # 다중 종목 수집 메서드
-    async def ingest_all_stocks_news(self, symbols: list[str], start_date: str, end_date: str):
+    async def ingest_all_stocks_news(self, symbols: list[str], start_date: str, end_date: str,
+                                     max_concurrency: int = 20, use_watermark: bool = True) -> dict:
         """
-        여러 종목 리스트를 받아서 순차적으로 수집을 요청합니다.
+        여러 종목의 뉴스를 동시에 수집합니다.
+        - 호출 빈도는 collector의 공용 Finnhub 토큰 버킷이 제한 (여기서는 동시 요청 수만 제한)
+        - 응답이 오는 대로 바로 큐에 넣으므로 워커가 기다리지 않음
+        반환: 종목별 요약 + 합계 + 전체 소요 시간
         """
+        symbols = list(dict.fromkeys(symbols))
         print(f"🚀 총 {len(symbols)}개 종목 수집을 시작합니다.")
 
-        for symbol in symbols:
-            # 1. 기존 ingest_news 재활용
-            await self.ingest_news(symbol, start_date, end_date)
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def ingest(symbol: str) -> dict:
+            async with semaphore:
+                try:
+                    return await self.ingest_news(symbol, start_date, end_date, use_watermark=use_watermark)
+                except Exception as e:
+                    return {"symbol": symbol, "window": None, "fetched": 0, "below_watermark": 0,
+                            "enqueued": 0, "skipped": 0, "failed": 0, "error": str(e)}
+
+        summaries = await asyncio.gather(*(ingest(symbol) for symbol in symbols))
+
+        totals = {
+            key: sum(summary[key] for summary in summaries)
+            for key in ("fetched", "below_watermark", "enqueued", "skipped", "failed")
+        }
+        totals["symbols_failed"] = sum(1 for summary in summaries if summary["error"])
+
+        result = {
+            "symbols": summaries,
+            "totals": totals,
+            "wall_time_sec": round(time.monotonic() - started, 2)
+        }
+        self.last_ingest_summary = result
 
-            # 2. [Rate Limit 방어] Finnhub 분당 60회 제한 고려
-            # 너무 빨리 요청하면 429 에러 뜨니까, 종목 사이에 숨 고르기
-            await asyncio.sleep(1.0)
+        print(f"🎉 모든 종목의 수집 요청이 큐에 등록되었습니다. {totals} ({result['wall_time_sec']}초)")
+        return result
 
-        print("🎉 모든 종목의 수집 요청이 큐에 등록되었습니다.")
+    @staticmethod
+    def _is_after(raw_data: dict, watermark: tuple[int, int]) -> bool:
+        """Finnhub 원본 뉴스가 워터마크 (datetime, id)보다 최신인지"""
+        try:
+            return (int(raw_data['datetime']), int(raw_data['id'])) > watermark
+        except (KeyError, TypeError, ValueError):
+            return True  # 판단할 수 없으면 일단 통과 (변환 단계에서 걸러짐)
 
 
 # 테스트용 메인 함수
@@ -125,6 +221,7 @@ async def main():
     finally:
         # 5. 정리 (Client 닫기 등)
         await manager.stop()
+        await http_clients.stop()
 
 
 if __name__ == "__main__":
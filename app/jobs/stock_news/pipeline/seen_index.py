@@ -0,0 +1,102 @@
+import logging
+from collections import OrderedDict
+
+from app.db.repositories.StockNewsRepository import NewsRepository
+from app.schemas.stockNews import StockNews
+
+logger = logging.getLogger("SeenNewsIndex")
+
+
+class SeenNewsIndex:
+    """
+    이미 분석/저장된 뉴스를 기억해서 크롤링 -> LLM 단계에 다시 들어가지 않게 하는 인덱스
+    - 1차: 메모리 해시셋 (symbol, id) 확인
+    - 2차: 메모리에 없으면 STOCK#{symbol} / NEWS#{datetime}#{id} 키로 DB에 일괄 존재 확인 (batch_get)
+    - 큐에 들어갔지만 아직 처리 중인 뉴스도 기억 -> 겹치는 수집 요청이 같은 뉴스를 중복 투입하지 않음
+    - DB 확인이 throttling으로 끝나지 않은 뉴스는 이번 회차에서만 건너뜀 (기억하지 않음 -> 다음 수집 때 다시 확인)
+    """
+
+    def __init__(self, news_repo: NewsRepository, max_entries: int = 200_000):
+        self.news_repo = news_repo
+        self.max_entries = max_entries
+
+        self._seen: OrderedDict[tuple, None] = OrderedDict()  # 오래된 것부터 밀어냄
+        self._in_flight: set[tuple] = set()
+
+        # 통계
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.deferred = 0
+
+    async def filter_unseen(self, news_list: list[StockNews]) -> tuple[list[StockNews], list[StockNews]]:
+        """
+        처음 보는 뉴스만 남겨서 반환합니다. 반환된 뉴스는 '처리 중'으로 표시됩니다.
+        (처리가 끝나면 반드시 mark_processed를 호출해야 함)
+        반환: (처음 보는 뉴스, DB 확인을 못 해서 이번에 건너뛴 뉴스)
+        """
+        candidates = []
+        candidate_keys = set()
+        for news in news_list:
+            key = (news.symbol, news.id)
+            if key in self._seen or key in self._in_flight or key in candidate_keys:
+                self.memory_hits += 1
+                continue
+            candidates.append(news)
+            candidate_keys.add(key)
+
+        if not candidates:
+            return [], []
+
+        # 메모리에 없는 것만 DB에 한 번에 확인 (키만 조회)
+        try:
+            existing_keys, unknown_keys = await self.news_repo.find_existing_news_keys(candidates)
+        except Exception as e:
+            logger.warning(f"⚠️ 기존 뉴스 확인 실패 (전부 신규로 처리): {e}")
+            existing_keys, unknown_keys = set(), set()
+
+        if unknown_keys:
+            logger.warning(f"⚠️ 기존 뉴스 확인 못 함 {len(unknown_keys)}건 (throttling) -> 다음 수집 때 다시 확인")
+
+        unseen, deferred = [], []
+        for news in candidates:
+            key = (news.symbol, news.id)
+            if key in existing_keys:
+                self.db_hits += 1
+                self._remember(key)
+                continue
+            if key in unknown_keys:
+                self.deferred += 1
+                deferred.append(news)
+                continue
+            self.misses += 1
+            self._in_flight.add(key)
+            unseen.append(news)
+
+        return unseen, deferred
+
+    def mark_processed(self, news_list: list[StockNews], stored: bool):
+        """처리 완료 표시. 저장까지 끝난 뉴스만 '본 뉴스'로 기억합니다."""
+        for news in news_list:
+            key = (news.symbol, news.id)
+            self._in_flight.discard(key)
+            if stored:
+                self._remember(key)
+
+    def get_stats(self) -> dict:
+        total = self.memory_hits + self.db_hits + self.misses
+        return {
+            "size": len(self._seen),
+            "in_flight": len(self._in_flight),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "deferred": self.deferred,
+            "hit_ratio": round((self.memory_hits + self.db_hits) / total, 4) if total else 0
+        }
+
+    def _remember(self, key: tuple):
+        self._seen[key] = None
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
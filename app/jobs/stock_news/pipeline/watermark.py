@@ -0,0 +1,131 @@
+import logging
+from collections import deque
+from typing import Optional
+
+from app.db.repositories.StockNewsRepository import NewsRepository
+from app.schemas.stockNews import StockNews
+
+logger = logging.getLogger("NewsWatermark")
+
+
+class _IngestBatch:
+    """수집 1회(종목 1개)분: 큐에 넣은 뉴스가 모두 처리되면 candidate까지 워터마크를 올릴 수 있음"""
+
+    __slots__ = ("symbol", "candidate", "remaining", "failed")
+
+    def __init__(self, symbol: str, candidate: tuple[int, int], remaining: set):
+        self.symbol = symbol
+        self.candidate = candidate  # 이번 수집에서 받은 뉴스 중 가장 최신 (datetime, id)
+        self.remaining = remaining  # 아직 처리되지 않은 (symbol, id)
+        self.failed = False
+
+
+class NewsWatermarkTracker:
+    """
+    종목별 뉴스 수집 워터마크 (저장까지 끝난 가장 최신 뉴스의 (datetime, id))
+    - 수집 시 워터마크 이후 구간만 요청하고, 워터마크 이하 뉴스는 StockNews 변환 전에 버림
+    - 워터마크는 해당 수집분의 뉴스가 모두 저장(또는 본문 없음으로 제외)된 뒤에만 올림
+      분석/저장이 실패한 뉴스가 있으면 올리지 않음 -> 다음 수집 때 같은 구간을 다시 받아 재시도
+    - 같은 종목의 수집분은 들어온 순서대로만 반영 (앞선 수집분이 실패하면 그 뒤 수집분도 올리지 않음)
+    """
+
+    def __init__(self, news_repo: NewsRepository):
+        self.news_repo = news_repo
+
+        self._watermarks: dict[str, Optional[tuple[int, int]]] = {}
+        self._batches: dict[str, deque[_IngestBatch]] = {}
+        self._key_batches: dict[tuple, _IngestBatch] = {}
+
+        # 통계
+        self.advanced = 0
+        self.held_back = 0  # 실패한 뉴스 때문에 올리지 못한 수집분
+        self.persist_failures = 0
+
+    async def get(self, symbol: str) -> Optional[tuple[int, int]]:
+        """현재 워터마크 (조회 실패 시 None -> 기존처럼 전체 구간 수집)"""
+        if symbol not in self._watermarks:
+            try:
+                watermarks = await self.news_repo.get_news_watermarks([symbol])
+            except Exception as e:
+                logger.warning(f"⚠️ [{symbol}] 워터마크 조회 실패 (전체 구간 수집): {e}")
+                return None
+            self._watermarks[symbol] = watermarks[symbol]
+        return self._watermarks[symbol]
+
+    async def begin(self, symbol: str, fetched: list[StockNews], enqueued: list[StockNews],
+                    deferred: bool = False):
+        """
+        수집 1회 등록 (fetched: 워터마크 이후로 받은 뉴스 전체, enqueued: 그중 큐에 넣은 뉴스)
+        - deferred: 저장 여부를 확인하지 못해 큐에 넣지 않은 뉴스가 있음 -> 이 수집분으로는 워터마크를 올리지 않음
+        """
+        if not fetched:
+            return
+
+        candidate = max((news.datetime, news.id) for news in fetched)
+        batch = _IngestBatch(symbol, candidate, {(news.symbol, news.id) for news in enqueued})
+        batch.failed = deferred
+        self._batches.setdefault(symbol, deque()).append(batch)
+        for key in batch.remaining:
+            self._key_batches[key] = batch
+
+        await self._settle(symbol)
+
+    async def resolve(self, news_list: list[StockNews], ok: bool):
+        """
+        큐에 넣었던 뉴스의 처리 결과 반영
+        - ok=True: 저장 완료 또는 본문 없음으로 제외 (다시 시도할 필요 없음)
+        - ok=False: 분석/저장 실패 (워터마크를 올리면 안 됨)
+        """
+        symbols = set()
+        for news in news_list:
+            batch = self._key_batches.pop((news.symbol, news.id), None)
+            if batch is None:
+                continue
+            batch.remaining.discard((news.symbol, news.id))
+            if not ok:
+                batch.failed = True
+            symbols.add(batch.symbol)
+
+        for symbol in symbols:
+            await self._settle(symbol)
+
+    def get_stats(self) -> dict:
+        return {
+            "tracked_symbols": len(self._watermarks),
+            "pending_batches": sum(len(batches) for batches in self._batches.values()),
+            "pending_news": len(self._key_batches),
+            "advanced": self.advanced,
+            "held_back": self.held_back,
+            "persist_failures": self.persist_failures
+        }
+
+    async def _settle(self, symbol: str):
+        """앞에서부터 처리가 끝난 수집분을 꺼내 워터마크 반영"""
+        batches = self._batches.get(symbol)
+        while batches and not batches[0].remaining:
+            batch = batches.popleft()
+
+            if batch.failed:
+                # 뒤따르는 수집분은 실패한 뉴스를 '처리 중'으로 보고 건너뛰었을 수 있으므로 함께 보류
+                self.held_back += 1
+                for later in batches:
+                    later.failed = True
+                continue
+
+            current = self._watermarks.get(symbol)
+            if current is not None and current >= batch.candidate:
+                continue
+
+            try:
+                await self.news_repo.advance_news_watermark(symbol, *batch.candidate)
+            except Exception as e:
+                self.persist_failures += 1
+                logger.warning(f"⚠️ [{symbol}] 워터마크 저장 실패: {e}")
+                continue
+
+            # 저장을 기다리는 동안 더 최신 수집분이 먼저 반영됐을 수 있음
+            self._watermarks[symbol] = max(self._watermarks.get(symbol) or batch.candidate, batch.candidate)
+            self.advanced += 1
+
+        if batches is not None and not batches:
+            self._batches.pop(symbol, None)
@@ -1,36 +1,84 @@
 import logging
 import asyncio
-from typing import List
+from typing import List, Optional
 
 
 from app.db.repositories.StockNewsRepository import NewsRepository
+from app.db.write_buffer import BatchWriteBuffer
+from app.jobs.stock_news.extractor.crawler.ArticleCache import ArticleCache, article_cache
+from app.jobs.stock_news.extractor.crawler.CrawlScheduler import CRAWL_ERROR, CRAWL_MISS, CRAWL_OK, CrawlScheduler
+from app.jobs.stock_news.pipeline.seen_index import SeenNewsIndex
+from app.jobs.stock_news.pipeline.watermark import NewsWatermarkTracker
 from app.schemas.stockNews import StockNews
 
 logger = logging.getLogger("NewsService")
 
+# 다시 크롤링해도 결과가 같은 상태 (오류 / 서킷 건너뜀은 다음 수집 때 재시도해야 함)
+_SETTLED_CRAWL_STATUSES = (CRAWL_OK, CRAWL_MISS)
+
 class NewsService:
-    def __init__(self, crawler_factory, analyzer, news_repo: NewsRepository, concurrency_limit: int = 5):
+    def __init__(self, crawler_factory, analyzer, news_repo: NewsRepository,
+                 crawl_scheduler: Optional[CrawlScheduler] = None, content_cache: Optional[ArticleCache] = None,
+                 write_buffer: Optional[BatchWriteBuffer] = None, seen_index: Optional[SeenNewsIndex] = None,
+                 watermarks: Optional[NewsWatermarkTracker] = None):
         self.crawler_factory = crawler_factory
+        # 도메인별 동시 실행 수 / 요청 빈도 / 서킷 브레이커 (워커들이 공유)
+        self.crawl_scheduler = crawl_scheduler or CrawlScheduler()
+        # 최종 URL 기준 본문 캐시 (같은 기사가 여러 종목에 붙어 와도 한 번만 크롤링)
+        self.content_cache = content_cache or article_cache
         self.analyzer = analyzer
         self.news_repo = news_repo  # Repository 주입
-        self.semaphore = asyncio.Semaphore(concurrency_limit)
+        self.write_buffer = write_buffer  # 워커들이 공유하는 write-behind 버퍼
+        self.seen_index = seen_index  # 처리 완료된 뉴스 기록용
+        self.watermarks = watermarks  # 종목별 수집 워터마크 (처리가 끝난 수집분만 반영)
 
     async def process_news_list(self, items: List[StockNews]) -> List[StockNews]:
+        saved_items, rejected_items = [], []
+        try:
+            saved_items, rejected_items = await self._process_news_list(items)
+            return saved_items
+        finally:
+            saved_keys = {(news.symbol, news.id) for news in saved_items}
+            if self.seen_index is not None:
+                # 저장된 뉴스는 '본 뉴스'로 기억, 나머지는 처리 중 표시만 해제 (다음 수집 때 재시도)
+                self.seen_index.mark_processed([n for n in items if (n.symbol, n.id) in saved_keys], stored=True)
+                self.seen_index.mark_processed([n for n in items if (n.symbol, n.id) not in saved_keys], stored=False)
+            if self.watermarks is not None:
+                # 본문 추출 실패로 제외된 뉴스는 다시 시도할 필요가 없으므로 처리 완료로 봄
+                # (크롤링 오류 / 서킷 건너뜀은 rejected에 들어가지 않음 -> 워터마크를 올리지 않고 재시도)
+                settled_keys = saved_keys | {(news.symbol, news.id) for news in rejected_items}
+                await self.watermarks.resolve([n for n in items if (n.symbol, n.id) not in settled_keys], ok=False)
+                await self.watermarks.resolve([n for n in items if (n.symbol, n.id) in settled_keys], ok=True)
+
+    async def _process_news_list(self, items: List[StockNews]) -> tuple[List[StockNews], List[StockNews]]:
+        """
+        반환: (저장된 뉴스, 다시 시도해도 본문을 얻을 수 없어 제외된 뉴스)
+        - 크롤링 오류 / 서킷 건너뜀으로 본문이 없는 뉴스는 어느 쪽에도 넣지 않음 (다음 수집 때 재시도)
+        """
         if not items:
-            return []
+            return [], []
 
         # 1. 크롤링 (병렬 처리)
-        crawl_tasks = [self._fetch_content_safe(item) for item in items if not item.content]
-        if crawl_tasks:
-            await asyncio.gather(*crawl_tasks)
+        crawl_items = [item for item in items if not item.content]
+        statuses = await asyncio.gather(*(self._fetch_content_safe(item) for item in crawl_items))
+        retry_keys = {
+            (item.symbol, item.id) for item, status in zip(crawl_items, statuses)
+            if status not in _SETTLED_CRAWL_STATUSES
+        }
+        if retry_keys:
+            logger.info(f"🔁 크롤링 실패로 재시도 대상: {len(retry_keys)}건")
 
         # 2. 유효성 검사
         valid_items = [item for item in items if self._is_valid(item.content)]
+        rejected_items = [
+            item for item in items
+            if not self._is_valid(item.content) and (item.symbol, item.id) not in retry_keys
+        ]
 
 
         if not valid_items:
             logger.info(f"⚠️ 처리할 유효한 뉴스가 없습니다. (요청: {len(items)}건)")
-            return []
+            return [], rejected_items
 
 
         # 3. AI 분석
@@ -46,30 +94,39 @@ class NewsService:
 
         except Exception as e:
             logger.error(f"❌ AI 분석 단계 에러: {e}")
-            return []
+            return [], rejected_items
 
         # 4. DB 저장 (Repository 사용)
         try:
             # Service는 DynamoDB JSON 변환을 몰라도 됨. 객체 그대로 전달.
-            await self.news_repo.save_news_batch(valid_items)
-            logger.info(f"💾 DB 저장 완료: {len(valid_items)}건")
+            is_saved = await self.news_repo.save_news_batch(valid_items, write_buffer=self.write_buffer)
+            if is_saved:
+                logger.info(f"💾 DB 저장 완료: {len(valid_items)}건")
+            else:
+                logger.error(f"❌ 일부 뉴스 저장 실패 (요청: {len(valid_items)}건)")
+                return [], rejected_items
         except Exception as e:
             logger.error(f"❌ 저장 실패: {e}")
+            return [], rejected_items
 
-        return valid_items
+        return valid_items, rejected_items
 
 
 
-    async def _fetch_content_safe(self, item: StockNews):
-        async with self.semaphore:
-            try:
-                crawler = self.crawler_factory.get_crawler(item.source)
-                content = await crawler.fetch(item.url)
-                item.content = content
+    async def _fetch_content_safe(self, item: StockNews) -> str:
+        """본문을 채우고 크롤 결과 상태 반환 (CRAWL_OK / MISS / ERROR / SKIPPED)"""
+        try:
+            crawler = self.crawler_factory.get_crawler(item.source)
+            outcome = await self.content_cache.get_or_fetch(
+                item.url, lambda: self.crawl_scheduler.fetch(crawler, item.url, item.source)
+            )
+            item.content = outcome.content or None
+            return outcome.status
 
-            except Exception as e:
-                logger.warning(f"⚠️ 크롤링 실패 ({item.source}): {item.url} -> {e}")
-                item.content = None
+        except Exception as e:
+            logger.warning(f"⚠️ 크롤링 실패 ({item.source}): {item.url} -> {e}")
+            item.content = None
+            return CRAWL_ERROR
 
     def _is_valid(self, content: str) -> bool:
         return bool(content and len(content.strip()) >= 50)
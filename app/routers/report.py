@@ -1,11 +1,12 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 import asyncio
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel, Field
 
-from app.services.report_service import report_service
-from app.db.repositories.ReportRepository import report_repo
+from app.services.report_service import report_service, get_today_date_kst
+from app.db.compression import DEFAULT_CONTENT_ENCODING, accepts_encoding, compress_text, decompress_text
+from app.db.repositories.reportRepository import report_repo
 from app.schemas.report import ReportRequest, ManySymbolReportRequest, ReportRetrievalResponse, ReportRetrievalRequest
 from app.jobs.Daily_report_agent.nodes.nodes import write_report
 
@@ -15,9 +16,27 @@ from app.jobs.Daily_report_agent.nodes.nodes import write_report
 router = APIRouter()
 
 
+def build_html_response(http_request: Request, body: bytes, content_encoding: str) -> Response:
+    """
+    압축된 리포트 본문으로 HTML 응답을 만듭니다.
+    - 클라이언트가 해당 인코딩을 받을 수 있으면 압축 bytes를 그대로 전송 (압축 해제/재압축 없음)
+    - 아니면 서버에서 풀어서 전송
+    """
+    headers = {"Vary": "Accept-Encoding"}
+
+    if content_encoding == "identity":
+        return HTMLResponse(content=body, headers=headers)
+
+    if accepts_encoding(http_request.headers.get("accept-encoding"), content_encoding):
+        headers["Content-Encoding"] = content_encoding
+        return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+    return HTMLResponse(content=decompress_text(body, content_encoding), headers=headers)
+
+
 # 2. 엔드포인트 정의
 @router.post("/generate/daily_report", response_class=HTMLResponse)
-async def generate_daily_report(request: ReportRequest):
+async def generate_daily_report(request: ReportRequest, http_request: Request):
     """
     특정 종목의 데일리 리포트를 생성하고 HTML로 반환합니다.
     """
@@ -31,15 +50,19 @@ async def generate_daily_report(request: ReportRequest):
         if not html_content:
             raise HTTPException(status_code=500, detail="리포트 생성에 실패했습니다 (데이터 부족 또는 에러).")
 
-        await report_repo.save_report(
+        # 한 번만 압축해서 저장과 응답에 같이 사용
+        report_body = compress_text(html_content)
+
+        await report_service.save_report(
             symbol=request.symbol,
             html=html_content,
             invest_type=request.investment_type,
-            category="DAILY"
+            category="DAILY",
+            report_body=report_body
         )
 
-        # HTMLResponse를 쓰면 브라우저가 태그를 해석해서 예쁜 화면을 보여줍니다.
-        return HTMLResponse(content=html_content)
+        # HTML 응답을 쓰면 브라우저가 태그를 해석해서 예쁜 화면을 보여줍니다.
+        return build_html_response(http_request, report_body, DEFAULT_CONTENT_ENCODING)
 
     except Exception as e:
         print(f"❌ API 에러 발생: {e}")
@@ -77,4 +100,26 @@ async def fetch_reports(request: ReportRetrievalRequest):
         request_id=request.request_id,
         user_id=request.user_id,
         results=results
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/reports/{symbol}", response_class=HTMLResponse)
+async def get_daily_report_html(symbol: str, http_request: Request,
+                                investment_type: Literal["trader", "investor"] = "trader",
+                                date: Optional[str] = None):
+    """
+    저장된 데일리 리포트를 HTML로 반환합니다.
+    클라이언트가 gzip을 받을 수 있으면 저장된 압축 본문을 그대로 전송합니다.
+    """
+    target_date = date or get_today_date_kst()
+    fetched_map = await report_repo.get_report_batch([symbol], target_date, investment_type, decompress=False)
+
+    if symbol in fetched_map and fetched_map[symbol] is None:
+        raise HTTPException(status_code=503, detail="일시적인 조회 실패입니다. 잠시 후 다시 시도해주세요.")
+
+    item = fetched_map.get(symbol)
+    body, content_encoding = report_repo.get_report_body(item) if item else (None, None)
+    if body is None:
+        raise HTTPException(status_code=404, detail="리포트가 아직 생성되지 않았습니다.")
+
+    return build_html_response(http_request, body, content_encoding)
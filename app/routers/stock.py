@@ -1,6 +1,12 @@
-from fastapi import APIRouter, BackgroundTasks, status
+from typing import Literal, Optional
+
+import httpx
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, status
 from app.jobs.stock_information.collector.FinnhubStockCollector import FinnhubStockCollector
+from app.jobs.stock_information.collector.FinvizStockCollector import FinvizBlockedError
+from app.jobs.stock_information.service.ProfileRefreshScheduler import profile_refresh_scheduler
 from app.jobs.stock_information.service.StockCollectionService import StockCollectionService
+from app.jobs.stock_information.service.TopSymbolService import top_symbol_service
 from app.services.http_client import get_http_client
 
 router = APIRouter()
@@ -11,8 +17,8 @@ router = APIRouter()
 async def task_logic():
     print("🕒 백그라운드 작업 시작: 주식 정보 수집")
 
-    # 중요: 백그라운드 작업 전용으로 새로운 HTTP 세션을 엽니다.
-    async with get_http_client() as client:
+    # lifespan이 소유한 Finnhub 공유 커넥션 풀을 사용합니다.
+    async with get_http_client("finnhub") as client:
         # Collector와 Service 조립
         collector = FinnhubStockCollector(client=client)
         stock_collection_service = StockCollectionService(collector=collector)
@@ -24,18 +30,64 @@ async def task_logic():
     print("✅ 백그라운드 작업 종료")
 
 
+async def incremental_task_logic(limit: Optional[int] = None):
+    print("🕒 백그라운드 작업 시작: 주식 정보 증분 갱신")
+    await profile_refresh_scheduler.run_once(limit=limit)
+    print("✅ 백그라운드 작업 종료")
+
+
 # 2. API 엔드포인트
 @router.post("/sync/stock-info", status_code=status.HTTP_202_ACCEPTED)
-async def start_stock_sync(background_tasks: BackgroundTasks):
+async def start_stock_sync(
+        background_tasks: BackgroundTasks,
+        mode: Literal["full", "incremental"] = Query("full", description="full: 전체 재수집 / incremental: 오래된 프로필만 갱신"),
+        limit: Optional[int] = Query(None, ge=1, description="incremental 모드에서 이번에 갱신할 최대 종목 수 (기본: 회차 예산)")
+):
     """
     주식 정보 수집을 백그라운드에서 시작합니다.
     서버는 즉시 'Accepted(202)' 응답을 반환하고, 작업은 뒤에서 계속됩니다.
+    - incremental: 대형주/신규 상장 우선으로 갱신 주기가 지난 프로필만 다시 조회
     """
     # 3. 작업 큐에 함수 등록
     # 주의: task_logic() 처럼 호출하는 게 아니라, 함수 이름만 넘겨줍니다.
-    background_tasks.add_task(task_logic)
+    if mode == "incremental":
+        background_tasks.add_task(incremental_task_logic, limit)
+    else:
+        background_tasks.add_task(task_logic)
 
     return {
         "status": "accepted",
+        "mode": mode,
         "message": "주식 정보 수집 요청이 접수되었습니다. 백그라운드에서 실행됩니다."
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/sync/stock-info/status")
+async def get_incremental_sync_status():
+    """증분 갱신 스케줄러의 마지막 실행 결과와 회차 예산을 반환합니다."""
+    return {
+        "enabled": profile_refresh_scheduler.is_running,
+        "budget_per_run": profile_refresh_scheduler.budget_per_run,
+        "interval_sec": profile_refresh_scheduler.interval,
+        "last_run": profile_refresh_scheduler.last_run
+    }
+
+
+@router.get("/top-symbols")
+async def get_top_symbols(
+        n: int = Query(100, ge=1, le=1000, description="시가총액 상위 몇 개까지 반환할지")
+):
+    """
+    Finviz 스크리너 기준 시가총액 상위 n개 심볼을 반환합니다.
+    페이지 결과는 거래일 단위로 캐시되어 같은 날 반복 호출해도 Finviz에 다시 요청하지 않습니다.
+    """
+    try:
+        symbols = await top_symbol_service.get_top_symbols(n)
+    except (httpx.HTTPError, FinvizBlockedError) as e:
+        raise HTTPException(status_code=502, detail=f"Finviz 스크리너 조회 실패: {e}")
+
+    return {
+        "count": len(symbols),
+        "symbols": symbols,
+        "cache": top_symbol_service.get_stats()
+    }
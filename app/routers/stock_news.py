@@ -42,7 +42,9 @@ async def trigger_news_collection(
         pipeline_manager.ingest_news,
         symbol=body.symbol,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        # 시작일을 직접 지정하면 백필 -> 워터마크와 상관없이 전체 구간 수집
+        use_watermark=body.start_date is None
     )
 
     return {
@@ -82,11 +84,29 @@ async def trigger_news_collection(
         pipeline_manager.ingest_all_stocks_news,
         symbols=body.symbols,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        use_watermark=body.start_date is None
     )
 
     return {
         "status": "accepted",
         "message": f"'{body.symbols}' 뉴스 수집 요청이 백그라운드 작업으로 등록되었습니다.",
         "period": f"{start_date} ~ {end_date}"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/collect-stocks/last", summary="마지막 다중 종목 뉴스 수집 결과")
+async def get_last_collection_summary(request: Request):
+    """
+    마지막으로 끝난 다중 종목 수집의 종목별 요약(수집 구간, fetched, below_watermark, enqueued, skipped, failed)과
+    소요 시간을 반환합니다.
+    """
+    pipeline_manager = request.app.state.pipeline_manager
+
+    if not pipeline_manager:
+        raise HTTPException(status_code=500, detail="파이프라인 매니저가 초기화되지 않았습니다.")
+
+    if pipeline_manager.last_ingest_summary is None:
+        raise HTTPException(status_code=404, detail="아직 완료된 다중 종목 수집이 없습니다.")
+
+    return pipeline_manager.last_ingest_summary
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from app.core.AsyncRateLimiter import rate_limiters
+from app.db.backends import get_storage_backend
+from app.db.repositories.StockNewsRepository import news_repo
+from app.db.repositories.StockRepository import stock_repo
+from app.db.utils import batch_get_limiter, get_write_governor_stats
+from app.jobs.stock_news.extractor.crawler.ArticleCache import article_cache
+from app.jobs.stock_news.extractor.crawler.HtmlExtractor import html_extraction_pool
+from app.services.report_service import report_service
+from app.services.response_cache import finnhub_cache
+
+router = APIRouter()
+
+
+@router.get("/health", summary="서버 및 저장소 연결 상태 확인")
+async def health_check():
+    """
+    공유 저장소(DynamoDB 커넥션 풀 등) 상태를 확인합니다.
+    연결에 문제가 있으면 503을 반환합니다.
+    """
+    storage = get_storage_backend()
+    storage_health = await storage.health_check()
+    is_healthy = storage_health["status"] == "ok"
+
+    return JSONResponse(
+        status_code=200 if is_healthy else 503,
+        content={
+            "status": "ok" if is_healthy else "degraded",
+            "backend": storage.name,
+            "storage": storage_health
+        }
+    )
+
+
+@router.get("/metrics", summary="DynamoDB / 리포트 캐시 / 뉴스 파이프라인 지표")
+async def get_metrics(request: Request):
+    """
+    공유 batch_get / batch_write 제어기의 동시성, 처리량, 재시도, 유실 지표,
+    리포트 캐시 적중률/메모리 사용량, 뉴스 파이프라인의 write-behind 버퍼 / 중복 뉴스 인덱스 지표,
+    변경 없는 쓰기를 건너뛴 지문(content_hash) 지표, 외부 API 토큰 버킷 상태,
+    Finnhub 응답 캐시 적중률(304 재검증 / 요청 합치기 포함),
+    기사 크롤링 도메인별 지표(소요 시간 순, 서킷 브레이커 상태 포함)를 반환합니다.
+    """
+    pipeline_manager = getattr(request.app.state, "pipeline_manager", None)
+
+    return {
+        "dynamodb": {
+            "batch_get": batch_get_limiter.get_stats(),
+            "batch_write": get_write_governor_stats(),
+            "fingerprints": {
+                "profiles": stock_repo.fingerprints.get_stats(),
+                "news": news_repo.fingerprints.get_stats()
+            }
+        },
+        "report_cache": report_service.cache.get_stats(),
+        "rate_limiters": rate_limiters.get_stats(),
+        "finnhub_cache": finnhub_cache.get_stats(),
+        "news_pipeline": {
+            "write_buffer": pipeline_manager.write_buffer.get_stats() if pipeline_manager else None,
+            "seen_index": pipeline_manager.seen_index.get_stats() if pipeline_manager else None,
+            "watermarks": pipeline_manager.watermarks.get_stats() if pipeline_manager else None,
+            "crawl": pipeline_manager.crawl_scheduler.get_stats() if pipeline_manager else None,
+            "article_cache": article_cache.get_stats(),
+            "html_extraction": html_extraction_pool.get_stats()
+        }
+    }
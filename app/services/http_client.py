@@ -1,22 +1,140 @@
+import importlib.util
+import logging
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Optional
 
 import httpx
 
+logger = logging.getLogger("HttpClient")
+
+# HTTP/2는 h2 패키지(httpx[http2])가 있을 때만 사용
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0.0.0 Safari/537.36"
+)
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """업스트림(상대 서버) 하나에 대한 커넥션 풀 설정"""
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    http2: bool = True
+    headers: dict = field(default_factory=dict)
+
+
+# 업스트림별 풀 설정
+# - finnhub: 분당 호출 수가 제한된 API -> 커넥션 몇 개를 오래 유지
+# - articles: 여러 언론사 사이트 -> 호스트가 많으니 전체 한도는 넉넉하게, 유휴 커넥션은 빨리 정리
+# - finviz: 봇 차단이 민감한 사이트 -> 커넥션 수를 적게
+UPSTREAMS: dict[str, UpstreamConfig] = {
+    "finnhub": UpstreamConfig(
+        max_connections=10,
+        max_keepalive_connections=10,
+        keepalive_expiry=60.0,
+        headers={"Content-Type": "application/json"}
+    ),
+    "articles": UpstreamConfig(
+        max_connections=50,
+        max_keepalive_connections=20,
+        keepalive_expiry=15.0,
+        read_timeout=15.0,
+        headers={"User-Agent": BROWSER_USER_AGENT}
+    ),
+    "finviz": UpstreamConfig(
+        max_connections=4,
+        max_keepalive_connections=4,
+        read_timeout=15.0,
+        headers={
+            "User-Agent": BROWSER_USER_AGENT,
+            "Referer": "https://finviz.com/",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Cache-Control": "no-cache",
+        }
+    ),
+}
+
+
+def _create_client(config: UpstreamConfig) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry
+        ),
+        http2=config.http2 and HTTP2_AVAILABLE,
+        headers=config.headers,
+        follow_redirects=True
+    )
+
+
+class HttpClientRegistry:
+    """
+    앱 라이프사이클 동안 업스트림별 httpx.AsyncClient(커넥션 풀)를 하나씩 유지하는 레지스트리
+    - lifespan에서 start/stop, 수집기/크롤러는 get(upstream)으로 공유 풀을 받아 씀
+    - 서버가 지원하면 HTTP/2 (ALPN 협상, 미지원 서버는 HTTP/1.1로 자동 대체)
+    """
+
+    def __init__(self, upstreams: Optional[dict[str, UpstreamConfig]] = None):
+        self.upstreams = upstreams or UPSTREAMS
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._started = False
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    async def start(self):
+        if self._started:
+            return
+        if not HTTP2_AVAILABLE:
+            logger.warning("⚠️ h2 패키지가 없어 HTTP/1.1로만 연결합니다. (pip install 'httpx[http2]')")
+        self._started = True
+        logger.info(f"🌐 HTTP 커넥션 풀 준비 완료 ({', '.join(self.upstreams)})")
+
+    async def stop(self):
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._started = False
+        for client in clients:
+            await client.aclose()
+        logger.info("🌐 HTTP 커넥션 풀 종료")
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """업스트림 이름으로 공유 클라이언트를 반환 (처음 요청될 때 생성)"""
+        if not self._started:
+            raise RuntimeError("HttpClientRegistry가 시작되지 않았습니다. (lifespan에서 start 필요)")
+
+        client = self._clients.get(upstream)
+        if client is None:
+            client = _create_client(self.upstreams[upstream])
+            self._clients[upstream] = client
+        return client
+
+
+# 앱 전체에서 공유하는 레지스트리 (main.py lifespan에서 start/stop)
+http_clients = HttpClientRegistry()
+
 
 @asynccontextmanager
-async def get_http_client():
+async def get_http_client(upstream: str = "finnhub"):
     """
-    애플리케이션 전체 라이프사이클 동안
-    HTTP 연결 풀(Pool)을 효율적으로 관리하기 위한 컨텍스트 매니저
+    업스트림용 HTTP 클라이언트를 제공하는 컨텍스트 매니저
+    - 레지스트리가 가동 중이면 공유 커넥션 풀을 그대로 사용 (닫지 않음)
+    - 단독 스크립트처럼 레지스트리가 없을 때만 같은 설정으로 새로 만들고 끝나면 닫음
     """
-    # limits: 동시 연결 수 제한 (실무 필수 설정)
-    limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
-
-    async with httpx.AsyncClient(
-            timeout=10.0,
-            limits=limits,
-            headers={"Content-Type": "application/json"},
-            follow_redirects=True
-    ) as client:
+    if http_clients.is_started:
+        yield http_clients.get(upstream)
+        return
+
+    async with _create_client(UPSTREAMS[upstream]) as client:
         yield client
-        # async with 블록을 빠져나가는 순간 자동으로 client.aclose()가 호출됨
@@ -0,0 +1,116 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.db.compression import to_bytes
+
+# 캐시 항목 1개당 키/메타데이터 등 고정 오버헤드 추정치 (bytes)
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+class _CacheEntry:
+    __slots__ = ("item", "size", "expires_at")
+
+    def __init__(self, item: Optional[dict], size: int, expires_at: float):
+        self.item = item  # None이면 negative entry (리포트 없음)
+        self.size = size
+        self.expires_at = expires_at
+
+
+class ReportCache:
+    """
+    (symbol, date, investment_type) 단위 리포트 LRU + TTL 캐시
+    - 용량 제한은 바이트 기준 (압축된 본문 크기 + 고정 오버헤드)
+    - 리포트가 없는 종목(PENDING)은 짧은 TTL의 negative entry로 캐싱
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, negative_ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+
+        # 통계
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> tuple[bool, Optional[dict]]:
+        """
+        반환: (캐시 적중 여부, 아이템)
+        - (True, item): 리포트 있음
+        - (True, None): 리포트 없음이 캐싱되어 있음 (negative hit)
+        - (False, None): 캐시에 없음
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        if entry.item is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, entry.item
+
+    def put(self, key: tuple, item: dict):
+        self._store(key, _CacheEntry(item, self._estimate_size(item), time.monotonic() + self.ttl))
+
+    def put_negative(self, key: tuple):
+        self._store(key, _CacheEntry(None, _ENTRY_OVERHEAD_BYTES, time.monotonic() + self.negative_ttl))
+
+    def invalidate(self, key: tuple):
+        if key in self._entries:
+            self._remove(key)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0
+        }
+
+    def _store(self, key: tuple, entry: _CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        # 용량 초과 시 가장 오래 안 쓰인 항목부터 제거
+        while self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    @staticmethod
+    def _estimate_size(item: dict) -> int:
+        size = _ENTRY_OVERHEAD_BYTES
+        for value in item.values():
+            if isinstance(value, str):
+                size += len(value)
+            elif value is not None and not isinstance(value, (int, float)):
+                body = to_bytes(value) if hasattr(value, "value") or isinstance(value, (bytes, bytearray)) else None
+                size += len(body) if body is not None else 0
+        return size
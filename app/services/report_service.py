@@ -1,8 +1,10 @@
 import json
 from typing import Optional
 
-from app.db.repositories.ReportRepository import report_repo
+from app.core.settings import settings
+from app.db.repositories.reportRepository import report_repo, REPORT_STATUS_PROJECTION
 from app.schemas.report import ReportItem
+from app.services.report_cache import ReportCache
 
 
 
@@ -14,27 +16,75 @@ def get_today_date_kst() -> str:
 class ReportService:
     def __init__(self):
         self.repo = report_repo
+        # (symbol, date, investment_type) -> 압축된 리포트 아이템 (DAILY 리포트만 캐싱)
+        self.cache = ReportCache(
+            max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+            ttl=settings.REPORT_CACHE_TTL_SECONDS,
+            negative_ttl=settings.REPORT_CACHE_NEGATIVE_TTL_SECONDS
+        )
 
-    async def get_aggregated_reports(self, symbols: list[str], invest_type: str, date: Optional[str] = None) -> list[ReportItem]:
+    async def save_report(self, symbol: str, html: str, invest_type: str, category: str = "DAILY",
+                          report_body: Optional[bytes] = None) -> dict:
+        """리포트를 저장하고 조회 캐시에 바로 채워 넣습니다. (PENDING negative entry 덮어쓰기)"""
+        item = await self.repo.save_report(symbol, html, invest_type, category=category, report_body=report_body)
+        if category == "DAILY":
+            self.cache.put((symbol, item['date'], invest_type), item)
+        return item
+
+    async def get_aggregated_reports(self, symbols: list[str], invest_type: str, date: Optional[str] = None,
+                                     include_content: bool = True) -> list[ReportItem]:
         #타겟 날짜 선정: 스프링에서는 date가 요청 인자로 오지 않는다(추후 확장 가능성을 위해 date 함수 인자로 받음)
         target_date = date
         if not target_date:
             target_date = get_today_date_kst()
 
-        # fetched_map = {'AAPL': {...}, 'GOOG': {...}}
-        fetched_map = await self.repo.get_report_batch(symbols, target_date, invest_type)
+        # 1. 캐시 우선 조회 (negative entry = 리포트 없음)
+        fetched_map = {}
+        missed_symbols = []
+        for sym in dict.fromkeys(symbols):
+            is_hit, cached_item = self.cache.get((sym, target_date, invest_type))
+            if not is_hit:
+                missed_symbols.append(sym)
+            elif cached_item is not None:
+                fetched_map[sym] = cached_item
+
+        # 2. 캐시에 없는 종목만 DB 조회 (압축된 상태 그대로 받아서 캐싱)
+        if missed_symbols:
+            # 상태만 필요한 경우 HTML 본문은 읽지 않음 (본문 없는 아이템은 캐싱하지 않음)
+            projection = None if include_content else REPORT_STATUS_PROJECTION
+
+            # db_map = {'AAPL': {...}, 'GOOG': {...}, 'TSLA': None(조회 실패)}
+            db_map = await self.repo.get_report_batch(
+                missed_symbols, target_date, invest_type, projection=projection, decompress=False
+            )
+
+            for sym in missed_symbols:
+                cache_key = (sym, target_date, invest_type)
+                if sym not in db_map:
+                    self.cache.put_negative(cache_key)
+                elif db_map[sym] is not None and projection is None:
+                    self.cache.put(cache_key, db_map[sym])
+            fetched_map.update(db_map)
 
         result_items = []
 
         # 조합하기
         for sym in symbols:
-            if sym in fetched_map:
+            if sym in fetched_map and fetched_map[sym] is None:
+                # 스로틀링 등으로 조회 자체가 실패한 경우 -> PENDING으로 보내면 불필요한 재생성 요청이 발생하므로 FAILED
+                result_items.append(ReportItem(
+                    symbol=sym,
+                    status="FAILED",
+                    content=None,
+                    meta={"message": "일시적인 조회 실패입니다. 잠시 후 다시 조회해주세요."}
+                ))
+            elif sym in fetched_map:
                 # 데이터가 있는 경우
                 db_item = fetched_map[sym]
                 result_items.append(ReportItem(
                     symbol=sym,
                     status="COMPLETED",
-                    content= db_item.get('report_html'),
+                    content=self.repo.decode_report_html(db_item) if include_content else None,
                     meta={
                         "created_at": db_item.get('created_at')
                     }
@@ -0,0 +1,430 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+
+from app.core.settings import settings
+
+logger = logging.getLogger("ResponseCache")
+
+# 재검증에 쓰는 응답 헤더 -> 조건부 요청 헤더
+_VALIDATORS = {"etag": "If-None-Match", "last-modified": "If-Modified-Since"}
+
+
+@dataclass
+class _CacheMeta:
+    url: str
+    status_code: int
+    headers: dict
+    size: int
+    stored_at: float
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    외부 API GET 응답 캐시 (디스크 저장 -> 재시작해도 유지)
+    - 키: path + 정렬된 쿼리 파라미터 (API 토큰 등 exclude_params는 제외)
+    - TTL 안이면 네트워크/호출 예산을 전혀 쓰지 않고 저장된 본문으로 응답을 만들어 반환
+    - TTL이 지났고 ETag / Last-Modified가 있으면 조건부 요청 -> 304면 본문을 다시 받지 않고 TTL만 연장
+    - 같은 키의 요청이 동시에 들어오면 하나만 실제로 호출하고 나머지는 그 결과를 기다림 (coalescing)
+    - 호출이 실패했는데 만료된 항목이 있으면 그것을 대신 반환 (stale_if_error 안쪽일 때만)
+    - 디스크 용량(max_bytes)을 넘으면 오래 저장된 항목부터 삭제
+    """
+
+    def __init__(self, directory: str, max_bytes: int, stale_if_error: float = 0.0,
+                 exclude_params: tuple[str, ...] = ("token",), enabled: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stale_if_error = stale_if_error
+        self.exclude_params = set(exclude_params)
+        self.enabled = enabled
+
+        self._index: dict[str, _CacheMeta] = {}
+        self._bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0  # 304로 재사용
+        self.coalesced = 0
+        self.stale_served = 0
+        self.evictions = 0
+
+    async def get_or_fetch(self, path: str, params: dict, ttl: float,
+                           fetch: Callable[[dict], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        캐시된 응답을 반환하거나 fetch(조건부 요청 헤더)로 새로 받아 저장
+        - fetch는 2xx 또는 304 응답을 반환해야 함 (그 외는 예외)
+        """
+        if not self.enabled or ttl <= 0:
+            return await fetch({})
+
+        await self._ensure_loaded()
+        key = self.make_key(path, params)
+
+        meta = self._index.get(key)
+        if meta is not None and meta.expires_at > time.time():
+            body = await self._read_body(key)
+            if body is not None:
+                self.hits += 1
+                return self._build_response(meta, body)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return self._copy_response(await asyncio.shield(inflight))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._refresh(key, ttl, fetch)
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    # 먼저 호출한 쪽이 취소돼도 기다리던 쪽까지 취소되지는 않게
+                    e = RuntimeError("coalesced request was cancelled")
+                future.set_exception(e)
+                future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않게
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def iter_fresh(self, path: str, params: dict, chunk_size: int = 64 * 1024) -> Optional[AsyncIterator[bytes]]:
+        """
+        TTL 안의 캐시 본문을 chunk 단위로 읽는 async iterator (없거나 만료면 None)
+        - 큰 응답을 통째로 메모리에 올리지 않고 스트리밍 파싱할 때 사용
+        """
+        if not self.enabled:
+            return None
+        await self._ensure_loaded()
+        key = self.make_key(path, params)
+
+        meta = self._index.get(key)
+        if meta is None or meta.expires_at <= time.time():
+            return None
+        try:
+            f = await asyncio.to_thread(open, self._body_path(key), "rb")
+        except OSError:
+            self._forget(key)
+            return None
+
+        self.hits += 1
+        return self._iter_file(f, chunk_size)
+
+    def open_writer(self, path: str, params: dict, ttl: float) -> Optional["StreamingCacheWriter"]:
+        """스트리밍으로 받는 응답을 chunk 단위로 저장하는 writer (캐시 꺼져 있으면 None)"""
+        if not self.enabled or ttl <= 0:
+            return None
+        self.misses += 1
+        return StreamingCacheWriter(self, self.make_key(path, params), ttl)
+
+    def make_key(self, path: str, params: dict) -> str:
+        query = sorted((name, str(value)) for name, value in params.items() if name not in self.exclude_params)
+        raw = json.dumps([path, query], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def invalidate(self, path: str, params: dict):
+        await self._ensure_loaded()
+        key = self.make_key(path, params)
+        if key in self._index:
+            await asyncio.to_thread(self._delete_files, key)
+            self._forget(key)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated_304": self.revalidated,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0
+        }
+
+    async def _refresh(self, key: str, ttl: float, fetch) -> httpx.Response:
+        meta = self._index.get(key)
+
+        conditional_headers = {}
+        if meta is not None:
+            for header, request_header in _VALIDATORS.items():
+                if header in meta.headers:
+                    conditional_headers[request_header] = meta.headers[header]
+
+        try:
+            response = await fetch(conditional_headers)
+        except Exception:
+            stale = await self._serve_stale(key)
+            if stale is None:
+                raise
+            return stale
+
+        if response.status_code == 304 and meta is not None:
+            body = await self._read_body(key)
+            if body is not None:
+                self.revalidated += 1
+                meta.expires_at = time.time() + ttl
+                await asyncio.to_thread(self._write_meta, key, meta)
+                return self._build_response(meta, body)
+            # 본문 파일이 없어졌으면 조건 없이 다시 요청
+            response = await fetch({})
+
+        body = response.content
+        headers = {name: response.headers[name] for name in ("content-type", *_VALIDATORS) if name in response.headers}
+        new_meta = _CacheMeta(
+            url=str(response.request.url.copy_remove_param("token")),
+            status_code=response.status_code,
+            headers=headers,
+            size=len(body),
+            stored_at=time.time(),
+            expires_at=time.time() + ttl
+        )
+        await self._store(key, new_meta, body)
+        return response
+
+    async def _serve_stale(self, key: str) -> Optional[httpx.Response]:
+        meta = self._index.get(key)
+        if meta is None or time.time() - meta.expires_at > self.stale_if_error:
+            return None
+        body = await self._read_body(key)
+        if body is None:
+            return None
+        self.stale_served += 1
+        logger.warning(f"⚠️ 호출 실패 -> 만료된 캐시 응답 사용 ({meta.url})")
+        return self._build_response(meta, body)
+
+    async def _store(self, key: str, meta: _CacheMeta, body: bytes):
+        if meta.size > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write_files, key, meta, body)
+        except OSError as e:
+            logger.warning(f"⚠️ 응답 캐시 저장 실패: {e}")
+            return
+        await self._register(key, meta)
+
+    async def _register(self, key: str, meta: _CacheMeta):
+        """디스크에 저장된 항목을 인덱스에 반영하고 용량을 넘으면 오래된 항목부터 삭제"""
+        self._forget(key)
+        self._index[key] = meta
+        self._bytes += meta.size
+
+        # 용량 초과 시 가장 오래 저장된 항목부터 삭제
+        if self._bytes > self.max_bytes:
+            victims = []
+            for victim_key, victim in sorted(self._index.items(), key=lambda entry: entry[1].stored_at):
+                if self._bytes <= self.max_bytes:
+                    break
+                if victim_key == key:
+                    continue
+                victims.append(victim_key)
+                self._forget(victim_key)
+                self.evictions += 1
+            await asyncio.to_thread(self._delete_many, victims)
+
+    def _forget(self, key: str):
+        meta = self._index.pop(key, None)
+        if meta is not None:
+            self._bytes -= meta.size
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._index = await asyncio.to_thread(self._load_index)
+            self._bytes = sum(meta.size for meta in self._index.values())
+            self._loaded = True
+            if self._index:
+                logger.info(f"💾 응답 캐시 {len(self._index)}건 로드 ({self._bytes / 1024 / 1024:.1f}MB)")
+
+    async def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._read_file, self._body_path(key))
+        except OSError:
+            self._forget(key)
+            return None
+
+    @staticmethod
+    async def _iter_file(f, chunk_size: int) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            f.close()
+
+    # --- 디스크 I/O (스레드에서 실행) ---
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.body")
+
+    def _load_index(self) -> dict[str, _CacheMeta]:
+        index = {}
+        if not os.path.isdir(self.directory):
+            return index
+
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                # 저장 도중 죽어서 남은 임시 파일
+                os.remove(os.path.join(self.directory, name))
+                continue
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                    meta = _CacheMeta(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                self._delete_files(key)
+                continue
+            if os.path.exists(self._body_path(key)):
+                index[key] = meta
+        return index
+
+    def _write_files(self, key: str, meta: _CacheMeta, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        # 본문 먼저 교체 -> 메타 교체 (메타가 있으면 본문도 있음)
+        self._atomic_write(self._body_path(key), body)
+        self._write_meta(key, meta)
+
+    def _write_meta(self, key: str, meta: _CacheMeta):
+        self._atomic_write(self._meta_path(key), json.dumps(asdict(meta)).encode("utf-8"))
+
+    def _delete_files(self, key: str):
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _delete_many(self, keys: list[str]):
+        for key in keys:
+            self._delete_files(key)
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    # --- 응답 객체 ---
+
+    @staticmethod
+    def _build_response(meta: _CacheMeta, body: bytes) -> httpx.Response:
+        """저장된 본문으로 httpx.Response를 다시 만듦 (호출부는 평소처럼 .json() 사용)"""
+        return httpx.Response(
+            status_code=meta.status_code,
+            headers={**meta.headers, "x-cache": "HIT"},
+            content=body,
+            request=httpx.Request("GET", meta.url or "http://cache.local/")
+        )
+
+    @staticmethod
+    def _copy_response(response: httpx.Response) -> httpx.Response:
+        """coalescing된 대기자에게는 복사본을 줌 (같은 응답 객체를 여러 곳에서 쓰지 않게)"""
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=response.content,
+            request=response.request
+        )
+
+
+class StreamingCacheWriter:
+    """
+    스트리밍 응답을 임시 파일에 chunk 단위로 쓰고, 끝까지 받은 경우에만 캐시에 반영
+    - 중간에 끊기거나 소비자가 멈추면 abort() -> 임시 파일 삭제 (반쪽짜리 본문이 캐시되지 않음)
+    """
+
+    def __init__(self, cache: ResponseCache, key: str, ttl: float):
+        self.cache = cache
+        self.key = key
+        self.ttl = ttl
+        self.size = 0
+        self._tmp_path = f"{cache._body_path(key)}.{uuid.uuid4().hex}.tmp"
+        self._file = None
+
+    async def write(self, chunk: bytes):
+        if self._file is None:
+            await asyncio.to_thread(os.makedirs, self.cache.directory, exist_ok=True)
+            self._file = await asyncio.to_thread(open, self._tmp_path, "wb")
+        await asyncio.to_thread(self._file.write, chunk)
+        self.size += len(chunk)
+
+    async def commit(self, response: httpx.Response):
+        if self._file is None or self.size > self.cache.max_bytes:
+            await self.abort()
+            return
+
+        meta = _CacheMeta(
+            url=str(response.request.url.copy_remove_param("token")),
+            status_code=response.status_code,
+            headers={name: response.headers[name] for name in ("content-type", *_VALIDATORS) if name in response.headers},
+            size=self.size,
+            stored_at=time.time(),
+            expires_at=time.time() + self.ttl
+        )
+        try:
+            await asyncio.to_thread(self._finish, meta)
+        except OSError as e:
+            logger.warning(f"⚠️ 응답 캐시 저장 실패: {e}")
+            await self.abort()
+            return
+        await self.cache._register(self.key, meta)
+
+    async def abort(self):
+        await asyncio.to_thread(self._discard)
+
+    def _finish(self, meta: _CacheMeta):
+        self._file.close()
+        os.replace(self._tmp_path, self.cache._body_path(self.key))
+        self.cache._write_meta(self.key, meta)
+
+    def _discard(self):
+        if self._file is not None:
+            self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+# Finnhub 응답 캐시 (TTL 규칙은 FinnhubCollector가 엔드포인트별로 결정)
+finnhub_cache = ResponseCache(
+    directory=settings.FINNHUB_CACHE_DIR,
+    max_bytes=settings.FINNHUB_CACHE_MAX_BYTES,
+    stale_if_error=settings.FINNHUB_CACHE_STALE_IF_ERROR_SECONDS,
+    enabled=settings.FINNHUB_CACHE_ENABLED
+)
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 
+from app.db.backends import get_storage_backend
 from app.sqs.worker.retrieval_worker import RetrievalWorker
 
 # 로그 설정
@@ -11,11 +12,18 @@ logging.basicConfig(
 
 
 async def main():
+    # 저장소(DynamoDB 커넥션 풀 등)는 워커 프로세스 전체에서 하나만 생성해서 공유
+    storage = get_storage_backend()
+    await storage.start()
+
     # 워커 인스턴스 생성
     worker = RetrievalWorker()
 
-    # 워커 실행 (무한 루프)
-    await worker.run()
+    try:
+        # 워커 실행 (무한 루프)
+        await worker.run()
+    finally:
+        await storage.stop()
 
 
 if __name__ == "__main__":
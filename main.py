@@ -5,7 +5,11 @@ from fastapi import FastAPI
 
 from app.jobs.stock_news.analyzer.QuickNewsAnalyzer import QuickNewsAnalyzer
 from app.jobs.stock_news.pipeline.manager import PipelineManager
-from app.routers import stock, stock_news, report
+from app.routers import stock, stock_news, report, system
+from app.db.backends import get_storage_backend
+from app.services.http_client import http_clients
+from app.core.settings import settings
+from app.jobs.stock_information.service.ProfileRefreshScheduler import profile_refresh_scheduler
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -19,6 +23,15 @@ async def lifespan(app: FastAPI):
     print("🏭 시스템 가동: 파이프라인 매니저 초기화 중...")
 
     load_dotenv()
+
+    # 저장소(DynamoDB 커넥션 풀 등)는 앱 전체에서 하나만 생성해서 공유
+    storage = get_storage_backend()
+    await storage.start()
+
+    # 업스트림별 HTTP 커넥션 풀 (Finnhub / 기사 사이트 / Finviz)도 앱 전체에서 공유
+    await http_clients.start()
+    app.state.http_clients = http_clients
+
     from langchain_openai import ChatOpenAI
     chat_model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
     analyzer = QuickNewsAnalyzer(chat_model)
@@ -29,11 +42,18 @@ async def lifespan(app: FastAPI):
     # 앱 전체에서 쓸 수 있게 state에 저장
     app.state.pipeline_manager = manager
 
+    # 프로필 증분 갱신 (하루 예산을 나눠서 오래된 프로필만 갱신)
+    if settings.PROFILE_REFRESH_ENABLED:
+        await profile_refresh_scheduler.start()
+
     yield  # 앱 실행 중...
 
     # 종료: 워커 퇴근 및 정리
     print("🛑 시스템 종료: 파이프라인 정리 중...")
+    await profile_refresh_scheduler.stop()
     await manager.stop()
+    await http_clients.stop()
+    await storage.stop()
 
 
 app = FastAPI(lifespan=lifespan, title="AI Stock Analyst Agent")
@@ -48,6 +68,7 @@ logging.basicConfig(
 app.include_router(stock_news.router, prefix="/api/news", tags=["News"])
 app.include_router(stock.router, prefix="/api/stock", tags=["Stock"])
 app.include_router(report.router, prefix="/api/report", tags=["Report"])
+app.include_router(system.router, prefix="/api/system", tags=["System"])
 
 
 if __name__ == "__main__":
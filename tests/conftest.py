@@ -0,0 +1,13 @@
+import os
+import sys
+
+# 필수 설정값 (테스트에서는 외부 서비스에 연결하지 않음) -> app 모듈을 불러오기 전에 지정
+os.environ.setdefault("FINNHUB_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("SQS_REQUEST_QUEUE_URL", "test")
+os.environ.setdefault("SQS_RESPONSE_QUEUE_URL", "test")
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.db import write_buffer as write_buffer_module
+from app.db.backends import set_storage_backend
+from app.db.backends.memory import InMemoryBackend
+from app.db.repositories import StockNewsRepository as news_repository_module
+from app.db.repositories.StockNewsRepository import NewsRepository, news_date_utc
+from app.db.serializer import serialize_news
+from app.db.write_buffer import BatchWriteBuffer
+from app.schemas.stockNews import StockNews
+
+DAY_START = 1_764_028_800  # 2025-11-25 00:00 UTC
+DATE = news_date_utc(DAY_START)
+
+
+@pytest.fixture
+def backend():
+    backend = InMemoryBackend("StockProjectData")
+    set_storage_backend(backend)
+    return backend
+
+
+@pytest.fixture
+def repo(backend):
+    repo = NewsRepository()
+    repo._digest_live_since = 0  # 그날의 시작부터 갱신해 온 것으로 (완전한 다이제스트)
+    return repo
+
+
+def _news(news_id: int) -> StockNews:
+    return StockNews(id=news_id, symbol="AAPL", datetime=DAY_START + news_id, headline=f"headline {news_id}",
+                     summary=f"summary {news_id}", url=f"https://example.com/{news_id}", impact_score=5)
+
+
+def _drop_one(monkeypatch, module, dropped_id: int):
+    """실제로 저장하되 dropped_id 뉴스만 재시도 예산 초과로 유실된 것처럼"""
+    original = module.execute_batch_write
+
+    async def execute_batch_write(backend, items):
+        dropped = [item for item in items if item['id'] == dropped_id]
+        await original(backend, [item for item in items if item['id'] != dropped_id])
+        return dropped
+
+    monkeypatch.setattr(module, "execute_batch_write", execute_batch_write)
+
+
+async def _save(repo: NewsRepository, news_list: list[StockNews], use_buffer: bool) -> bool:
+    if not use_buffer:
+        return await repo.save_news_batch(news_list)
+    buffer = BatchWriteBuffer(repo.table_name, max_age=0.01)
+    await buffer.start()
+    try:
+        return await repo.save_news_batch(news_list, write_buffer=buffer)
+    finally:
+        await buffer.stop()
+
+
+def test_digest_complete_when_all_stored(repo):
+    assert asyncio.run(_save(repo, [_news(1), _news(2), _news(3)], use_buffer=False))
+
+    digests = asyncio.run(repo.get_digests("AAPL", [DATE]))
+    assert [entry['id'] for entry in digests[DATE]] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("use_buffer", [False, True])
+def test_partial_write_marks_digest_incomplete(repo, backend, monkeypatch, use_buffer):
+    module = write_buffer_module if use_buffer else news_repository_module
+    _drop_one(monkeypatch, module, dropped_id=2)
+
+    assert not asyncio.run(_save(repo, [_news(1), _news(2), _news(3)], use_buffer))
+
+    # 유실된 뉴스가 있는 날짜는 다이제스트를 믿지 않고 기간 조회로 대체
+    assert asyncio.run(repo.get_digests("AAPL", [DATE])) == {DATE: None}
+
+    # 저장된 뉴스는 다이제스트에 반영되고 지문도 기록됨
+    digest = asyncio.run(backend.get_item(repo._digest_key("AAPL", DATE)))
+    assert sorted(entry['id'] for entry in digest['entries']) == [1, 3]
+    items = [repo.fingerprints.stamp(serialize_news(_news(news_id))) for news_id in (1, 2, 3)]
+    assert [item['id'] for item in asyncio.run(repo.fingerprints.filter_changed(items))] == [2]
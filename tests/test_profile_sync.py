@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.jobs.stock_information.collector.FinnhubStockCollector import FinnhubStockCollector
+from app.jobs.stock_information.service.StockCollectionService import StockCollectionService
+
+PROFILE = {"name": "Example Inc", "country": "US", "currency": "USD", "exchange": "NASDAQ",
+           "marketCapitalization": 1234.5, "ipo": "2000-01-01"}
+
+
+def _collector(handler) -> FinnhubStockCollector:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return FinnhubStockCollector(client, api_key="test-key", max_429_retries=0, cache=None)
+
+
+def test_fetch_profile_returns_none_only_for_empty_profile():
+    collector = _collector(lambda request: httpx.Response(200, json={}))
+    assert asyncio.run(collector.fetch_profile("NONE")) is None
+
+
+@pytest.mark.parametrize("handler", [
+    lambda request: httpx.Response(429),
+    lambda request: httpx.Response(500),
+    lambda request: (_ for _ in ()).throw(httpx.ConnectError("down", request=request)),
+])
+def test_fetch_profile_raises_on_failed_call(handler):
+    with pytest.raises(httpx.HTTPError):
+        asyncio.run(_collector(handler).fetch_profile("FAIL"))
+
+
+class _FakeCollector:
+    async def fetch_profile(self, symbol: str):
+        if symbol == "FAIL":
+            raise httpx.ConnectError("down")
+        if symbol == "EMPTY":
+            return None
+        return PROFILE
+
+
+class _FakeRepo:
+    """DROP 프로필은 저장하지 못한 것으로, 나머지는 저장/변경 없음으로 처리"""
+
+    async def save_profiles_batch(self, profiles):
+        dropped = [{'PK': f"FIGI#{profile.figi}", 'SK': "METADATA"} for profile in profiles if profile.symbol == "DROP"]
+        return {"written": len(profiles) - len(dropped) - 1, "unchanged": 1, "dropped": dropped}
+
+
+def test_on_result_only_for_stored_or_empty_profiles():
+    service = StockCollectionService(collector=_FakeCollector(), repo=_FakeRepo(), fetcher_count=2)
+    recorded = {}
+
+    async def symbols():
+        for symbol in ("OK", "SAME", "EMPTY", "FAIL", "DROP"):
+            yield symbol, f"FIGI-{symbol}"
+
+    def on_result(symbol, figi, profile):
+        recorded[symbol] = profile
+
+    stats = asyncio.run(service.update_stock_profiles(symbol_source=symbols(), on_result=on_result))
+
+    # 호출 실패(FAIL) / 저장 실패(DROP)는 조회 완료로 기록하지 않음 -> 다음 회차에 다시 조회
+    assert set(recorded) == {"OK", "SAME", "EMPTY"}
+    assert recorded["EMPTY"] is None
+    assert stats["failed"] == 1 and stats["dropped"] == 1
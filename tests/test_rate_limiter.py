@@ -0,0 +1,73 @@
+import asyncio
+import bisect
+import time
+
+from app.core.AsyncRateLimiter import RateLimiterRegistry
+
+
+def _registry(rate_per_minute: float = 3000.0, burst: float = 1.0) -> RateLimiterRegistry:
+    registry = RateLimiterRegistry()
+    for name in ("key", "news", "ref"):
+        registry.register(name, rate_per_minute, burst)
+    return registry
+
+
+def test_joint_waiters_keep_fifo_order_with_single_bucket_callers():
+    """먼저 줄 선 key+news / key+ref 호출보다 나중에 온 key 단독 호출이 먼저 받지 않음"""
+    registry = _registry()
+    order = []
+
+    async def joint(family: str):
+        await registry.acquire("key", family)
+        order.append(family)
+
+    async def single():
+        for _ in range(5):
+            await registry.acquire("key")
+            order.append("single")
+
+    async def main():
+        tasks = [asyncio.create_task(joint("news" if i % 2 else "ref")) for i in range(20)]
+        await asyncio.sleep(0)  # 모두 대기열에 들어간 뒤
+        tasks.append(asyncio.create_task(single()))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert "single" not in order[:20]
+    assert order[20:] == ["single"] * 5
+
+
+def test_joint_acquire_stays_within_every_bucket_limit():
+    """어느 구간에서든 key 버킷 발급 수 <= burst + rate * 구간"""
+    registry = _registry(rate_per_minute=6000.0, burst=2.0)  # 초당 100회
+    stamps = []
+
+    async def call(family: str):
+        await registry.acquire("key", family)
+        stamps.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(call("news" if i % 3 else "ref") for i in range(60)), *(
+            registry.acquire("key") for _ in range(20)
+        ))
+
+    asyncio.run(main())
+    stamps.sort()
+    window = 0.1
+    peak = max(bisect.bisect_right(stamps, stamp + window) - i for i, stamp in enumerate(stamps))
+    assert peak <= 2 + 100 * window + 1  # 타이머 오차 1회 허용
+
+
+def test_cancelled_joint_waiter_does_not_block_queue():
+    registry = _registry(rate_per_minute=600.0)  # 초당 10회
+
+    async def main():
+        await registry.acquire("key", "news")  # burst 소진
+        blocked = asyncio.create_task(registry.acquire("key", "news"))
+        follower = asyncio.create_task(registry.acquire("key", "ref"))
+        await asyncio.sleep(0)
+        blocked.cancel()
+        await asyncio.wait_for(follower, timeout=1.0)
+        assert registry.get("news").get_stats()["waiting"] == 0
+
+    asyncio.run(main())